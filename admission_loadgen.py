@@ -0,0 +1,184 @@
+"""
+Load generator for admission_server.py.
+
+Opens many client connections. Each client spawns its own process with a
+random maximum claim and then alternates random requests and releases in a
+closed loop (one message in flight per client). The round trip of every
+message is recorded, and the run reports throughput, latency percentiles and
+the server's own statistics (e.g. the mean request batch size).
+
+Without --port or --unix the server is started in this process on a free
+localhost port with a generated state. Client and server then share one CPU
+and one event loop, so absolute numbers are lower than with a separate server.
+
+Usage:
+    python admission_loadgen.py --clients 64 --requests 500
+    python admission_server.py scenario.json --port 7450 &
+    python admission_loadgen.py --port 7450 --clients 64
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+
+from admission_server import AdmissionServer
+from banker_logic import BankerState
+from event_replay import LatencyHistogram
+from scenario_generator import generate_scenario
+
+
+class LoadStats:
+    """
+    Client-side counters and round-trip latencies.
+    """
+
+    def __init__(self):
+        self.messages = 0
+        self.granted = 0
+        self.refused = 0
+        self.errors = 0
+        self.spawn_refused = 0
+        self.latency = LatencyHistogram()
+        self.elapsed_seconds = 0.0
+
+    def as_dict(self):
+        return {
+            "messages": self.messages,
+            "granted": self.granted,
+            "refused": self.refused,
+            "errors": self.errors,
+            "spawn_refused": self.spawn_refused,
+            "elapsed_seconds": round(self.elapsed_seconds, 6),
+            "messages_per_second": round(self.messages / self.elapsed_seconds, 1) if self.elapsed_seconds else 0.0,
+            "latency": self.latency.as_dict(),
+        }
+
+
+async def _call(reader, writer, message, stats):
+    started = time.perf_counter_ns()
+    writer.write(json.dumps(message, separators=(",", ":")).encode() + b"\n")
+    reply = json.loads(await reader.readline())
+    stats.latency.record(time.perf_counter_ns() - started)
+    stats.messages += 1
+    if "error" in reply:
+        stats.errors += 1
+    return reply
+
+
+async def _open(address):
+    if isinstance(address, str):
+        return await asyncio.open_unix_connection(address)
+    return await asyncio.open_connection(*address)
+
+
+async def _client(address, rng, max_claim, num_requests, stats):
+    reader, writer = await _open(address)
+    try:
+        pid = (await _call(reader, writer, {"op": "spawn", "max": max_claim}, stats)).get("pid")
+        if pid is None:
+            stats.spawn_refused += 1
+            return
+        held = [0] * len(max_claim)
+        for _ in range(num_requests):
+            vector = [rng.randint(0, min(2, claim - amount)) for claim, amount in zip(max_claim, held)]
+            reply = await _call(reader, writer, {"op": "request", "pid": pid, "vector": vector}, stats)
+            if reply.get("granted"):
+                stats.granted += 1
+                held = [amount + value for amount, value in zip(held, vector)]
+            elif "error" not in reply:
+                stats.refused += 1
+            if any(held) and (not reply.get("granted") or rng.random() < 0.5):
+                await _call(reader, writer, {"op": "release", "pid": pid, "vector": held}, stats)
+                held = [0] * len(held)
+        await _call(reader, writer, {"op": "exit", "pid": pid}, stats)
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def run_load(address, num_clients, num_requests, max_claim_range, num_resources, seed=None):
+    """
+    Runs the clients against a server and collects the results.
+
+    Args:
+        address (tuple | str): (host, port) or a Unix socket path.
+        num_clients (int): Concurrent connections.
+        num_requests (int): Requests sent by each client.
+        max_claim_range (tuple[int, int]): Range of each resource in a client's Max claim.
+        num_resources (int): Number of resource types of the served state.
+        seed (int | None): Seed for reproducible traffic.
+
+    Returns:
+        dict: {"client": client-side results, "server": the server's stats}
+    """
+    rng = random.Random(seed)
+    stats = LoadStats()
+    clients = []
+    for _ in range(num_clients):
+        max_claim = [rng.randint(*max_claim_range) for _ in range(num_resources)]
+        clients.append(_client(address, random.Random(rng.random()), max_claim, num_requests, stats))
+    started = time.perf_counter()
+    await asyncio.gather(*clients)
+    stats.elapsed_seconds = time.perf_counter() - started
+
+    reader, writer = await _open(address)
+    try:
+        writer.write(b'{"op":"stats"}\n')
+        server_stats = json.loads(await reader.readline()).get("stats")
+    finally:
+        writer.close()
+        await writer.wait_closed()
+    return {"client": stats.as_dict(), "server": server_stats}
+
+
+def _parse_range(text):
+    low, _, high = text.partition(",")
+    return int(low), int(high or low)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Generate request/release load against admission_server.py.")
+    parser.add_argument("--host", default="127.0.0.1", help="Server host (default: 127.0.0.1).")
+    parser.add_argument("--port", type=int, default=None, help="Server port; omit to start a server in-process.")
+    parser.add_argument("--unix", default=None, metavar="PATH", help="Connect to a Unix socket instead.")
+    parser.add_argument("--clients", type=int, default=32, help="Concurrent client connections (default: 32).")
+    parser.add_argument("--requests", type=int, default=200, help="Requests per client (default: 200).")
+    parser.add_argument("--resources", type=int, default=4,
+                        help="Resource types; must match the server's state (default: 4).")
+    parser.add_argument("--max-claim", type=_parse_range, default=(1, 6), metavar="LOW,HIGH",
+                        help="Range of every resource in a client's Max claim (default: 1,6).")
+    parser.add_argument("--processes", type=int, default=50,
+                        help="Background processes in the in-process server's state (default: 50).")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for reproducible traffic.")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    async def run():
+        server = None
+        if args.unix is not None:
+            address = args.unix
+        elif args.port is not None:
+            address = (args.host, args.port)
+        else:
+            allocation, max_need, available = generate_scenario(args.processes, args.resources, verdict="safe",
+                                                                available_range=(20, 40), seed=args.seed)
+            server = AdmissionServer(BankerState(allocation, max_need, available))
+            await server.start(args.host, 0)
+            address = server.address[:2]
+        try:
+            return await run_load(address, args.clients, args.requests, args.max_claim, args.resources, args.seed)
+        finally:
+            if server is not None:
+                await server.stop()
+
+    sys.stdout.write(json.dumps(asyncio.run(run()), indent=2) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,287 @@
+"""
+Admission-control sidecar: one BankerState served over a local socket.
+
+Clients connect over TCP (localhost) or a Unix socket and exchange one JSON
+object per line. Every message may carry an "id", which is echoed back.
+
+    {"op": "request", "pid": 3, "vector": [1, 0, 2]}  -> {"granted": true}
+    {"op": "release", "pid": 3, "vector": [1, 0, 0]}  -> {"ok": true}
+    {"op": "spawn", "max": [4, 2, 2]}                 -> {"pid": 7} ({"pid": null} if not admitted)
+    {"op": "exit", "pid": 3}                          -> {"released": [1, 0, 2]}
+    {"op": "stats"}                                   -> {"stats": {...}}
+
+Invalid messages get {"error": "..."}. A line longer than MAX_LINE_BYTES gets
+an error reply and the connection is closed. A refused request means the process
+must wait and try again later. A client that sends several messages without
+waiting may get the replies in a different order; use "id" to match them. At most
+MAX_PENDING_REPLIES messages per connection are answered at a time; the server
+stops reading from a connection that has that many outstanding.
+
+Requests are not checked one by one. They are queued, and the queue is
+flushed once per event loop iteration through BankerState.request_many(),
+so requests that arrive in the same tick share one safety evaluation. Any
+other operation flushes the queue first, so every client sees its messages
+applied in the order the server read them.
+
+Usage:
+    python admission_server.py scenario.json --port 7450
+    python admission_server.py scenario.json --unix /tmp/banker.sock
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+
+from banker_logic import BankerState
+from event_replay import LatencyHistogram
+from scenario_io import iter_scenarios
+
+SERVER_OPS = ("request", "release", "spawn", "exit", "stats")
+DEFAULT_PORT = 7450
+MAX_LINE_BYTES = 1 << 16 # Longest message line accepted (the asyncio stream limit)
+MAX_PENDING_REPLIES = 256 # Messages of one connection being answered at a time
+
+
+class ServerStats:
+    """
+    Counters kept by the server; returned by the "stats" op.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.connections = 0
+        self.messages = 0
+        self.errors = 0
+        self.granted = 0
+        self.refused = 0
+        self.batches = 0
+        self.batched_requests = 0
+        self.largest_batch = 0
+        self.latency = LatencyHistogram() # Receipt to reply, per message
+
+    def as_dict(self, state):
+        elapsed = time.perf_counter() - self.started
+        return {
+            "connections": self.connections,
+            "messages": self.messages,
+            "errors": self.errors,
+            "granted": self.granted,
+            "refused": self.refused,
+            "batches": self.batches,
+            "mean_batch": round(self.batched_requests / self.batches, 2) if self.batches else 0.0,
+            "largest_batch": self.largest_batch,
+            "full_checks": state.full_checks,
+            "fast_path_grants": state.fast_path_grants,
+            "processes": len(state.processes),
+            "available": state.available,
+            "latency": self.latency.as_dict(),
+            "uptime_seconds": round(elapsed, 3),
+            "messages_per_second": round(self.messages / elapsed, 1) if elapsed > 0 else 0.0,
+        }
+
+
+class AdmissionServer:
+    """
+    Serves one BankerState to many clients, batching the requests of each loop tick.
+    """
+
+    def __init__(self, state):
+        """
+        Args:
+            state (BankerState): The state to serve; only this server should modify it.
+        """
+        self.state = state
+        self.stats = ServerStats()
+        self._queue = [] # (pid, vector, future) waiting for the next flush
+        self._flush_scheduled = False
+        self._server = None
+        self._connections = {} # handler task -> writer of every open client connection
+
+    async def start(self, host="127.0.0.1", port=DEFAULT_PORT, unix_path=None):
+        """
+        Starts listening (port 0 picks a free port; see `address`).
+        """
+        if unix_path is not None:
+            self._server = await asyncio.start_unix_server(self._handle_client, path=unix_path,
+                                                           limit=MAX_LINE_BYTES)
+        else:
+            self._server = await asyncio.start_server(self._handle_client, host=host, port=port,
+                                                      limit=MAX_LINE_BYTES)
+        return self._server
+
+    @property
+    def address(self):
+        """The bound (host, port) tuple or Unix socket path."""
+        return self._server.sockets[0].getsockname()
+
+    async def serve_forever(self):
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def stop(self):
+        """
+        Stops listening, closes the client connections and waits for their handlers to finish.
+        """
+        if self._server is not None:
+            self._server.close()
+        for writer in self._connections.values():
+            writer.close() # The handler then reads end-of-file and returns
+        if self._connections:
+            await asyncio.gather(*self._connections, return_exceptions=True)
+
+    # --- Request batching ---
+
+    def _enqueue_request(self, pid, vector):
+        future = asyncio.get_running_loop().create_future()
+        self._queue.append((pid, vector, future))
+        if not self._flush_scheduled:
+            # call_soon runs after every callback that is already ready, i.e. after
+            # the other connections have read what arrived in this tick.
+            self._flush_scheduled = True
+            asyncio.get_running_loop().call_soon(self._flush)
+        return future
+
+    def _flush(self):
+        self._flush_scheduled = False
+        queue, self._queue = self._queue, []
+        if not queue:
+            return
+        try:
+            results = self.state.request_many((pid, vector) for pid, vector, _ in queue)
+        except Exception as error: # Never leave a client waiting on an unresolved future
+            results = [error] * len(queue)
+        self.stats.batches += 1
+        self.stats.batched_requests += len(queue)
+        self.stats.largest_batch = max(self.stats.largest_batch, len(queue))
+        for (_, _, future), result in zip(queue, results):
+            if not future.done():
+                future.set_result(result)
+
+    # --- Message handling ---
+
+    async def _dispatch(self, message):
+        op = message.get("op")
+        if op not in SERVER_OPS:
+            raise ValueError(f"Unknown op {op!r}. Expected one of {', '.join(SERVER_OPS)}.")
+        if op == "request":
+            pid, vector = message.get("pid"), message.get("vector")
+            if not isinstance(pid, int) or not isinstance(vector, list):
+                raise ValueError("A request needs an integer 'pid' and a 'vector' list.")
+            result = await self._enqueue_request(pid, vector)
+            if isinstance(result, Exception):
+                raise result
+            if result:
+                self.stats.granted += 1
+            else:
+                self.stats.refused += 1
+            return {"granted": result}
+        # Everything else sees the requests read before it already decided.
+        self._flush()
+        if op == "stats":
+            return {"stats": self.stats.as_dict(self.state)}
+        if op == "release":
+            self.state.release(message.get("pid"), message.get("vector"))
+            return {"ok": True}
+        if op == "spawn":
+            return {"pid": self.state.add_process(message.get("max"), message.get("allocation"))}
+        return {"released": self.state.remove_process(message.get("pid"))}
+
+    async def _answer(self, line, writer, received_ns):
+        try:
+            message = json.loads(line)
+            if not isinstance(message, dict):
+                raise ValueError("Message must be a JSON object.")
+        except ValueError as error:
+            reply = {"error": f"Invalid JSON: {error}"}
+            message = {}
+        else:
+            try:
+                reply = await self._dispatch(message)
+            except (KeyError, ValueError, TypeError) as error:
+                reply = {"error": error.args[0] if isinstance(error, KeyError) and error.args else str(error)}
+        if "error" in reply:
+            self.stats.errors += 1
+        if "id" in message:
+            reply["id"] = message["id"]
+        writer.write(json.dumps(reply, separators=(",", ":")).encode() + b"\n")
+        self.stats.latency.record(time.perf_counter_ns() - received_ns)
+
+    async def _handle_client(self, reader, writer):
+        self.stats.connections += 1
+        handler = asyncio.current_task()
+        self._connections[handler] = writer
+        pending_replies = set()
+        reply_slots = asyncio.Semaphore(MAX_PENDING_REPLIES)
+
+        def reply_done(task):
+            pending_replies.discard(task)
+            reply_slots.release()
+
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError: # asyncio.LimitOverrunError: the rest of the stream cannot be framed
+                    self.stats.messages += 1
+                    self.stats.errors += 1
+                    reply = {"error": f"Message line is longer than {MAX_LINE_BYTES} bytes; closing the connection."}
+                    writer.write(json.dumps(reply, separators=(",", ":")).encode() + b"\n")
+                    break
+                if not line:
+                    break
+                self.stats.messages += 1
+                # Replies are produced as separate tasks so that a client can pipeline
+                # several requests into the same batch. Waiting for a free slot
+                # bounds the tasks (and lines) held for one connection.
+                received_ns = time.perf_counter_ns()
+                await reply_slots.acquire()
+                task = asyncio.ensure_future(self._answer(line, writer, received_ns))
+                pending_replies.add(task)
+                task.add_done_callback(reply_done)
+                if writer.transport.get_write_buffer_size() > 1 << 16:
+                    await writer.drain()
+            if pending_replies:
+                await asyncio.gather(*pending_replies)
+        except ConnectionError:
+            pass
+        finally:
+            del self._connections[handler]
+            writer.close()
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Serve Banker's Algorithm admission control on a local socket.")
+    parser.add_argument("scenario", help="Scenario file (JSON, JSONL or CSV); its first scenario is the initial state.")
+    parser.add_argument("--host", default="127.0.0.1", help="TCP host to bind (default: 127.0.0.1).")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"TCP port (default: {DEFAULT_PORT}).")
+    parser.add_argument("--unix", default=None, metavar="PATH", help="Listen on a Unix socket instead of TCP.")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    scenario = next(iter_scenarios([args.scenario]), None)
+    if scenario is None or isinstance(scenario, Exception):
+        parser.error(f"Could not read a scenario from {args.scenario}: {scenario}")
+    try:
+        state = BankerState(scenario["allocation"], scenario["max_need"], scenario["available"])
+    except ValueError as error:
+        parser.error(str(error))
+    server = AdmissionServer(state)
+
+    async def run():
+        await server.start(args.host, args.port, args.unix)
+        sys.stderr.write(f"Listening on {server.address}\n")
+        await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+"""
+Minimal Available vectors that make a state safe.
+
+Safety is monotone in Available: adding resources never turns a safe state
+unsafe. So the Available vectors that make a given Allocation / Max Need
+safe are everything above a Pareto frontier of minimal vectors, and:
+
+* For one resource the minimum is exact: run the processes in ascending Need
+  order; Available must cover max(Need[k] - sum of Allocation before k).
+  Applied per resource this gives a lower bound lo[j] for every coordinate.
+  A coordinate never needs to exceed the largest Need in it (hi[j]).
+* For two resources the frontier is a staircase found with two pointers: as
+  the first coordinate grows, the minimal second coordinate only shrinks, so
+  the sweep costs about (hi - lo) safety checks per coordinate, not their product.
+* With more resources every combination of the first m - 2 coordinates
+  (within their bounds) gets its own staircase. These grid cells are
+  independent and can be evaluated in a process pool. Points that are not
+  minimal in the grid coordinates are filtered out at the end.
+"""
+import itertools
+
+from banker_logic import compute_need_matrix, iter_safe_sequence, validate_bankers_input
+
+DEFAULT_MAX_GRID_POINTS = 100000
+
+# Per-worker copy of the state, set once by _init_worker() instead of being sent with every task.
+_worker_state = None
+
+
+def minimal_available_1d(allocation_column, need_column):
+    """
+    Exact minimum Available for a single resource.
+
+    Args:
+        allocation_column (list[int]): Allocation of every process.
+        need_column (list[int]): Need (Max - Allocation) of every process.
+
+    Returns:
+        int: The smallest Available value for which every process can finish.
+    """
+    minimum = 0
+    released = 0
+    for need, allocation in sorted(zip(need_column, allocation_column)):
+        minimum = max(minimum, need - released)
+        released += allocation
+    return minimum
+
+
+class _FrontierSearch:
+    """
+    Safety checks of one Allocation / Need pair against varying Available vectors.
+    """
+
+    def __init__(self, allocation, need_matrix):
+        self.allocation = allocation
+        self.need_matrix = need_matrix
+        self.num_processes = len(allocation)
+
+    def is_safe(self, available):
+        finished = sum(1 for _ in iter_safe_sequence(self.allocation, self.need_matrix, available,
+                                                     self.num_processes, len(available)))
+        return finished == self.num_processes
+
+    def staircase(self, prefix, bounds_a, bounds_b):
+        """
+        Minimal (a, b) pairs for the last two coordinates with the others fixed to `prefix`.
+        """
+        (low_a, high_a), (low_b, high_b) = bounds_a, bounds_b
+        if not self.is_safe(prefix + [high_a, high_b]):
+            return []
+        points = []
+        b = high_b
+        for a in range(low_a, high_a + 1):
+            if not points and not self.is_safe(prefix + [a, b]):
+                continue
+            # (a, b) is safe: it was for a - 1 with the same b, and a only grew.
+            while b > low_b and self.is_safe(prefix + [a, b - 1]):
+                b -= 1
+            if not points or b < points[-1][-1]:
+                points.append(prefix + [a, b])
+            if b == low_b:
+                break
+        return points
+
+    def is_minimal_in_prefix(self, point, lower_bounds):
+        for j in range(len(point) - 2):
+            if point[j] > lower_bounds[j]:
+                lowered = list(point)
+                lowered[j] -= 1
+                if self.is_safe(lowered):
+                    return False
+        return True
+
+
+def _init_worker(allocation, need_matrix):
+    global _worker_state
+    _worker_state = _FrontierSearch(allocation, need_matrix)
+
+
+def _staircase_task(task):
+    prefix, bounds_a, bounds_b = task
+    return _worker_state.staircase(list(prefix), bounds_a, bounds_b)
+
+
+def minimal_available_frontier(allocation, max_need, workers=1, max_grid_points=DEFAULT_MAX_GRID_POINTS):
+    """
+    Computes the minimal Available vectors that make the state safe.
+
+    Args:
+        allocation (list[list[int]]): Currently allocated resources per process.
+        max_need (list[list[int]]): Maximum resources each process may claim.
+        workers (int): Worker processes for the grid cells (1 = in this process).
+        max_grid_points (int): Refuse inputs whose grid over the first m - 2
+            resources has more cells than this.
+
+    Returns:
+        list[list[int]]: The Pareto frontier in lexicographic order. Every safe
+        Available vector is >= one of these in every resource.
+
+    Raises:
+        ValueError: If the input is invalid or the grid is too large.
+    """
+    if not allocation:
+        raise ValueError("At least one process is required.")
+    num_resources = len(allocation[0])
+    num_processes, num_resources = validate_bankers_input(allocation, max_need, [0] * num_resources)
+    need_matrix = compute_need_matrix(allocation, max_need, num_processes, num_resources)
+    lower_bounds = [minimal_available_1d([row[j] for row in allocation], [row[j] for row in need_matrix])
+                    for j in range(num_resources)]
+    upper_bounds = [max(lower_bounds[j], max(row[j] for row in need_matrix)) for j in range(num_resources)]
+    search = _FrontierSearch(allocation, need_matrix)
+    if num_resources == 1:
+        return [lower_bounds]
+    if search.is_safe(lower_bounds):
+        return [lower_bounds]
+
+    grid_ranges = [range(lower_bounds[j], upper_bounds[j] + 1) for j in range(num_resources - 2)]
+    grid_size = 1
+    for grid_range in grid_ranges:
+        grid_size *= len(grid_range)
+    if grid_size > max_grid_points:
+        raise ValueError(f"The frontier search needs {grid_size} grid cells (limit {max_grid_points}). "
+                         "Reduce the number of resources or the value ranges.")
+    bounds_a = (lower_bounds[-2], upper_bounds[-2])
+    bounds_b = (lower_bounds[-1], upper_bounds[-1])
+    tasks = ((prefix, bounds_a, bounds_b) for prefix in itertools.product(*grid_ranges))
+
+    if workers <= 1 or grid_size == 1:
+        staircases = (search.staircase(list(prefix), a, b) for prefix, a, b in tasks)
+        candidates = list(itertools.chain.from_iterable(staircases))
+    else:
+        # Imported here so that single-process callers do not pay for it.
+        import multiprocessing
+        with multiprocessing.Pool(processes=workers, initializer=_init_worker,
+                                  initargs=(allocation, need_matrix)) as pool:
+            candidates = list(itertools.chain.from_iterable(
+                pool.imap(_staircase_task, tasks, chunksize=max(1, grid_size // (workers * 4)))))
+
+    frontier = [point for point in candidates if search.is_minimal_in_prefix(point, lower_bounds)]
+    frontier.sort()
+    return frontier
+
+
+def smallest_available(frontier):
+    """
+    Picks the frontier point with the fewest resources in total (ties: lexicographically first).
+    """
+    return min(frontier, key=lambda point: (sum(point), point))
+
+
+def covers(available, frontier):
+    """
+    True if `available` is at least one frontier point in every resource, i.e. the state is safe.
+    """
+    return any(all(value >= bound for value, bound in zip(available, point)) for point in frontier)
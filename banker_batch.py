@@ -0,0 +1,336 @@
+"""
+Process-pool batch evaluator for many independent Banker's Algorithm scenarios.
+
+Scenarios are grouped into chunks and each chunk is packed into one flat
+int64 buffer before it is sent to a worker process, so the pool transfers a
+single bytes object per chunk instead of pickling thousands of nested lists.
+Results come back packed the same way.
+
+Example:
+    stats = BatchStats()
+    for result in check_many(scenarios, workers=8, stats=stats):
+        ...
+    print(stats.scenarios_per_second)
+"""
+import os
+import time
+from array import array
+from collections import deque, namedtuple
+
+from banker_logic import get_safety_backend, validate_bankers_input
+from sparse_matrix import SparseMatrix
+from verdict_cache import scenario_key
+
+# Result of checking one scenario. `index` is the scenario's position in the
+# input; `error` is None unless the scenario could not be checked.
+BatchResult = namedtuple("BatchResult", ["index", "is_safe", "safe_sequence", "error"])
+
+
+class BatchStats:
+    """
+    Throughput counters filled in by check_many().
+    """
+
+    def __init__(self):
+        self.scenarios = 0
+        self.unsafe = 0
+        self.errors = 0
+        self.elapsed_seconds = 0.0
+
+    @property
+    def scenarios_per_second(self):
+        return self.scenarios / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+    def as_dict(self):
+        return {
+            "scenarios": self.scenarios,
+            "unsafe": self.unsafe,
+            "errors": self.errors,
+            "elapsed_seconds": round(self.elapsed_seconds, 6),
+            "scenarios_per_second": round(self.scenarios_per_second, 1),
+        }
+
+
+def scenario_parts(scenario):
+    """
+    Returns (allocation, max_need, available) from a scenario mapping (with
+    "max" or "max_need") or an (allocation, max_need, available) tuple.
+    """
+    if isinstance(scenario, dict):
+        return (scenario["allocation"], scenario.get("max_need", scenario.get("max")), scenario["available"])
+    allocation, max_need, available = scenario
+    return allocation, max_need, available
+
+
+_INT_ONLY = frozenset((int,))
+
+
+def _is_int_row(values, length):
+    """
+    True if `values` is a list or tuple of `length` plain ints, i.e. can be
+    packed as is. Checking the types through map() keeps this cheap.
+    """
+    return isinstance(values, (list, tuple)) and len(values) == length and _INT_ONLY.issuperset(map(type, values))
+
+
+def _pack_scenario(buffer, scenario):
+    """
+    Appends one scenario to `buffer` as: n, m, allocation (n*m), max (n*m), available (m).
+
+    Only the shape and the value types are checked here; the workers run
+    validate_bankers_input() on the unpacked values. A scenario that cannot be
+    packed as is goes through the full validation for its error message.
+
+    Raises:
+        ValueError: If the scenario cannot be packed (see validate_bankers_input()).
+    """
+    allocation, max_need, available = scenario_parts(scenario)
+    # Sparse matrix documents are expanded here; the workers only handle dense rows.
+    if isinstance(allocation, dict):
+        allocation = SparseMatrix.from_json(allocation).to_dense()
+    if isinstance(max_need, dict):
+        max_need = SparseMatrix.from_json(max_need).to_dense()
+    num_resources = len(available) if isinstance(available, (list, tuple)) else -1
+    num_processes = len(allocation) if isinstance(allocation, (list, tuple)) else -1
+    if not (num_processes >= 0 and isinstance(max_need, (list, tuple)) and len(max_need) == num_processes
+            and _is_int_row(available, num_resources)
+            and all(_is_int_row(row, num_resources) for row in allocation)
+            and all(_is_int_row(row, num_resources) for row in max_need)):
+        num_processes, num_resources = validate_bankers_input(allocation, max_need, available)
+    start = len(buffer)
+    try:
+        buffer.extend((num_processes, num_resources))
+        for matrix in (allocation, max_need):
+            for row in matrix:
+                buffer.extend(row)
+        buffer.extend(available)
+    except OverflowError:
+        del buffer[start:]
+        validate_bankers_input(allocation, max_need, available) # Names the value beyond int64
+        raise
+
+
+class _CachedVerdict:
+    """
+    Stands in for a scenario whose verdict was found in the cache; it is not sent to a worker.
+    """
+    __slots__ = ("safe_sequence", "is_safe")
+
+    def __init__(self, safe_sequence, is_safe):
+        self.safe_sequence = safe_sequence
+        self.is_safe = is_safe
+
+
+def _pack_chunk(indexed_scenarios):
+    """
+    Packs a list of (index, scenario) pairs.
+
+    Returns:
+        tuple: (indices, packed bytes, {index: error message} for the scenarios
+        that could not be packed, {index: (is_safe, safe_sequence)} for cache hits)
+    """
+    buffer = array("q")
+    indices = []
+    errors = {}
+    cached = {}
+    for index, scenario in indexed_scenarios:
+        if isinstance(scenario, Exception):
+            errors[index] = str(scenario)
+            continue
+        if isinstance(scenario, _CachedVerdict):
+            cached[index] = (scenario.is_safe, scenario.safe_sequence)
+            continue
+        try:
+            _pack_scenario(buffer, scenario)
+        except (ValueError, KeyError, TypeError) as error:
+            errors[index] = str(error)
+            continue
+        indices.append(index)
+    return indices, buffer.tobytes(), errors, cached
+
+
+def _check_packed_chunk(task):
+    """
+    Worker entry point: unpacks a chunk, validates and checks every scenario and
+    packs the results as: status, length, safe sequence... per scenario (status
+    1 = safe, 0 = unsafe). Scenarios that fail validation are moved to `errors`.
+    """
+    indices, packed_bytes, errors, cached, order, backend = task
+    checked = []
+    safety_backend = get_safety_backend(backend)
+    values = array("q")
+    values.frombytes(packed_bytes)
+    results = array("q")
+    offset = 0
+    for index in indices:
+        num_processes, num_resources = values[offset], values[offset + 1]
+        offset += 2
+        block = num_processes * num_resources
+        allocation = [values[offset + i * num_resources: offset + (i + 1) * num_resources]
+                      for i in range(num_processes)]
+        offset += block
+        max_need = [values[offset + i * num_resources: offset + (i + 1) * num_resources]
+                    for i in range(num_processes)]
+        offset += block
+        available = values[offset: offset + num_resources]
+        offset += num_resources
+
+        try:
+            validate_bankers_input(allocation, max_need, available)
+        except ValueError as error:
+            errors[index] = str(error)
+            continue
+        checked.append(index)
+        _, safe_sequence = safety_backend(allocation, max_need, available, num_processes, num_resources, order)
+        results.extend((1 if len(safe_sequence) == num_processes else 0, len(safe_sequence)))
+        results.extend(safe_sequence)
+    return checked, results.tobytes(), errors, cached
+
+
+def _look_up_verdicts(scenarios, cache, order, pending_keys):
+    """
+    Replaces scenarios found in `cache` by _CachedVerdict markers and records
+    the keys of the others in pending_keys ({index: key}).
+    """
+    for index, scenario in enumerate(scenarios):
+        if not isinstance(scenario, Exception):
+            try:
+                allocation, max_need, available = scenario_parts(scenario)
+                if not isinstance(allocation, dict) and not isinstance(max_need, dict):
+                    key = scenario_key(allocation, max_need, available, order)
+                    verdict = cache.get(key)
+                    if verdict is not None:
+                        scenario = _CachedVerdict(*verdict)
+                    else:
+                        pending_keys[index] = key
+            except (ValueError, KeyError):
+                pass # Reported when the scenario is packed or checked
+        yield scenario
+
+
+def _iter_chunks(scenarios, chunksize):
+    chunk = []
+    for index, scenario in enumerate(scenarios):
+        chunk.append((index, scenario))
+        if len(chunk) >= chunksize:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def _unpack_results(chunk_result):
+    indices, packed_results, errors, cached = chunk_result
+    results = []
+    values = array("q")
+    values.frombytes(packed_results)
+    offset = 0
+    for index in indices:
+        status, length = values[offset], values[offset + 1]
+        offset += 2
+        results.append(BatchResult(index, status == 1, values[offset: offset + length].tolist(), None))
+        offset += length
+    for index, message in errors.items():
+        results.append(BatchResult(index, False, [], message))
+    for index, (is_safe, safe_sequence) in cached.items():
+        results.append(BatchResult(index, is_safe, safe_sequence, None))
+    if errors or cached:
+        results.sort(key=lambda result: result.index)
+    return results
+
+
+def check_many(scenarios, workers=None, chunksize=256, ordered=True, order="index", backend="python", stats=None,
+               cache=None):
+    """
+    Checks many independent scenarios across a process pool.
+
+    Args:
+        scenarios (Iterable): Scenario mappings or (allocation, max_need, available)
+            tuples. Exception instances (e.g. read errors from
+            scenario_io.iter_scenarios) are passed through as error results.
+        workers (int | None): Number of worker processes (default: CPU count).
+            With 1 worker everything runs in the calling process.
+        chunksize (int): Number of scenarios packed into one task.
+        ordered (bool): Yield results in input order (True) or as chunks complete (False).
+        order (str): Safety order passed to the backend ("index" or "rounds").
+        backend (str): Safety check backend used by the workers.
+        stats (BatchStats | None): Filled in with throughput counters while iterating.
+        cache (verdict_cache.VerdictCache | None): Verdicts found here are not
+            sent to the workers; new verdicts are stored in it.
+
+    Yields:
+        BatchResult: One result per scenario.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    get_safety_backend(backend) # Fail fast on unknown backend names.
+    if stats is None:
+        stats = BatchStats()
+    started = time.perf_counter()
+    pending_keys = {} # index -> cache key of scenarios sent to the workers
+    if cache is not None:
+        scenarios = _look_up_verdicts(scenarios, cache, order, pending_keys)
+    tasks = ((indices, packed, errors, cached, order, backend)
+             for indices, packed, errors, cached in map(_pack_chunk, _iter_chunks(scenarios, chunksize)))
+
+    def record(chunk_results):
+        for result in chunk_results:
+            stats.scenarios += 1
+            if cache is not None and result.index in pending_keys:
+                key = pending_keys.pop(result.index)
+                if result.error is None:
+                    cache.put(key, result.safe_sequence, result.is_safe)
+            if result.error is not None:
+                stats.errors += 1
+            elif not result.is_safe:
+                stats.unsafe += 1
+        stats.elapsed_seconds = time.perf_counter() - started
+        return chunk_results
+
+    if workers <= 1:
+        for task in tasks:
+            yield from record(_unpack_results(_check_packed_chunk(task)))
+        return
+
+    # Imported here so that single-process callers (and the CLI) do not pay for it at startup.
+    import multiprocessing
+    with multiprocessing.Pool(processes=workers) as pool:
+        for chunk_result in _map_bounded(pool, tasks, ordered, max_pending=2 * workers):
+            yield from record(_unpack_results(chunk_result))
+
+
+def _map_bounded(pool, tasks, ordered, max_pending):
+    """
+    Like pool.imap() / imap_unordered(), but reads `tasks` only as results are
+    consumed: at most `max_pending` chunks are queued or running at a time.
+    (imap's feeder thread drains the whole task iterator up front, which would
+    buffer an entire input stream in memory.)
+    """
+    if ordered:
+        pending = deque()
+        for task in tasks:
+            pending.append(pool.apply_async(_check_packed_chunk, (task,)))
+            if len(pending) >= max_pending:
+                yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()
+        return
+
+    import queue
+    finished = queue.SimpleQueue() # Results and worker exceptions, in completion order
+    in_flight = 0
+    tasks = iter(tasks)
+    while True:
+        task = next(tasks, None)
+        if task is not None:
+            pool.apply_async(_check_packed_chunk, (task,), callback=finished.put, error_callback=finished.put)
+            in_flight += 1
+            if in_flight < max_pending:
+                continue
+        if not in_flight:
+            return
+        chunk_result = finished.get()
+        in_flight -= 1
+        if isinstance(chunk_result, BaseException):
+            raise chunk_result
+        yield chunk_result
@@ -0,0 +1,209 @@
+"""
+Headless command-line entry point for the Banker's Algorithm safety check.
+
+Reads scenarios (allocation / max / available) from JSON, JSONL, CSV or binary
+.npz files or from stdin, runs the safety check on each one and streams one JSON line per
+scenario to stdout. It never imports the GUI stack, so it starts quickly in
+containers and cron jobs without a display.
+
+Usage:
+    python -m banker_cli scenarios.jsonl
+    cat scenarios.json | python -m banker_cli --backend auto
+    python -m banker_cli big_scenario.npz --backend numpy
+    python -m banker_cli scenarios.jsonl --metrics prometheus --metrics-file metrics.prom
+"""
+import argparse
+import json
+import sys
+import time
+
+from banker_batch import BatchStats, check_many
+from banker_logic import SAFETY_ORDERS, get_safety_backend, run_bankers_algorithm_logic, validate_bankers_input
+from instrumentation import METRICS_FORMATS, Metrics
+from scenario_io import SCENARIO_FORMATS, iter_scenarios
+from sparse_matrix import run_sparse_safety_check
+from verdict_cache import VerdictCache, scenario_key
+
+
+def check_scenario(scenario, order="index", backend="python", cache=None, metrics=None):
+    """
+    Validates and checks one normalized scenario. Scenarios whose matrices
+    are given in sparse form ({"format": "coo" | "rows", ...}) are checked by
+    the sparse engine.
+
+    Args:
+        cache (VerdictCache | None): Dense scenarios found in this cache are
+            answered without validating or checking them again (only valid
+            scenarios are ever stored).
+        metrics (Metrics | None): Records the "validate" phase, the engine's
+            phases and counters, and cache hits.
+
+    Returns:
+        dict: {"id", "safe", "safe_sequence"} describing the verdict.
+    """
+    if isinstance(scenario["allocation"], dict) or isinstance(scenario["max_need"], dict):
+        started = time.perf_counter()
+        _, _, safe_sequence, is_safe_state = run_sparse_safety_check(
+            scenario["allocation"], scenario["max_need"], scenario["available"], order=order)
+        if metrics is not None:
+            metrics.add_time("sparse_check", time.perf_counter() - started)
+        return {"id": scenario["id"], "safe": is_safe_state, "safe_sequence": safe_sequence}
+    key = None
+    if cache is not None:
+        try:
+            key = scenario_key(scenario["allocation"], scenario["max_need"], scenario["available"], order)
+        except ValueError:
+            pass # Not cacheable (malformed, or values beyond int64); validated and checked below
+        else:
+            verdict = cache.get(key)
+            if verdict is not None:
+                if metrics is not None:
+                    metrics.count("cache_hits")
+                return {"id": scenario["id"], "safe": verdict[1], "safe_sequence": verdict[0]}
+    started = time.perf_counter()
+    num_processes, num_resources = validate_bankers_input(scenario["allocation"], scenario["max_need"],
+                                                          scenario["available"])
+    if metrics is not None:
+        metrics.add_time("validate", time.perf_counter() - started)
+    _, _, safe_sequence, is_safe_state = run_bankers_algorithm_logic(
+        scenario["allocation"], scenario["max_need"], scenario["available"],
+        num_processes, num_resources, order=order, backend=backend, trace="none", metrics=metrics)
+    if key is not None:
+        cache.put(key, safe_sequence, is_safe_state)
+    return {"id": scenario["id"], "safe": is_safe_state, "safe_sequence": safe_sequence}
+
+
+def format_result(result, output_format):
+    """
+    Renders one result (or error) as a single output line.
+    """
+    if output_format == "text":
+        if "error" in result:
+            return f"{result['id']}: ERROR {result['error']}"
+        if result["safe"]:
+            return f"{result['id']}: SAFE " + " -> ".join(f"P{p}" for p in result["safe_sequence"])
+        return f"{result['id']}: UNSAFE (deadlock possible)"
+    return json.dumps(result, separators=(",", ":"))
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m banker_cli",
+                                     description="Run the Banker's Algorithm safety check on scenario files.")
+    parser.add_argument("inputs", nargs="*", default=["-"],
+                        help="Scenario files (JSON, JSONL, CSV or .npz). Use '-' or omit to read stdin.")
+    parser.add_argument("--format", choices=SCENARIO_FORMATS, default=None,
+                        help="Input format (default: detected from the file extension or content).")
+    parser.add_argument("--output", choices=("jsonl", "text"), default="jsonl",
+                        help="Output format, one line per scenario (default: jsonl).")
+    parser.add_argument("--order", choices=SAFETY_ORDERS, default="index",
+                        help="Order in which runnable processes are executed (default: index).")
+    parser.add_argument("--backend", default="python",
+                        help="Safety check backend: python, numpy or auto (default: python).")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Check scenarios in a pool of this many worker processes.")
+    parser.add_argument("--chunksize", type=int, default=256,
+                        help="Scenarios sent to a worker per task when --workers is used (default: 256).")
+    parser.add_argument("--stats", action="store_true",
+                        help="Print throughput statistics as JSON to stderr when done.")
+    parser.add_argument("--cache", default=None, metavar="PATH",
+                        help="Reuse verdicts stored in this SQLite file (created if missing).")
+    parser.add_argument("--metrics", choices=METRICS_FORMATS, default=None,
+                        help="Write phase timings and operation counters in this format when done. With "
+                             "--workers only the main process is measured.")
+    parser.add_argument("--metrics-file", default=None, metavar="PATH",
+                        help="File for --metrics (default: stderr).")
+    parser.add_argument("--profile", action="store_true",
+                        help="Include the top cProfile entries of the safety checks in --metrics.")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Include the peak traced memory of the safety checks in --metrics.")
+    return parser
+
+
+def _iter_sequential_results(scenarios, args, stats, cache=None, metrics=None):
+    started = time.perf_counter()
+    if metrics is not None:
+        scenarios = metrics.timed_iter("parse", scenarios)
+    for index, scenario in enumerate(scenarios):
+        if isinstance(scenario, Exception):
+            result = {"id": index, "error": str(scenario)}
+        else:
+            try:
+                result = check_scenario(scenario, order=args.order, backend=args.backend, cache=cache,
+                                        metrics=metrics)
+            except ValueError as error:
+                result = {"id": scenario["id"], "error": str(error)}
+        stats.scenarios += 1
+        if "error" in result:
+            stats.errors += 1
+        elif not result["safe"]:
+            stats.unsafe += 1
+        stats.elapsed_seconds = time.perf_counter() - started
+        yield result
+
+
+def _iter_batch_results(scenarios, args, stats, cache=None):
+    # Scenario ids stay in this process; only the matrices travel to the workers.
+    scenario_ids = {}
+
+    def remember_ids():
+        for index, scenario in enumerate(scenarios):
+            scenario_ids[index] = index if isinstance(scenario, Exception) else scenario["id"]
+            yield scenario
+
+    for batch_result in check_many(remember_ids(), workers=args.workers, chunksize=args.chunksize,
+                                   order=args.order, backend=args.backend, stats=stats, cache=cache):
+        scenario_id = scenario_ids.pop(batch_result.index)
+        if batch_result.error is not None:
+            yield {"id": scenario_id, "error": batch_result.error}
+        else:
+            yield {"id": scenario_id, "safe": batch_result.is_safe, "safe_sequence": batch_result.safe_sequence}
+
+
+def main(argv=None):
+    """
+    Runs the command line interface.
+
+    Returns:
+        int: 0 if every scenario was checked, 1 if any scenario could not be read or was invalid.
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        get_safety_backend(args.backend)
+    except ValueError as error:
+        parser.error(str(error))
+    stats = BatchStats()
+    cache = VerdictCache(path=args.cache) if args.cache else None
+    metrics = Metrics(profile=args.profile, trace_memory=args.trace_memory) if args.metrics else None
+    scenarios = iter_scenarios(args.inputs, args.format)
+    if args.workers is not None:
+        results = _iter_batch_results(scenarios, args, stats, cache)
+        if metrics is not None:
+            results = metrics.timed_iter("batch_check", results)
+    else:
+        results = _iter_sequential_results(scenarios, args, stats, cache, metrics)
+    output = sys.stdout
+    try:
+        for result in results:
+            output.write(format_result(result, args.output) + "\n")
+        output.flush()
+    finally:
+        if cache is not None:
+            cache.close()
+    if metrics is not None:
+        metrics.add_counts({"scenarios": stats.scenarios, "errors": stats.errors})
+        if args.metrics_file:
+            with open(args.metrics_file, "w", encoding="utf-8") as metrics_file:
+                metrics_file.write(metrics.export(args.metrics))
+        else:
+            sys.stderr.write(metrics.export(args.metrics))
+    if args.stats:
+        summary = stats.as_dict()
+        if cache is not None:
+            summary["cache"] = cache.stats()
+        sys.stderr.write(json.dumps(summary) + "\n")
+    return 1 if stats.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
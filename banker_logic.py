@@ -1,41 +1,970 @@
-def run_bankers_algorithm_logic(allocation, max_need, initial_available, num_processes, num_resources):
-    need_matrix = [
+import heapq
+import importlib
+from array import array
+from operator import le, sub
+
+# Orders in which the safety check may release processes that are able to run.
+# "index" reproduces the classic scan: the lowest-numbered runnable process is
+# always executed next. "rounds" executes every process that is runnable with
+# the current Work vector as one batch (in index order) before re-examining.
+SAFETY_ORDERS = ("index", "rounds")
+
+# How much of the simulation is recorded by run_bankers_algorithm_logic().
+# "none" records nothing, "compact" records only the executed process ids (see
+# CompactTrace) and "full" builds the classic list of per-step dicts.
+TRACE_LEVELS = ("none", "compact", "full")
+
+# Largest value validate_bankers_input() accepts: every path (NumPy backend,
+# packed batch buffers, cache keys) stores values as signed 64-bit integers.
+MAX_VALUE = 2 ** 63 - 1
+
+
+def compute_need_matrix(allocation, max_need, num_processes, num_resources):
+    """
+    Calculates the Need matrix (Max - Allocation) for every process.
+
+    Args:
+        allocation (list[list[int]]): Currently allocated resources per process.
+        max_need (list[list[int]]): Maximum resources each process may claim.
+        num_processes (int): Number of processes (n).
+        num_resources (int): Number of resource types (m).
+
+    Returns:
+        list[list[int]]: The n x m Need matrix.
+    """
+    return [
         [max_need[i][j] - allocation[i][j] for j in range(num_resources)]
         for i in range(num_processes)
     ]
+
+
+def _iter_worklist_releases(allocation, need_matrix, initial_available, num_processes, num_resources, order="index"):
+    """
+    Worklist implementation of the safety check, as a generator.
+
+    Instead of rescanning every process after each completion, every unfinished
+    process keeps a count of the resource types it is still blocked on. For each
+    resource type the blocked processes wait in a queue sorted by their need, so
+    when Work grows only the processes whose need is now covered are woken up.
+    A process whose blocked count drops to zero becomes ready to execute.
+
+    Yields:
+        int: Each process as it is executed, before its allocation is returned
+        to Work. The state is safe when every process is yielded.
+    """
+    if order not in SAFETY_ORDERS:
+        raise ValueError(f"Unknown safety order '{order}'. Expected one of {SAFETY_ORDERS}.")
+    work_vector = list(initial_available)
+    blocked_counts = [0] * num_processes
+    resource_queues = [[] for _ in range(num_resources)]
+    for i in range(num_processes):
+        need_row = need_matrix[i]
+        for j in range(num_resources):
+            if need_row[j] > work_vector[j]:
+                blocked_counts[i] += 1
+                resource_queues[j].append((need_row[j], i))
+    for queue in resource_queues:
+        queue.sort()
+    queue_positions = [0] * num_resources
+
+    def release(i, woken_processes, on_wake):
+        # Return process i's allocation to Work and wake every process whose
+        # need for a grown resource type is now covered.
+        allocation_row = allocation[i]
+        for j in range(num_resources):
+            amount = allocation_row[j]
+            if not amount:
+                continue
+            work_vector[j] += amount
+            queue = resource_queues[j]
+            position = queue_positions[j]
+            limit = work_vector[j]
+            while position < len(queue) and queue[position][0] <= limit:
+                waiting_process = queue[position][1]
+                blocked_counts[waiting_process] -= 1
+                if blocked_counts[waiting_process] == 0:
+                    on_wake(woken_processes, waiting_process)
+                position += 1
+            queue_positions[j] = position
+
+    ready_processes = [i for i in range(num_processes) if blocked_counts[i] == 0]
+    if order == "index":
+        # A min-heap always yields the lowest-numbered runnable process, which is
+        # exactly the process the classic restart-from-P0 scan would pick.
+        while ready_processes:
+            i = heapq.heappop(ready_processes)
+            yield i
+            release(i, ready_processes, heapq.heappush)
+    else:
+        while ready_processes:
+            next_round = []
+            for i in ready_processes:
+                yield i
+                release(i, next_round, list.append)
+            next_round.sort()
+            ready_processes = next_round
+
+
+def _worklist_safe_sequence(allocation, need_matrix, initial_available, num_processes, num_resources, order="index"):
+    """
+    Runs the worklist safety check to completion.
+
+    Returns:
+        list[int]: The processes in the order they were executed. The state is
+        safe when every process appears in it.
+    """
+    return list(_iter_worklist_releases(allocation, need_matrix, initial_available,
+                                        num_processes, num_resources, order))
+
+
+def safety_operation_counts(allocation, need_matrix, initial_available, safe_sequence_order, num_resources):
+    """
+    Reconstructs how many operations the worklist safety check performed to
+    produce `safe_sequence_order` (as returned by the Python backend or
+    iter_safe_sequence()), without instrumenting its loops.
+
+    The initial scan compares every Need entry with Work; the entries that fail
+    are queued. Each release with a non-zero amount of resource j then compares
+    queued needs with the grown Work: one comparison per entry it wakes, plus
+    one failed probe if entries remain queued afterwards.
+
+    Returns:
+        dict: need_work_comparisons, blocked_entries, wakeups, failed_probes and
+        processes_released.
+    """
+    num_processes = len(need_matrix)
+    blocked_entries = wakeups = failed_probes = 0
+    for j in range(num_resources):
+        work = initial_available[j]
+        queued_needs = [need_matrix[i][j] for i in range(num_processes) if need_matrix[i][j] > work]
+        blocked_entries += len(queued_needs)
+        if not queued_needs:
+            continue
+        largest_need = max(queued_needs)
+        for i in safe_sequence_order:
+            amount = allocation[i][j]
+            if amount:
+                work += amount
+                if work < largest_need:
+                    failed_probes += 1
+        wakeups += sum(1 for need in queued_needs if need <= work)
+    return {
+        "need_work_comparisons": num_processes * num_resources + wakeups + failed_probes,
+        "blocked_entries": blocked_entries,
+        "wakeups": wakeups,
+        "failed_probes": failed_probes,
+        "processes_released": len(safe_sequence_order),
+    }
+
+
+def _make_step(step_index, process_executed, work_before_execution, allocation_row, num_resources):
+    work_after_execution = [work_before_execution[j] + allocation_row[j] for j in range(num_resources)]
+    return {
+        "step": step_index,
+        "process_executed": process_executed,
+        "work_before_execution": work_before_execution,
+        "allocation": list(allocation_row),
+        "work_after_execution": work_after_execution,
+    }
+
+
+def _build_step_log(allocation, initial_available, safe_sequence_order, num_resources):
+    """
+    Rebuilds the full per-step simulation log from the order in which processes executed.
+    """
     work_vector = list(initial_available)
-    finish_flags = [False] * num_processes
-    safe_sequence_order = []
     simulation_steps_log = []
-    iterations_without_progress = 0
-    while len(safe_sequence_order) < num_processes and iterations_without_progress <= num_processes:
-        found_process_in_current_iteration = False
-        for i in range(num_processes):
-            if not finish_flags[i]:
-                can_process_execute = True
-                for j in range(num_resources):
-                    if need_matrix[i][j] > work_vector[j]:
-                        can_process_execute = False
-                        break
-                if can_process_execute:
-                    current_work_before_execution = list(work_vector)
-                    for j in range(num_resources):
-                        work_vector[j] += allocation[i][j]
-                    finish_flags[i] = True
-                    safe_sequence_order.append(i)
-                    found_process_in_current_iteration = True
-                    iterations_without_progress = 0
-                    simulation_steps_log.append({
-                        "process_executed": i,
-                        "work_before_execution": current_work_before_execution,
-                        "allocation": list(allocation[i]),
-                        "work_after_execution": list(work_vector),
-                        "safe_sequence_progress": list(safe_sequence_order)
-                    })
-                    break
-        if not found_process_in_current_iteration:
-            iterations_without_progress += 1
-            if iterations_without_progress > num_processes:
-                break
-    is_safe_state = all(finish_flags)
-    return need_matrix, simulation_steps_log, safe_sequence_order, is_safe_state
+    for step_index, i in enumerate(safe_sequence_order):
+        step_info = _make_step(step_index, i, work_vector, allocation[i], num_resources)
+        step_info["safe_sequence_progress"] = safe_sequence_order[:step_index + 1]
+        simulation_steps_log.append(step_info)
+        work_vector = list(step_info["work_after_execution"])
+    return simulation_steps_log
+
+
+class CompactTrace:
+    """
+    Array-backed simulation trace that stores only the executed process ids.
+
+    Work vectors are rebuilt lazily from the allocation matrix: a checkpoint of
+    Work is kept every CHECKPOINT_INTERVAL steps (computed on demand), so any
+    step can be materialized in O(CHECKPOINT_INTERVAL * m). Indexing and
+    iterating yield the same dicts as the full step log, so the trace can be used
+    wherever the list of steps is expected.
+    """
+    CHECKPOINT_INTERVAL = 256
+
+    def __init__(self, allocation, initial_available, executed_processes, num_resources):
+        """
+        Args:
+            allocation (list[list[int]]): Allocation matrix used by the safety check.
+            initial_available (list[int]): Work vector before the first step.
+            executed_processes (Iterable[int]): Process ids in execution order.
+            num_resources (int): Number of resource types (m).
+        """
+        self.executed_processes = array("q", executed_processes)
+        self.num_resources = num_resources
+        self._allocation = allocation
+        self._checkpoints = [list(initial_available)] # Work before step k * CHECKPOINT_INTERVAL
+
+    def __len__(self):
+        return len(self.executed_processes)
+
+    def _advance(self, work_vector, start, stop):
+        for k in range(start, stop):
+            allocation_row = self._allocation[self.executed_processes[k]]
+            for j in range(self.num_resources):
+                work_vector[j] += allocation_row[j]
+        return work_vector
+
+    def work_before(self, step_index):
+        """
+        Returns the Work vector just before step `step_index` was executed.
+        """
+        if not 0 <= step_index <= len(self):
+            raise IndexError("trace step out of range")
+        checkpoint_index = step_index // self.CHECKPOINT_INTERVAL
+        while len(self._checkpoints) <= checkpoint_index:
+            start = (len(self._checkpoints) - 1) * self.CHECKPOINT_INTERVAL
+            self._checkpoints.append(self._advance(list(self._checkpoints[-1]), start,
+                                                   start + self.CHECKPOINT_INTERVAL))
+        start = checkpoint_index * self.CHECKPOINT_INTERVAL
+        return self._advance(list(self._checkpoints[checkpoint_index]), start, step_index)
+
+    def step(self, step_index, include_progress=True):
+        """
+        Materializes one step as a dict in the same format as the full step log.
+        """
+        process_executed = self.executed_processes[step_index]
+        step_info = _make_step(step_index, process_executed, self.work_before(step_index),
+                               self._allocation[process_executed], self.num_resources)
+        if include_progress:
+            step_info["safe_sequence_progress"] = self.executed_processes[:step_index + 1].tolist()
+        return step_info
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[k] for k in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("trace step out of range")
+        return self.step(index)
+
+    def iter_steps(self, start=0, include_progress=False):
+        """
+        Streams steps from `start` onwards, carrying Work forward instead of
+        rebuilding it for every step.
+        """
+        work_vector = self.work_before(start)
+        for step_index in range(start, len(self)):
+            process_executed = self.executed_processes[step_index]
+            step_info = _make_step(step_index, process_executed, work_vector,
+                                   self._allocation[process_executed], self.num_resources)
+            if include_progress:
+                step_info["safe_sequence_progress"] = self.executed_processes[:step_index + 1].tolist()
+            work_vector = list(step_info["work_after_execution"])
+            yield step_info
+
+    def __iter__(self):
+        return self.iter_steps(include_progress=True)
+
+
+def _build_trace(trace, allocation, initial_available, safe_sequence_order, num_resources):
+    if trace == "none":
+        return None
+    if trace == "compact":
+        return CompactTrace(allocation, initial_available, safe_sequence_order, num_resources)
+    return _build_step_log(allocation, initial_available, safe_sequence_order, num_resources)
+
+
+def _python_backend(allocation, max_need, initial_available, num_processes, num_resources, order="index"):
+    """
+    Pure-Python safety check backend (always available).
+
+    Returns:
+        tuple: (need_matrix, safe_sequence_order)
+    """
+    need_matrix = compute_need_matrix(allocation, max_need, num_processes, num_resources)
+    safe_sequence_order = _worklist_safe_sequence(allocation, need_matrix, initial_available,
+                                                  num_processes, num_resources, order)
+    return need_matrix, safe_sequence_order
+
+
+# Registry of safety check backends. A backend is called as
+# backend(allocation, max_need, initial_available, num_processes, num_resources, order)
+# and returns (need_matrix, safe_sequence_order) using plain Python lists and ints.
+_SAFETY_BACKENDS = {"python": _python_backend}
+
+# Backends living in modules with optional dependencies. The module is imported
+# on first use and is expected to register itself with register_safety_backend().
+_OPTIONAL_BACKEND_MODULES = {"numpy": "banker_numpy"}
+
+
+def register_safety_backend(name, backend):
+    """
+    Registers a safety check backend under the given name.
+
+    Args:
+        name (str): Name used to select the backend (e.g. "numpy").
+        backend (callable): Function with the same signature as the Python backend.
+    """
+    _SAFETY_BACKENDS[name] = backend
+
+
+def get_safety_backend(name="python"):
+    """
+    Looks up a safety check backend by name.
+
+    "auto" picks the fastest backend that can be loaded. A known optional backend
+    whose dependency is not installed falls back to the pure-Python backend,
+    which produces identical results.
+
+    Args:
+        name (str): Backend name ("python", "numpy" or "auto").
+
+    Returns:
+        callable: The backend function.
+    """
+    if name == "auto":
+        for optional_name in _OPTIONAL_BACKEND_MODULES:
+            backend = get_safety_backend(optional_name)
+            if backend is not _python_backend:
+                return backend
+        return _python_backend
+    if name not in _SAFETY_BACKENDS and name in _OPTIONAL_BACKEND_MODULES:
+        try:
+            importlib.import_module(_OPTIONAL_BACKEND_MODULES[name])
+        except ImportError:
+            return _python_backend
+    try:
+        return _SAFETY_BACKENDS[name]
+    except KeyError:
+        known_backends = sorted(set(_SAFETY_BACKENDS) | set(_OPTIONAL_BACKEND_MODULES) | {"auto"})
+        raise ValueError(f"Unknown safety backend '{name}'. Expected one of {known_backends}.") from None
+
+
+def available_backends():
+    """
+    Returns the names of all backends that can actually be loaded in this environment.
+    """
+    names = []
+    for name in list(_SAFETY_BACKENDS) + [n for n in _OPTIONAL_BACKEND_MODULES if n not in _SAFETY_BACKENDS]:
+        if name == "python" or get_safety_backend(name) is not _python_backend:
+            names.append(name)
+    return names
+
+
+def run_bankers_algorithm_logic(allocation, max_need, initial_available, num_processes, num_resources,
+                                order="index", backend="python", trace="full", metrics=None):
+    """
+    Runs the Banker's Algorithm safety check.
+
+    Args:
+        allocation (list[list[int]]): Currently allocated resources per process.
+        max_need (list[list[int]]): Maximum resources each process may claim.
+        initial_available (list[int]): Currently available instances of each resource.
+        num_processes (int): Number of processes (n).
+        num_resources (int): Number of resource types (m).
+        order (str): "index" (default) executes the lowest-numbered runnable
+            process first, giving the same safe sequence as the classic scan.
+            "rounds" executes all currently runnable processes as one batch.
+        backend (str): Name of the safety check backend ("python", "numpy" or
+            "auto"). All backends return identical results.
+        trace (str): "full" (default) returns the list of per-step dicts,
+            "compact" returns a CompactTrace and "none" returns None for the
+            simulation steps, skipping the trace entirely.
+        metrics (Metrics | None): If given (see instrumentation.py), records the
+            "safety_check" and "trace" phases, the operation counters of the
+            Python backend and, if enabled there, profiling data.
+
+    Returns:
+        tuple: (need_matrix, simulation_steps, safe_sequence, is_safe_state)
+    """
+    if order not in SAFETY_ORDERS:
+        raise ValueError(f"Unknown safety order '{order}'. Expected one of {SAFETY_ORDERS}.")
+    if trace not in TRACE_LEVELS:
+        raise ValueError(f"Unknown trace level '{trace}'. Expected one of {TRACE_LEVELS}.")
+    safety_backend = get_safety_backend(backend)
+    if metrics is not None:
+        return _run_measured(metrics, safety_backend, allocation, max_need, initial_available,
+                             num_processes, num_resources, order, trace)
+    need_matrix, safe_sequence_order = safety_backend(allocation, max_need, initial_available,
+                                                      num_processes, num_resources, order)
+    simulation_steps = _build_trace(trace, allocation, initial_available, safe_sequence_order, num_resources)
+    is_safe_state = len(safe_sequence_order) == num_processes
+    return need_matrix, simulation_steps, safe_sequence_order, is_safe_state
+
+
+def _run_measured(metrics, safety_backend, allocation, max_need, initial_available,
+                  num_processes, num_resources, order, trace):
+    """
+    run_bankers_algorithm_logic() with phase timings and operation counters recorded in `metrics`.
+    """
+    with metrics.profiling():
+        with metrics.phase("safety_check"):
+            need_matrix, safe_sequence_order = safety_backend(allocation, max_need, initial_available,
+                                                              num_processes, num_resources, order)
+        with metrics.phase("trace"):
+            simulation_steps = _build_trace(trace, allocation, initial_available, safe_sequence_order, num_resources)
+    is_safe_state = len(safe_sequence_order) == num_processes
+    metrics.count("safety_checks")
+    metrics.count("unsafe_states", 0 if is_safe_state else 1)
+    if safety_backend is _python_backend:
+        # Other backends vectorize the check, so these counts would not describe them.
+        metrics.add_counts(safety_operation_counts(allocation, need_matrix, initial_available,
+                                                      safe_sequence_order, num_resources))
+    return need_matrix, simulation_steps, safe_sequence_order, is_safe_state
+
+
+def iter_safe_sequence(allocation, need_matrix, initial_available, num_processes, num_resources, order="index"):
+    """
+    Streams the processes of the safety check in execution order.
+
+    Intended for callers that want to report progress or stop early (e.g. a
+    background GUI worker); simply stop iterating to cancel the check. The state
+    is safe when `num_processes` processes are produced.
+
+    Args:
+        need_matrix (list[list[int]]): Need matrix from compute_need_matrix().
+
+    Yields:
+        int: Each process id as it is executed.
+    """
+    return _iter_worklist_releases(allocation, need_matrix, initial_available,
+                                   num_processes, num_resources, order)
+
+
+def iter_bankers_steps(allocation, max_need, initial_available, num_processes, num_resources, order="index"):
+    """
+    Streams the simulation steps of the safety check as they happen.
+
+    Each yielded dict has the keys "step", "process_executed",
+    "work_before_execution", "allocation" and "work_after_execution" (the
+    quadratic "safe_sequence_progress" list is left out). The state is safe
+    when `num_processes` steps are produced.
+
+    Yields:
+        dict: One entry per executed process.
+    """
+    need_matrix = compute_need_matrix(allocation, max_need, num_processes, num_resources)
+    work_vector = list(initial_available)
+    releases = _iter_worklist_releases(allocation, need_matrix, initial_available,
+                                       num_processes, num_resources, order)
+    for step_index, i in enumerate(releases):
+        step_info = _make_step(step_index, i, work_vector, allocation[i], num_resources)
+        work_vector = list(step_info["work_after_execution"])
+        yield step_info
+
+
+class BankerState:
+    """
+    Long-lived Banker's Algorithm state for incremental admission control.
+
+    The state caches the Need matrix, the last safe sequence and, for every
+    position in that sequence, the slack (Work - Need) the sequence proves.
+    A request by the process at position q keeps the cached sequence safe as
+    long as it fits inside the available resources and inside the slack of every
+    process ahead of it, so most grants are decided without a full re-check.
+    Releases and removals never make a safe state unsafe and only adjust the
+    cached slack. Only requests that do not fit the proven slack fall back to a
+    full safety check.
+
+    Processes are identified by integer ids that are never reused.
+    """
+
+    def __init__(self, allocation, max_need, available):
+        """
+        Args:
+            allocation (list[list[int]]): Initial allocation per process (P0, P1, ...).
+            max_need (list[list[int]]): Maximum claim per process.
+            available (list[int]): Currently available instances of each resource.
+        """
+        self.num_resources = len(available)
+        self._available = self._checked_vector(available, "Available")
+        self._allocation = {}
+        self._max_need = {}
+        self._need = {}
+        if len(allocation) != len(max_need):
+            raise ValueError("Allocation and Max Need must describe the same number of processes.")
+        for pid, (allocation_row, max_row) in enumerate(zip(allocation, max_need)):
+            allocation_row = self._checked_vector(allocation_row, f"Allocation of P{pid}")
+            max_row = self._checked_vector(max_row, f"Max Need of P{pid}")
+            self._store_process(pid, allocation_row, max_row)
+        self._next_pid = len(allocation)
+        # Total instances of each resource: Work after every process has finished.
+        self._total_resources = list(self._available)
+        for allocation_row in self._allocation.values():
+            for j in range(self.num_resources):
+                self._total_resources[j] += allocation_row[j]
+
+        # Counters describing how admission decisions were reached.
+        self.fast_path_grants = 0
+        self.full_checks = 0
+
+        self._safe_sequence = None # Last proven safe sequence (list of pids), or None
+        self._slack = None         # Work - Need at each position of the safe sequence, per resource
+        self._positions = None     # pid -> position in the safe sequence
+        self._stale = False        # True when the state changed while it was unsafe
+        # Processes that could not finish in the full check that refused the last
+        # refused request (None if it did not fit Available); see still_refused().
+        self.last_blocked = None
+        self._recheck()
+
+    # --- Validation helpers ---
+
+    def _checked_vector(self, vector, description):
+        vector = list(vector)
+        if len(vector) != self.num_resources:
+            raise ValueError(f"{description} must have {self.num_resources} entries, got {len(vector)}.")
+        for value in vector:
+            if not isinstance(value, int) or value < 0:
+                raise ValueError(f"{description} must contain non-negative integers.")
+        return vector
+
+    def _store_process(self, pid, allocation_row, max_row):
+        for j in range(self.num_resources):
+            if max_row[j] < allocation_row[j]:
+                raise ValueError(f"Max Need for P{pid} R{j} ({max_row[j]}) must be >= Allocation ({allocation_row[j]}).")
+        self._allocation[pid] = allocation_row
+        self._max_need[pid] = max_row
+        self._need[pid] = [max_row[j] - allocation_row[j] for j in range(self.num_resources)]
+
+    def _known_pid(self, pid):
+        if pid not in self._allocation:
+            raise KeyError(f"Unknown process P{pid}.")
+
+    # --- Cached safety information ---
+
+    def _recheck(self):
+        """
+        Runs a full safety check and refreshes the cached sequence. Returns the verdict.
+        """
+        self.full_checks += 1
+        self._stale = False
+        pids = list(self._allocation)
+        sequence_indices = _worklist_safe_sequence(
+            [self._allocation[pid] for pid in pids], [self._need[pid] for pid in pids],
+            self._available, len(pids), self.num_resources, order="rounds")
+        if len(sequence_indices) != len(pids):
+            finished = set(sequence_indices)
+            self.last_blocked = [pid for k, pid in enumerate(pids) if k not in finished]
+            self._safe_sequence = self._slack = self._positions = None
+            return False
+        self._cache_sequence([pids[k] for k in sequence_indices])
+        return True
+
+    def _cache_sequence(self, safe_sequence):
+        # Slack is stored per resource (one column per resource type) so the
+        # prefix checks and updates run over flat lists.
+        work_vector = list(self._available)
+        slack = [[] for _ in range(self.num_resources)]
+        for pid in safe_sequence:
+            need_row = self._need[pid]
+            allocation_row = self._allocation[pid]
+            for j in range(self.num_resources):
+                slack[j].append(work_vector[j] - need_row[j])
+                work_vector[j] += allocation_row[j]
+        self._safe_sequence = safe_sequence
+        self._slack = slack
+        self._positions = {pid: k for k, pid in enumerate(safe_sequence)}
+
+    def _fits_proven_slack(self, nonzero_entries, position):
+        """
+        True if the (j, amount) entries fit the slack of every process before `position`.
+        """
+        for j, amount in nonzero_entries:
+            if position and min(self._slack[j][:position]) < amount:
+                return False
+        return True
+
+    def _shift_slack(self, nonzero_entries, position, sign):
+        for j, amount in nonzero_entries:
+            slack_column = self._slack[j]
+            amount *= sign
+            slack_column[:position] = [value + amount for value in slack_column[:position]]
+
+    # --- Public API ---
+
+    @property
+    def processes(self):
+        """List of active process ids."""
+        return list(self._allocation)
+
+    @property
+    def available(self):
+        """Copy of the currently available resources."""
+        return list(self._available)
+
+    @property
+    def is_safe(self):
+        """Whether the current state is safe."""
+        if self._stale:
+            return self._recheck()
+        return self._safe_sequence is not None
+
+    @property
+    def safe_sequence(self):
+        """A safe sequence for the current state (list of pids), or None if unsafe."""
+        if self._stale:
+            self._recheck()
+        return None if self._safe_sequence is None else list(self._safe_sequence)
+
+    def allocation(self, pid):
+        """Copy of the resources currently allocated to process `pid`."""
+        self._known_pid(pid)
+        return list(self._allocation[pid])
+
+    def need(self, pid):
+        """Copy of the remaining need of process `pid`."""
+        self._known_pid(pid)
+        return list(self._need[pid])
+
+    def snapshot(self):
+        """
+        Returns the current state as plain lists.
+
+        Returns:
+            tuple: (pids, allocation, max_need, available)
+        """
+        pids = list(self._allocation)
+        return (pids, [list(self._allocation[pid]) for pid in pids],
+                [list(self._max_need[pid]) for pid in pids], list(self._available))
+
+    def request(self, pid, vector):
+        """
+        Resource-request algorithm: grants `vector` to process `pid` only if the
+        resulting state is safe.
+
+        Args:
+            pid (int): Requesting process.
+            vector (list[int]): Requested instances of each resource.
+
+        Returns:
+            bool: True if the request was granted, False if the process must wait.
+
+        Raises:
+            KeyError: If the process is unknown.
+            ValueError: If the request is malformed or exceeds the process's maximum claim.
+        """
+        self._known_pid(pid)
+        vector = self._checked_vector(vector, f"Request of P{pid}")
+        need_row = self._need[pid]
+        nonzero_entries = [(j, amount) for j, amount in enumerate(vector) if amount]
+        for j, amount in nonzero_entries:
+            if amount > need_row[j]:
+                raise ValueError(f"P{pid} has exceeded its maximum claim for R{j}.")
+        for j, amount in nonzero_entries:
+            if amount > self._available[j]:
+                self.last_blocked = None
+                return False
+
+        fast_path = (self._safe_sequence is not None and not self._stale and
+                     self._fits_proven_slack(nonzero_entries, self._positions[pid]))
+        self._apply_grant(pid, nonzero_entries, 1)
+        if fast_path:
+            # The cached sequence is still safe: only the processes ahead of pid
+            # see less Work, by exactly the granted amount.
+            self._shift_slack(nonzero_entries, self._positions[pid], -1)
+            self.fast_path_grants += 1
+            return True
+
+        previous_cache = (self._safe_sequence, self._slack, self._positions, self._stale)
+        if self._recheck():
+            return True
+        self._apply_grant(pid, nonzero_entries, -1)
+        self._safe_sequence, self._slack, self._positions, self._stale = previous_cache
+        return False
+
+    def still_refused(self, blocked, pid, vector):
+        """
+        Cheaply re-checks a refused request against the current state.
+
+        `blocked` is the `last_blocked` list of the full check that refused the
+        request. If, even with every other process finished and its resources
+        returned, no process in `blocked` could finish after the grant, the
+        request would still leave the state unsafe. This costs
+        O(len(blocked) * m) instead of a full safety check and holds whatever
+        was granted or released since.
+
+        Returns:
+            bool: True if the request is certainly still refused; False if it
+            has to be decided by request().
+        """
+        try:
+            allocation_rows = [self._allocation[blocker] for blocker in blocked]
+        except KeyError:
+            return False # A blocker has exited
+        if not allocation_rows:
+            return False
+        work_vector = [total - sum(column) for total, column in zip(self._total_resources, zip(*allocation_rows))]
+        if pid in blocked:
+            work_vector = list(map(sub, work_vector, vector))
+        for blocker in blocked:
+            need_row = self._need[blocker]
+            if blocker == pid:
+                need_row = map(sub, need_row, vector)
+            if all(map(le, need_row, work_vector)):
+                return False
+        return True
+
+    def _apply_grant(self, pid, nonzero_entries, sign):
+        allocation_row = self._allocation[pid]
+        need_row = self._need[pid]
+        for j, amount in nonzero_entries:
+            self._available[j] -= sign * amount
+            allocation_row[j] += sign * amount
+            need_row[j] -= sign * amount
+
+    def request_many(self, requests):
+        """
+        Decides a batch of requests, with the same results as calling request()
+        for each of them in order, but with one safety evaluation for the whole
+        batch when possible.
+
+        The leading requests that fit Available and their processes' Need
+        (given the earlier requests of the batch) are granted tentatively. If
+        the combined state is safe, each of them would also have been granted on
+        its own, since every earlier state in the batch is the combined state
+        plus some releases. Otherwise the batch is undone and every request is
+        decided one at a time.
+
+        Args:
+            requests (Iterable[tuple[int, list[int]]]): (pid, vector) pairs.
+
+        Returns:
+            list: One entry per request: True if granted, False if the process
+            must wait, or the KeyError / ValueError instance that request() would
+            have raised.
+        """
+        requests = list(requests)
+        results = [None] * len(requests)
+        remaining_available = list(self._available)
+        remaining_need = {}
+        batch = [] # (index, pid, nonzero entries)
+        for index, (pid, vector) in enumerate(requests):
+            try:
+                self._known_pid(pid)
+                vector = self._checked_vector(vector, f"Request of P{pid}")
+            except (KeyError, ValueError) as error:
+                results[index] = error
+                continue
+            need_row = remaining_need.setdefault(pid, list(self._need[pid]))
+            nonzero_entries = [(j, amount) for j, amount in enumerate(vector) if amount]
+            if any(amount > need_row[j] for j, amount in nonzero_entries):
+                continue # Exceeds the claim now and after any later grant: request() raises.
+            if any(amount > remaining_available[j] for j, amount in nonzero_entries):
+                break # This one must wait; it and everything after it are decided one by one.
+            for j, amount in nonzero_entries:
+                need_row[j] -= amount
+                remaining_available[j] -= amount
+            batch.append((index, pid, nonzero_entries))
+
+        for _, pid, nonzero_entries in batch:
+            self._apply_grant(pid, nonzero_entries, 1)
+        fast_path = self._safe_sequence is not None and not self._stale and self._fits_batch_slack(batch)
+        if fast_path:
+            self.fast_path_grants += len(batch)
+        previous_cache = (self._safe_sequence, self._slack, self._positions, self._stale)
+        if fast_path or not batch or self._recheck():
+            for index, _, _ in batch:
+                results[index] = True
+        else:
+            for _, pid, nonzero_entries in batch:
+                self._apply_grant(pid, nonzero_entries, -1)
+            self._safe_sequence, self._slack, self._positions, self._stale = previous_cache
+
+        # Requests outside the batch (or all of them, if the batch was undone) one at a time.
+        for index, (pid, vector) in enumerate(requests):
+            if results[index] is None:
+                try:
+                    results[index] = self.request(pid, vector)
+                except (KeyError, ValueError) as error:
+                    results[index] = error
+        return results
+
+    def _fits_batch_slack(self, batch):
+        """
+        Checks a batch of grants (already applied) against the cached sequence and,
+        if they fit, updates the slack.
+
+        A grant to the process at position q lowers the slack of every position
+        before q by its amount, so position k loses the sum of the grants at
+        positions after k.
+        """
+        per_resource = {} # resource -> {position: amount}
+        for _, pid, nonzero_entries in batch:
+            position = self._positions[pid]
+            for j, amount in nonzero_entries:
+                amounts = per_resource.setdefault(j, {})
+                amounts[position] = amounts.get(position, 0) + amount
+        segments = {} # resource -> [(start, stop, amount lost by positions start..stop-1)]
+        for j, amounts in per_resource.items():
+            slack_column = self._slack[j]
+            positions = sorted(amounts, reverse=True)
+            lost = 0
+            segments[j] = []
+            for k, position in enumerate(positions):
+                lost += amounts[position]
+                start = positions[k + 1] if k + 1 < len(positions) else 0
+                if start < position:
+                    if min(slack_column[start:position]) < lost:
+                        return False
+                    segments[j].append((start, position, lost))
+        for j, column_segments in segments.items():
+            slack_column = self._slack[j]
+            for start, stop, lost in column_segments:
+                slack_column[start:stop] = [value - lost for value in slack_column[start:stop]]
+        return True
+
+    def release(self, pid, vector):
+        """
+        Returns `vector` from process `pid` to the available pool. A release
+        never makes a safe state unsafe, so no safety check is needed.
+
+        Raises:
+            KeyError: If the process is unknown.
+            ValueError: If the process does not hold the resources it releases.
+        """
+        self._known_pid(pid)
+        vector = self._checked_vector(vector, f"Release of P{pid}")
+        allocation_row = self._allocation[pid]
+        nonzero_entries = [(j, amount) for j, amount in enumerate(vector) if amount]
+        for j, amount in nonzero_entries:
+            if amount > allocation_row[j]:
+                raise ValueError(f"P{pid} cannot release more of R{j} than it holds.")
+        self._apply_grant(pid, nonzero_entries, -1)
+        if self._safe_sequence is not None:
+            self._shift_slack(nonzero_entries, self._positions[pid], 1)
+        elif nonzero_entries:
+            self._stale = True
+
+    def add_process(self, max_claim, allocation=None, pid=None):
+        """
+        Admits a new process with the given maximum claim and optional initial allocation.
+
+        Args:
+            max_claim (list[int]): Maximum resources the process may claim.
+            allocation (list[int] | None): Resources granted on admission (defaults to none).
+            pid (int | None): Explicit process id; a fresh id is assigned if omitted.
+
+        Returns:
+            int | None: The new process id, or None if admitting it would make the state unsafe.
+        """
+        max_row = self._checked_vector(max_claim, "Max claim")
+        allocation_row = self._checked_vector(allocation if allocation is not None else [0] * self.num_resources,
+                                              "Initial allocation")
+        if pid is None:
+            pid = self._next_pid
+        elif pid in self._allocation:
+            raise ValueError(f"Process P{pid} already exists.")
+        for j in range(self.num_resources):
+            if allocation_row[j] > self._available[j]:
+                return None
+        nonzero_entries = [(j, amount) for j, amount in enumerate(allocation_row) if amount]
+        # Appended to the end of the cached sequence, the new process runs with
+        # every resource in the system, less its own allocation held since admission.
+        fast_path = (self._safe_sequence is not None and not self._stale and
+                     all(max_row[j] <= self._total_resources[j] for j in range(self.num_resources)) and
+                     self._fits_proven_slack(nonzero_entries, len(self._safe_sequence)))
+
+        self._store_process(pid, allocation_row, max_row)
+        for j, amount in nonzero_entries:
+            self._available[j] -= amount
+        self._next_pid = max(self._next_pid, pid + 1)
+        if fast_path:
+            self._shift_slack(nonzero_entries, len(self._safe_sequence), -1)
+            self._positions[pid] = len(self._safe_sequence)
+            self._safe_sequence.append(pid)
+            for j in range(self.num_resources):
+                self._slack[j].append(self._total_resources[j] - max_row[j])
+            self.fast_path_grants += 1
+            return pid
+
+        previous_cache = (self._safe_sequence, self._slack, self._positions, self._stale)
+        if self._recheck():
+            return pid
+        self._forget_process(pid)
+        self._safe_sequence, self._slack, self._positions, self._stale = previous_cache
+        return None
+
+    def _forget_process(self, pid):
+        allocation_row = self._allocation.pop(pid)
+        del self._max_need[pid]
+        del self._need[pid]
+        for j in range(self.num_resources):
+            self._available[j] += allocation_row[j]
+        return allocation_row
+
+    def remove_process(self, pid):
+        """
+        Removes process `pid` (e.g. on exit) and returns its allocation to the available pool.
+
+        Returns:
+            list[int]: The resources the process held.
+        """
+        self._known_pid(pid)
+        allocation_row = self._forget_process(pid)
+        if self._safe_sequence is not None:
+            position = self._positions.pop(pid)
+            nonzero_entries = [(j, amount) for j, amount in enumerate(allocation_row) if amount]
+            self._shift_slack(nonzero_entries, position, 1)
+            del self._safe_sequence[position]
+            for slack_column in self._slack:
+                del slack_column[position]
+            for k in range(position, len(self._safe_sequence)):
+                self._positions[self._safe_sequence[k]] = k
+        else:
+            self._stale = True
+        return allocation_row
+
+
+def _sequence_length(value, message):
+    """
+    Returns len(value) for a list-like value (a list, tuple or memoryview row, a
+    NumPy array, ...); raises ValueError(message) for anything else.
+    """
+    if isinstance(value, (str, bytes, dict)) or not hasattr(value, "__getitem__"):
+        raise ValueError(message)
+    try:
+        return len(value)
+    except TypeError: # e.g. a 0-d NumPy array
+        raise ValueError(message) from None
+
+
+def validate_bankers_input(allocation, max_need, available):
+    """
+    Checks that a scenario is well formed: consistent dimensions, non-negative
+    integers that fit a signed 64-bit integer (what the NumPy backend, the
+    batch workers and the verdict cache store) and Max Need >= Allocation everywhere.
+
+    Args:
+        allocation (list[list[int]]): Allocation matrix.
+        max_need (list[list[int]]): Max Need matrix.
+        available (list[int]): Available resources vector.
+
+    Returns:
+        tuple: (num_processes, num_resources)
+
+    Raises:
+        ValueError: Describing the first problem found.
+    """
+    num_processes = _sequence_length(allocation, "Allocation must be a list of rows.")
+    num_resources = _sequence_length(available, "Available must be a list of integers.")
+    if _sequence_length(max_need, "Max Need must be a list of rows.") != num_processes:
+        raise ValueError(f"Allocation has {num_processes} rows but Max Need has {len(max_need)}.")
+    for idx, value in enumerate(available):
+        if not isinstance(value, int) or isinstance(value, bool) or not 0 <= value <= MAX_VALUE:
+            raise ValueError(f"Invalid value found for resource {idx}. All available resource values must be non-negative 64-bit integers.")
+    for matrix_name, matrix in (("Allocation", allocation), ("Max Need", max_need)):
+        for r_idx, row in enumerate(matrix):
+            if _sequence_length(row, f"{matrix_name} row {r_idx} must be a list of integers.") != num_resources:
+                raise ValueError(f"{matrix_name} row {r_idx} has {len(row)} columns, expected {num_resources}.")
+            for c_idx, value in enumerate(row):
+                if not isinstance(value, int) or isinstance(value, bool) or not 0 <= value <= MAX_VALUE:
+                    raise ValueError(f"Invalid value found in {matrix_name} at row {r_idx}, column {c_idx}. All matrix values must be non-negative 64-bit integers.")
+    for i in range(num_processes):
+        for j in range(num_resources):
+            if max_need[i][j] < allocation[i][j]:
+                raise ValueError(f"Max Need for P{i} R{j} ({max_need[i][j]}) must be >= Allocation for P{i} R{j} ({allocation[i][j]}).")
+    return num_processes, num_resources
@@ -0,0 +1,83 @@
+"""
+NumPy-vectorized backend for the Banker's Algorithm safety check.
+
+Importing this module registers the "numpy" backend with banker_logic. It is
+loaded lazily by banker_logic.get_safety_backend(), so NumPy stays an optional
+dependency: when it is missing the pure-Python backend is used instead.
+"""
+import numpy as np
+
+from banker_logic import register_safety_backend
+
+# Work can grow to Available plus the column sums of Allocation. Below this
+# bound (checked in float64, so with a wide margin) int64 cannot wrap.
+_INT64_SAFE_TOTAL = 2.0 ** 62
+
+
+def _as_int_matrix(values, num_rows, num_cols):
+    """
+    Converts a list-of-lists (or array) into a contiguous int64 ndarray of shape (rows, cols).
+    """
+    return np.ascontiguousarray(np.asarray(values, dtype=np.int64).reshape(num_rows, num_cols))
+
+
+def numpy_backend(allocation, max_need, initial_available, num_processes, num_resources, order="index"):
+    """
+    Vectorized safety check. Produces the same results as the pure-Python backend.
+
+    Allocation, Max and Need are held as contiguous int64 matrices and every
+    "Need <= Work" test is evaluated for all candidate rows at once. When Work
+    could outgrow int64, the arrays are switched to Python integers (object
+    dtype) so the result still matches the pure-Python backend.
+
+    Returns:
+        tuple: (need_matrix, safe_sequence_order) as plain Python lists.
+    """
+    allocation_array = _as_int_matrix(allocation, num_processes, num_resources)
+    max_array = _as_int_matrix(max_need, num_processes, num_resources)
+    need_array = max_array - allocation_array
+    work_vector = np.array(initial_available, dtype=np.int64).reshape(num_resources)
+    largest_work = work_vector.astype(np.float64) + allocation_array.sum(axis=0, dtype=np.float64)
+    if largest_work.size and largest_work.max() >= _INT64_SAFE_TOTAL:
+        allocation_array = allocation_array.astype(object)
+        need_array = need_array.astype(object)
+        work_vector = work_vector.astype(object)
+    safe_sequence_order = []
+
+    if order == "index":
+        # Keep a "runnable" flag per process. Work only grows, so a runnable
+        # process stays runnable and only the remaining rows are re-tested after
+        # each execution. The lowest-numbered runnable process runs next.
+        finished = np.zeros(num_processes, dtype=bool)
+        runnable = (need_array <= work_vector).all(axis=1)
+        while True:
+            candidates = np.flatnonzero(runnable & ~finished)
+            if candidates.size == 0:
+                break
+            i = int(candidates[0])
+            safe_sequence_order.append(i)
+            finished[i] = True
+            if allocation_array[i].any():
+                work_vector += allocation_array[i]
+                pending = np.flatnonzero(~runnable)
+                if pending.size:
+                    runnable[pending] = (need_array[pending] <= work_vector).all(axis=1)
+    elif order == "rounds":
+        # Release every process that is runnable with the current Work vector in
+        # a single vectorized update, then re-test the remaining rows.
+        unfinished = np.arange(num_processes)
+        while unfinished.size:
+            runnable = (need_array[unfinished] <= work_vector).all(axis=1)
+            if not runnable.any():
+                break
+            released = unfinished[runnable]
+            safe_sequence_order.extend(released.tolist())
+            work_vector += allocation_array[released].sum(axis=0)
+            unfinished = unfinished[~runnable]
+    else:
+        raise ValueError(f"Unknown safety order '{order}'.")
+
+    return need_array.tolist(), safe_sequence_order
+
+
+register_safety_backend("numpy", numpy_backend)
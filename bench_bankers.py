@@ -0,0 +1,237 @@
+"""
+Benchmark harness for the Banker's Algorithm safety check.
+
+Sweeps the number of processes (n) and resource types (m) over several input
+shapes and measures every registered target (each backend and order of
+run_bankers_algorithm_logic). For each case it records the wall time (best of
+several repeats), the peak traced memory and the number of Python memory
+blocks still allocated after the call ("retained_blocks": what the result
+keeps alive, not how many allocations the call made). Results are written to JSON and can be
+compared against an earlier run to catch regressions.
+
+Usage:
+    python bench_bankers.py --output bench.json
+    python bench_bankers.py --quick --compare bench.json
+"""
+import argparse
+import datetime
+import gc
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+from banker_logic import available_backends, run_bankers_algorithm_logic
+from scenario_generator import generate_scenario
+
+DEFAULT_PROCESS_COUNTS = (10, 100, 1000, 10000)
+DEFAULT_RESOURCE_COUNTS = (3, 10, 100)
+QUICK_PROCESS_COUNTS = (10, 100, 1000)
+QUICK_RESOURCE_COUNTS = (3, 10)
+
+
+# --- Input shapes ---
+
+def shape_safe(num_processes, num_resources, rng):
+    return generate_scenario(num_processes, num_resources, verdict="safe", rng=rng)
+
+
+def shape_unsafe(num_processes, num_resources, rng):
+    """
+    State in which one process can never finish, whatever the others do.
+    """
+    return generate_scenario(num_processes, num_resources, verdict="unsafe", rng=rng)
+
+
+def shape_reverse(num_processes, num_resources, rng):
+    """
+    Worst case for index-ordered scans: Pi needs n - i of every resource, so the
+    only safe sequence is P(n-1), P(n-2), ..., P0.
+    """
+    allocation = [[1] * num_resources for _ in range(num_processes)]
+    max_need = [[1 + num_processes - i] * num_resources for i in range(num_processes)]
+    available = [1] * num_resources
+    return allocation, max_need, available
+
+
+def shape_sparse(num_processes, num_resources, rng):
+    """
+    Safe state where only about 5% of the allocation and need entries are non-zero.
+    """
+    return generate_scenario(num_processes, num_resources, verdict="safe", density=0.05, rng=rng)
+
+
+SHAPES = {
+    "safe": shape_safe,
+    "unsafe": shape_unsafe,
+    "reverse": shape_reverse,
+    "sparse": shape_sparse,
+}
+
+
+# --- Targets ---
+
+def _logic_target(backend, order):
+    def run(allocation, max_need, available):
+        return run_bankers_algorithm_logic(allocation, max_need, available, len(allocation), len(available),
+                                           order=order, backend=backend, trace="none")[3]
+    return run
+
+
+def default_targets():
+    """
+    Returns {name: callable(allocation, max_need, available) -> is_safe} for every
+    loadable backend and safety order.
+    """
+    targets = {}
+    for backend in available_backends():
+        for order in ("index", "rounds"):
+            targets[f"{backend}/{order}"] = _logic_target(backend, order)
+    return targets
+
+
+# --- Measurement ---
+
+def measure(target, scenario, repeat):
+    """
+    Measures one target on one scenario.
+
+    Returns:
+        dict: best and median wall time, peak traced bytes, retained blocks and the verdict.
+    """
+    allocation, max_need, available = scenario
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        is_safe = target(allocation, max_need, available)
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+
+    gc.collect()
+    blocks_before = sys.getallocatedblocks()
+    tracemalloc.start()
+    result = target(allocation, max_need, available)
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    retained_blocks = sys.getallocatedblocks() - blocks_before
+    del result
+    return {
+        "time_s": timings[0],
+        "median_time_s": timings[len(timings) // 2],
+        "peak_bytes": peak_bytes,
+        "retained_blocks": retained_blocks,
+        "safe": is_safe,
+    }
+
+
+def run_benchmarks(process_counts, resource_counts, shapes, targets, repeat=3, seed=0, log=None):
+    """
+    Runs every (shape, n, m, target) combination.
+
+    Args:
+        log (file | None): Progress lines are written here when given.
+
+    Returns:
+        list[dict]: One record per combination.
+    """
+    records = []
+    for shape_name in shapes:
+        for num_processes in process_counts:
+            for num_resources in resource_counts:
+                rng = random.Random(f"{seed}-{shape_name}-{num_processes}-{num_resources}")
+                scenario = SHAPES[shape_name](num_processes, num_resources, rng)
+                for target_name, target in targets.items():
+                    record = {"target": target_name, "shape": shape_name, "n": num_processes, "m": num_resources}
+                    record.update(measure(target, scenario, repeat))
+                    records.append(record)
+                    if log is not None:
+                        log.write(f"{target_name:>16} {shape_name:>8} n={num_processes:<6} m={num_resources:<4} "
+                                  f"{record['time_s'] * 1000:10.3f} ms {record['peak_bytes'] / 1024:10.1f} KiB\n")
+                        log.flush()
+    return records
+
+
+def _record_key(record):
+    return (record["target"], record["shape"], record["n"], record["m"])
+
+
+def compare_runs(baseline_records, current_records, threshold):
+    """
+    Compares two runs case by case.
+
+    Returns:
+        list[tuple]: (key, baseline_time, current_time, ratio) for cases slower than `threshold` x.
+    """
+    baseline = {_record_key(record): record for record in baseline_records}
+    regressions = []
+    for record in current_records:
+        previous = baseline.get(_record_key(record))
+        if previous is None or previous["time_s"] <= 0:
+            continue
+        ratio = record["time_s"] / previous["time_s"]
+        if ratio > threshold:
+            regressions.append((_record_key(record), previous["time_s"], record["time_s"], ratio))
+    return regressions
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Benchmark the Banker's Algorithm safety check.")
+    parser.add_argument("--processes", type=int, nargs="+", default=None, help="Process counts to sweep.")
+    parser.add_argument("--resources", type=int, nargs="+", default=None, help="Resource counts to sweep.")
+    parser.add_argument("--shapes", nargs="+", choices=sorted(SHAPES), default=list(SHAPES), help="Input shapes.")
+    parser.add_argument("--targets", nargs="+", default=None, help="Only run these targets (e.g. python/index).")
+    parser.add_argument("--quick", action="store_true", help="Smaller sweep for a fast smoke run.")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed repeats per case; the best is reported.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the generated inputs.")
+    parser.add_argument("--output", help="Write the results to this JSON file.")
+    parser.add_argument("--compare", help="Compare against an earlier JSON result file.")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="Report cases slower than this factor versus --compare (default: 1.25).")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    process_counts = args.processes or (QUICK_PROCESS_COUNTS if args.quick else DEFAULT_PROCESS_COUNTS)
+    resource_counts = args.resources or (QUICK_RESOURCE_COUNTS if args.quick else DEFAULT_RESOURCE_COUNTS)
+    targets = default_targets()
+    if args.targets:
+        unknown = [name for name in args.targets if name not in targets]
+        if unknown:
+            raise SystemExit(f"Unknown targets {unknown}. Available: {sorted(targets)}")
+        targets = {name: targets[name] for name in args.targets}
+
+    records = run_benchmarks(process_counts, resource_counts, args.shapes, targets,
+                             repeat=args.repeat, seed=args.seed, log=sys.stdout)
+    report = {
+        "meta": {
+            "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "repeat": args.repeat,
+        },
+        "results": records,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as output_file:
+            json.dump(report, output_file, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as baseline_file:
+            baseline_records = json.load(baseline_file)["results"]
+        regressions = compare_runs(baseline_records, records, args.threshold)
+        for (target_name, shape_name, num_processes, num_resources), before, after, ratio in regressions:
+            print(f"REGRESSION {target_name} {shape_name} n={num_processes} m={num_resources}: "
+                  f"{before * 1000:.3f} ms -> {after * 1000:.3f} ms ({ratio:.2f}x)")
+        if regressions:
+            return 1
+        print(f"No regressions above {args.threshold:.2f}x.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,181 @@
+"""
+Safety check split into independent components.
+
+Process i and resource j interact only if Allocation[i][j] or Need[i][j] is
+nonzero. The connected components of this process-resource bipartite graph
+never share a resource: finishing a process only changes Work in its own
+component's resources, and whether a process can run depends only on those.
+So the state is safe exactly when every component is safe on its own, and the
+components can be checked separately (and in parallel).
+
+The per-component safe sequences are merged by always taking the component
+whose next process has the smallest id. For order="index" this reproduces the
+monolithic check exactly: the lowest-numbered runnable process overall is the
+smallest of the components' lowest-numbered runnable processes. For
+order="rounds" the merge key is (round, pid), which reproduces the global batches.
+
+Processes with no nonzero entries at all can always run; they are not sent
+to a check.
+"""
+import heapq
+from itertools import compress
+from operator import or_
+
+from banker_logic import (SAFETY_ORDERS, TRACE_LEVELS, CompactTrace, compute_need_matrix, get_safety_backend,
+                          validate_bankers_input)
+
+
+def find_components(allocation, need_matrix):
+    """
+    Connected components of the process-resource graph (union-find).
+
+    Args:
+        allocation (list[list[int]]): Currently allocated resources per process.
+        need_matrix (list[list[int]]): Need (Max - Allocation) per process.
+
+    Returns:
+        list[tuple[list[int], list[int]]]: (process ids, resource indices) of
+        every component, both sorted, ordered by their smallest process id.
+        Processes without any nonzero entry form a component with no resources.
+    """
+    num_processes = len(allocation)
+    num_resources = len(allocation[0]) if allocation else 0
+    # Nodes 0..n-1 are processes, n..n+m-1 are resources.
+    parent = list(range(num_processes + num_resources))
+
+    def find(node):
+        while parent[node] != node:
+            parent[node] = parent[parent[node]] # Path halving
+            node = parent[node]
+        return node
+
+    resource_nodes = range(num_processes, num_processes + num_resources)
+    for i in range(num_processes):
+        root = find(i)
+        for node in compress(resource_nodes, map(or_, allocation[i], need_matrix[i])):
+            other = find(node)
+            if other != root:
+                # Keep the smaller node as the root so that process roots win.
+                if other < root:
+                    root, other = other, root
+                parent[other] = root
+
+    members = {}
+    for i in range(num_processes):
+        members.setdefault(find(i), ([], []))[0].append(i)
+    for j in range(num_resources):
+        root = find(num_processes + j)
+        if root in members:
+            members[root][1].append(j)
+    return sorted(members.values(), key=lambda component: component[0][0])
+
+
+def _round_keys(pids, allocation_rows, need_rows, available, sequence):
+    """
+    Merge keys (round, pid) for a component's sequence produced with order="rounds".
+
+    The sequence lists every round in full before the next one, and a process
+    of round r + 1 does not fit the Work vector at the start of round r.
+    """
+    keys = []
+    round_number = 0
+    round_work = list(available)
+    next_work = list(available)
+    for k in sequence:
+        if any(need > work for need, work in zip(need_rows[k], round_work)):
+            round_number += 1
+            round_work = list(next_work)
+        for j, value in enumerate(allocation_rows[k]):
+            next_work[j] += value
+        keys.append((round_number, pids[k]))
+    return keys
+
+
+def _merge_sequences(keyed_sequences):
+    """
+    Smallest-head merge of per-component [(key, pid)] lists into one sequence.
+    """
+    heap = [(sequence[0][0], index, 0) for index, sequence in enumerate(keyed_sequences) if sequence]
+    heapq.heapify(heap)
+    merged = []
+    while heap:
+        _, index, position = heapq.heappop(heap)
+        sequence = keyed_sequences[index]
+        merged.append(sequence[position][1])
+        if position + 1 < len(sequence):
+            heapq.heappush(heap, (sequence[position + 1][0], index, position + 1))
+    return merged
+
+
+def run_decomposed_safety_check(allocation, max_need, initial_available, order="index", backend="python",
+                                trace="none", workers=1):
+    """
+    Runs the safety check one independent component at a time.
+
+    Args:
+        allocation (list[list[int]]): Currently allocated resources per process.
+        max_need (list[list[int]]): Maximum resources each process may claim.
+        initial_available (list[int]): Currently available instances of each resource.
+        order (str): Safety order ("index" or "rounds"); the merged sequence is
+            the one the monolithic check produces with the same order.
+        backend (str): Safety check backend used for every component.
+        trace (str): "none" (default), "compact" or "full", as in
+            run_bankers_algorithm_logic().
+        workers (int): Worker processes for the components (1 = in this process).
+            Components are shipped to the pool through banker_batch.check_many().
+
+    Returns:
+        tuple: (need_matrix, simulation_steps, safe_sequence, is_safe_state),
+        the same result as run_bankers_algorithm_logic().
+
+    Raises:
+        ValueError: If the input or the options are invalid.
+    """
+    if order not in SAFETY_ORDERS:
+        raise ValueError(f"Unknown safety order '{order}'. Expected one of {SAFETY_ORDERS}.")
+    if trace not in TRACE_LEVELS:
+        raise ValueError(f"Unknown trace level '{trace}'. Expected one of {TRACE_LEVELS}.")
+    safety_backend = get_safety_backend(backend)
+    num_processes, num_resources = validate_bankers_input(allocation, max_need, initial_available)
+    need_matrix = compute_need_matrix(allocation, max_need, num_processes, num_resources)
+
+    keyed_sequences = []
+    subproblems = [] # (pids, allocation rows, max rows, need rows, available) of components with resources
+    for pids, resources in find_components(allocation, need_matrix):
+        if not resources:
+            keyed_sequences.extend([((0, pid) if order == "rounds" else pid, pid)] for pid in pids)
+            continue
+        subproblems.append((pids,
+                            [[allocation[i][j] for j in resources] for i in pids],
+                            [[max_need[i][j] for j in resources] for i in pids],
+                            [[need_matrix[i][j] for j in resources] for i in pids],
+                            [initial_available[j] for j in resources]))
+
+    if workers <= 1 or len(subproblems) <= 1:
+        local_sequences = [safety_backend(allocation_rows, max_rows, available, len(pids), len(available), order)[1]
+                           for pids, allocation_rows, max_rows, _, available in subproblems]
+    else:
+        # Imported here so that single-process callers do not pay for the pool machinery.
+        from banker_batch import check_many
+        scenarios = ((allocation_rows, max_rows, available)
+                     for _, allocation_rows, max_rows, _, available in subproblems)
+        chunksize = max(1, len(subproblems) // (workers * 4))
+        local_sequences = [result.safe_sequence for result in check_many(scenarios, workers=workers,
+                                                                         chunksize=chunksize, order=order,
+                                                                         backend=backend)]
+
+    for (pids, allocation_rows, _, need_rows, available), sequence in zip(subproblems, local_sequences):
+        if order == "rounds":
+            keys = _round_keys(pids, allocation_rows, need_rows, available, sequence)
+        else:
+            keys = [pids[k] for k in sequence]
+        keyed_sequences.append([(key, pids[k]) for key, k in zip(keys, sequence)])
+
+    safe_sequence = _merge_sequences(keyed_sequences)
+    if trace == "none":
+        simulation_steps = None
+    else:
+        simulation_steps = CompactTrace(allocation, initial_available, safe_sequence, num_resources)
+        if trace == "full":
+            simulation_steps = list(simulation_steps)
+    return need_matrix, simulation_steps, safe_sequence, len(safe_sequence) == num_processes
@@ -0,0 +1,412 @@
+"""
+Deadlock detection against the outstanding Request matrix.
+
+Avoidance (banker_logic) asks whether every process could still finish if it
+claimed its Max. Detection asks which processes are deadlocked *now*, given
+what each one is actually waiting for (its outstanding Request):
+
+    Work = Available; a process with no allocation is never deadlocked.
+    Repeatedly pick an unfinished process with Request <= Work and add its
+    Allocation to Work. Whatever cannot be picked is deadlocked.
+
+When every resource type has a single instance the same answer comes from the
+wait-for graph (Pi -> Pj when Pi requests a resource Pj holds) in O(V + E):
+a process is deadlocked if it can reach a cycle or a request that can never be
+met. Otherwise the reduction above runs on the worklist engine of banker_logic.
+
+DeadlockDetector keeps the result of the last reduction and, for changes that
+can only unblock processes (releases, cancelled requests, removed processes),
+resumes it from the previous Work instead of starting over.
+"""
+from banker_logic import iter_safe_sequence
+
+
+def _validate(allocation, request, available):
+    num_processes, num_resources = len(allocation), len(available)
+    if len(request) != num_processes:
+        raise ValueError(f"Allocation has {num_processes} rows but Request has {len(request)}.")
+    for name, matrix in (("Allocation", allocation), ("Request", request)):
+        for i, row in enumerate(matrix):
+            if len(row) != num_resources:
+                raise ValueError(f"{name} of P{i} must have {num_resources} entries, got {len(row)}.")
+            if any(value < 0 for value in row):
+                raise ValueError(f"{name} of P{i} must contain non-negative integers.")
+    if any(value < 0 for value in available):
+        raise ValueError("Available must contain non-negative integers.")
+    return num_processes, num_resources
+
+
+def _total_resources(allocation, available):
+    totals = list(available)
+    for row in allocation:
+        for j, value in enumerate(row):
+            totals[j] += value
+    return totals
+
+
+def _reduce(allocation, request, work_vector, candidates):
+    """
+    Runs the detection reduction over the process ids in `candidates`.
+
+    Returns:
+        tuple: (finished pids in reduction order, Work after they released)
+    """
+    candidates = list(candidates)
+    num_resources = len(work_vector)
+    local_allocation = [allocation[pid] for pid in candidates]
+    order = [candidates[k] for k in iter_safe_sequence(local_allocation, [request[pid] for pid in candidates],
+                                                       work_vector, len(candidates), num_resources)]
+    work_vector = list(work_vector)
+    for pid in order:
+        for j, value in enumerate(allocation[pid]):
+            work_vector[j] += value
+    return order, work_vector
+
+
+def _wait_for_graph(allocation, request, available, totals):
+    """
+    Builds the wait-for graph of a single-instance state.
+
+    Returns:
+        tuple: (successors per process, set of processes whose request can never be met)
+    """
+    holders = {}
+    for pid, row in enumerate(allocation):
+        for j, value in enumerate(row):
+            if value:
+                holders[j] = pid
+    successors = [[] for _ in allocation]
+    stuck = set()
+    for pid, row in enumerate(request):
+        for j, amount in enumerate(row):
+            if not amount:
+                continue
+            if amount + allocation[pid][j] > totals[j]:
+                stuck.add(pid) # Asks for more than exists: can never be satisfied
+            elif not available[j]:
+                successors[pid].append(holders[j])
+    return successors, stuck
+
+
+def _cyclic_nodes(successors):
+    """
+    Returns the nodes that lie on a cycle (Tarjan's SCC algorithm, iterative).
+    """
+    num_nodes = len(successors)
+    index_of = [None] * num_nodes
+    lowlink = [0] * num_nodes
+    on_stack = [False] * num_nodes
+    component_stack = []
+    cyclic = set()
+    next_index = 0
+    for root in range(num_nodes):
+        if index_of[root] is not None:
+            continue
+        call_stack = [(root, 0)]
+        while call_stack:
+            node, edge = call_stack.pop()
+            if edge == 0:
+                index_of[node] = lowlink[node] = next_index
+                next_index += 1
+                component_stack.append(node)
+                on_stack[node] = True
+            else:
+                # Returning from successors[node][edge - 1].
+                lowlink[node] = min(lowlink[node], lowlink[successors[node][edge - 1]])
+            while edge < len(successors[node]):
+                target = successors[node][edge]
+                edge += 1
+                if index_of[target] is None:
+                    call_stack.append((node, edge))
+                    call_stack.append((target, 0))
+                    break
+                if on_stack[target]:
+                    lowlink[node] = min(lowlink[node], index_of[target])
+            else:
+                if lowlink[node] == index_of[node]:
+                    component = []
+                    while True:
+                        member = component_stack.pop()
+                        on_stack[member] = False
+                        component.append(member)
+                        if member == node:
+                            break
+                    if len(component) > 1 or node in successors[node]:
+                        cyclic.update(component)
+    return cyclic
+
+
+def _detect_single_instance(allocation, request, available, totals):
+    successors, stuck = _wait_for_graph(allocation, request, available, totals)
+    # Everything that (transitively) waits on a cycle or on a stuck process is deadlocked.
+    predecessors = [[] for _ in successors]
+    for pid, targets in enumerate(successors):
+        for target in targets:
+            predecessors[target].append(pid)
+    deadlocked = _cyclic_nodes(successors) | stuck
+    frontier = list(deadlocked)
+    while frontier:
+        for waiter in predecessors[frontier.pop()]:
+            if waiter not in deadlocked:
+                deadlocked.add(waiter)
+                frontier.append(waiter)
+    return deadlocked
+
+
+def detect_deadlock(allocation, request, available):
+    """
+    Finds the deadlocked processes of a state.
+
+    Args:
+        allocation (list[list[int]]): Resources currently held by each process.
+        request (list[list[int]]): Outstanding request of each process.
+        available (list[int]): Currently available resources.
+
+    Returns:
+        list[int]: Sorted ids of the deadlocked processes (empty if none).
+
+    Raises:
+        ValueError: If the matrices are ragged or contain negative values.
+    """
+    num_processes, _ = _validate(allocation, request, available)
+    totals = _total_resources(allocation, available)
+    if all(total <= 1 for total in totals):
+        deadlocked = _detect_single_instance(allocation, request, available, totals)
+    else:
+        finished, _ = _reduce(allocation, request, available, range(num_processes))
+        deadlocked = set(range(num_processes)).difference(finished)
+    # A process holding nothing cannot be part of a deadlock.
+    return sorted(pid for pid in deadlocked if any(allocation[pid]))
+
+
+class DeadlockDetector:
+    """
+    Detection state that follows a changing system.
+
+    The detector remembers the processes the last reduction finished and the
+    Work vector they left behind. Changes that can only unblock processes
+    (release, cancel_request, remove_process) keep those processes finished, so
+    the next query resumes the reduction over the remaining processes only.
+    Changes that can block a finished process (a new request or a grant to it)
+    schedule a full reduction for the next query.
+
+    Processes are identified by integer ids that are never reused.
+    """
+
+    def __init__(self, allocation, request, available):
+        """
+        Args:
+            allocation (list[list[int]]): Resources held by each process (P0, P1, ...).
+            request (list[list[int]]): Outstanding request of each process.
+            available (list[int]): Currently available resources.
+        """
+        _validate(allocation, request, available)
+        self.num_resources = len(available)
+        self._available = list(available)
+        self._allocation = {pid: list(row) for pid, row in enumerate(allocation)}
+        self._request = {pid: list(row) for pid, row in enumerate(request)}
+        self._next_pid = len(allocation)
+
+        # Counters describing how answers were reached.
+        self.full_reductions = 0
+        self.resumed_reductions = 0
+
+        self._finished = None     # Processes the last reduction finished (set), or None if a full run is due
+        self._final_work = None   # Work after all of them released
+        self._pending_work = None # Resources freed since, to add when resuming
+        self._resume_due = False  # True when an unfinished process may have become unblocked
+
+    # --- Internal helpers ---
+
+    def _checked_vector(self, vector, description):
+        vector = list(vector)
+        if len(vector) != self.num_resources:
+            raise ValueError(f"{description} must have {self.num_resources} entries, got {len(vector)}.")
+        for value in vector:
+            if not isinstance(value, int) or value < 0:
+                raise ValueError(f"{description} must contain non-negative integers.")
+        return vector
+
+    def _known_pid(self, pid):
+        if pid not in self._allocation:
+            raise KeyError(f"Unknown process P{pid}.")
+
+    def _invalidate(self):
+        self._finished = self._final_work = self._pending_work = None
+
+    def _free_resources(self, vector, holder_finished):
+        # Resources held by a finished process were already part of the final
+        # Work; resources of an unfinished one are new to the resumed reduction.
+        if self._finished is not None and not holder_finished and any(vector):
+            for j, value in enumerate(vector):
+                self._pending_work[j] += value
+            self._resume_due = True
+
+    def _update(self):
+        if self._finished is None:
+            self.full_reductions += 1
+            finished, work_vector = _reduce(self._allocation, self._request, self._available, list(self._allocation))
+            self._finished = set(finished)
+        elif self._resume_due:
+            self.resumed_reductions += 1
+            work_vector = [work + pending for work, pending in zip(self._final_work, self._pending_work)]
+            blocked = [pid for pid in self._allocation if pid not in self._finished]
+            finished, work_vector = _reduce(self._allocation, self._request, work_vector, blocked)
+            self._finished.update(finished)
+        else:
+            return
+        self._final_work = work_vector
+        self._pending_work = [0] * self.num_resources
+        self._resume_due = False
+
+    # --- Public API ---
+
+    @property
+    def processes(self):
+        """List of active process ids."""
+        return list(self._allocation)
+
+    @property
+    def available(self):
+        """Copy of the currently available resources."""
+        return list(self._available)
+
+    def allocation(self, pid):
+        """Copy of the resources currently held by process `pid`."""
+        self._known_pid(pid)
+        return list(self._allocation[pid])
+
+    def outstanding_request(self, pid):
+        """Copy of the outstanding request of process `pid`."""
+        self._known_pid(pid)
+        return list(self._request[pid])
+
+    def deadlocked(self):
+        """
+        Returns the sorted ids of the currently deadlocked processes.
+        """
+        self._update()
+        return sorted(pid for pid, row in self._allocation.items() if pid not in self._finished and any(row))
+
+    @property
+    def is_deadlocked(self):
+        """Whether any process is currently deadlocked."""
+        return bool(self.deadlocked())
+
+    def add_request(self, pid, vector):
+        """
+        Adds `vector` to the outstanding request of process `pid`.
+        """
+        self._known_pid(pid)
+        vector = self._checked_vector(vector, f"Request of P{pid}")
+        row = self._request[pid]
+        for j, value in enumerate(vector):
+            row[j] += value
+        # A larger request cannot unblock anything; it only matters if pid had finished.
+        if self._finished is not None and pid in self._finished and any(vector):
+            self._invalidate()
+
+    def cancel_request(self, pid, vector=None):
+        """
+        Withdraws `vector` (default: everything) from the outstanding request of process `pid`.
+
+        Raises:
+            ValueError: If more is withdrawn than was requested.
+        """
+        self._known_pid(pid)
+        row = self._request[pid]
+        vector = list(row) if vector is None else self._checked_vector(vector, f"Cancellation of P{pid}")
+        for j, value in enumerate(vector):
+            if value > row[j]:
+                raise ValueError(f"P{pid} only requested {row[j]} of R{j}.")
+        for j, value in enumerate(vector):
+            row[j] -= value
+        # A smaller request can only unblock pid, which the resumed reduction retries.
+        if self._finished is not None and pid not in self._finished and any(vector):
+            self._resume_due = True
+
+    def grant(self, pid, vector):
+        """
+        Allocates `vector` from Available to process `pid`, satisfying that much
+        of its outstanding request.
+
+        Raises:
+            ValueError: If the grant exceeds the available resources.
+        """
+        self._known_pid(pid)
+        vector = self._checked_vector(vector, f"Grant to P{pid}")
+        for j, value in enumerate(vector):
+            if value > self._available[j]:
+                raise ValueError(f"Only {self._available[j]} instance(s) of R{j} are available.")
+        allocation_row, request_row = self._allocation[pid], self._request[pid]
+        for j, value in enumerate(vector):
+            self._available[j] -= value
+            allocation_row[j] += value
+            request_row[j] = max(0, request_row[j] - value)
+        if any(vector):
+            self._invalidate()
+
+    def release(self, pid, vector=None):
+        """
+        Returns `vector` (default: everything) held by process `pid` to Available.
+
+        Raises:
+            ValueError: If the process holds less than `vector`.
+        """
+        self._known_pid(pid)
+        allocation_row = self._allocation[pid]
+        vector = list(allocation_row) if vector is None else self._checked_vector(vector, f"Release of P{pid}")
+        for j, value in enumerate(vector):
+            if value > allocation_row[j]:
+                raise ValueError(f"P{pid} holds only {allocation_row[j]} of R{j}.")
+        for j, value in enumerate(vector):
+            allocation_row[j] -= value
+            self._available[j] += value
+        self._free_resources(vector, self._finished is not None and pid in self._finished)
+
+    def add_process(self, allocation=None, request=None, pid=None):
+        """
+        Adds a process holding `allocation` (taken from Available) and waiting for `request`.
+
+        Returns:
+            int: The id of the new process.
+
+        Raises:
+            ValueError: If the allocation exceeds Available or the pid is in use.
+        """
+        allocation = [0] * self.num_resources if allocation is None else self._checked_vector(allocation, "Allocation")
+        request = [0] * self.num_resources if request is None else self._checked_vector(request, "Request")
+        if pid is None:
+            pid = self._next_pid
+        elif pid in self._allocation:
+            raise ValueError(f"Process P{pid} already exists.")
+        for j, value in enumerate(allocation):
+            if value > self._available[j]:
+                raise ValueError(f"Only {self._available[j]} instance(s) of R{j} are available.")
+        for j, value in enumerate(allocation):
+            self._available[j] -= value
+        self._allocation[pid] = allocation
+        self._request[pid] = request
+        self._next_pid = max(self._next_pid, pid + 1)
+        if any(allocation):
+            self._invalidate()
+        # A process holding nothing cannot block anyone; the next query retries it.
+        return pid
+
+    def remove_process(self, pid):
+        """
+        Removes process `pid` (e.g. after it was aborted) and returns its resources to Available.
+
+        Returns:
+            list[int]: The allocation the process held.
+        """
+        self._known_pid(pid)
+        allocation_row = self._allocation.pop(pid)
+        del self._request[pid]
+        for j, value in enumerate(allocation_row):
+            self._available[j] += value
+        was_finished = self._finished is not None and pid in self._finished
+        if self._finished is not None:
+            self._finished.discard(pid)
+        self._free_resources(allocation_row, was_finished)
+        return allocation_row
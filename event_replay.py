@@ -0,0 +1,402 @@
+"""
+Offline replay of recorded resource request / release streams.
+
+An event log is JSONL, one event per line:
+
+    {"op": "init", "allocation": [[...]], "max": [[...]], "available": [...]}
+    {"op": "request", "pid": 3, "vector": [1, 0, 2]}
+    {"op": "release", "pid": 3, "vector": [1, 0, 0]}
+    {"op": "spawn", "max": [4, 2, 2], "allocation": [0, 1, 0]}   # optional "allocation" and "pid"
+    {"op": "exit", "pid": 3}
+
+The log must start with an "init" event (the same keys as a scenario file)
+unless a BankerState is passed in. Every event is applied to a BankerState and
+gets one of three outcomes:
+
+* grant: the event took effect (a request or spawn was admitted, a release or
+  exit was applied);
+* defer: a request or spawn could not be admitted safely right now and waits
+  in the pending queue, which is retried in FIFO order whenever resources are
+  returned (release or exit);
+* deny: the event is invalid (unknown process, claim exceeded, malformed line,
+  or the pending queue is full).
+
+The log is read line by line through generators, so its size is not limited
+by memory. Per-event latency goes into a log-bucket histogram of fixed size.
+
+Usage:
+    python event_replay.py events.jsonl
+    python event_replay.py events.jsonl.gz --add-available 2,0,1 --decisions > decisions.jsonl
+"""
+import argparse
+import gzip
+import json
+import math
+import sys
+import time
+from collections import namedtuple
+
+from banker_logic import BankerState
+from scenario_io import normalize_scenario
+
+EVENT_OPS = ("init", "request", "release", "spawn", "exit")
+OUTCOMES = ("grant", "defer", "deny")
+DEFAULT_MAX_PENDING = 1024
+
+# One decision per event, plus one for every deferred event that is granted on
+# a later retry (retry=True, with the index of the original event).
+ReplayDecision = namedtuple("ReplayDecision", ["index", "op", "pid", "outcome", "latency_ns", "retry", "error"])
+
+
+class LatencyHistogram:
+    """
+    Log-bucket latency histogram with bounded memory.
+
+    Every power of two is split into 2 ** SUB_BITS buckets, so a percentile
+    is reported as its bucket's upper bound, at most 1 / 2 ** SUB_BITS
+    (about 6%) above the true value.
+    """
+    SUB_BITS = 4
+
+    def __init__(self):
+        self._counts = {} # bucket index -> count
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+
+    def record(self, value_ns):
+        shift = max(0, value_ns.bit_length() - self.SUB_BITS - 1)
+        bucket = (shift << self.SUB_BITS) + (value_ns >> shift)
+        self._counts[bucket] = self._counts.get(bucket, 0) + 1
+        self.count += 1
+        self.total_ns += value_ns
+        if value_ns > self.max_ns:
+            self.max_ns = value_ns
+
+    def _upper_bound(self, bucket):
+        shift = max(0, (bucket >> self.SUB_BITS) - 1)
+        return ((bucket - (shift << self.SUB_BITS) + 1) << shift) - 1
+
+    def percentile(self, fraction):
+        """
+        Returns the latency (ns) below which `fraction` (0..1) of the samples fall, 0 when empty.
+        """
+        if not self.count:
+            return 0
+        rank = max(1, math.ceil(fraction * self.count))
+        seen = 0
+        for bucket in sorted(self._counts):
+            seen += self._counts[bucket]
+            if seen >= rank:
+                return min(self._upper_bound(bucket), self.max_ns)
+        return self.max_ns
+
+    def merge(self, other):
+        """
+        Adds the samples of another histogram to this one.
+        """
+        for bucket, count in other._counts.items():
+            self._counts[bucket] = self._counts.get(bucket, 0) + count
+        self.count += other.count
+        self.total_ns += other.total_ns
+        self.max_ns = max(self.max_ns, other.max_ns)
+
+    def as_dict(self):
+        return {
+            "count": self.count,
+            "mean_us": round(self.total_ns / self.count / 1000, 3) if self.count else 0.0,
+            "p50_us": round(self.percentile(0.5) / 1000, 3),
+            "p90_us": round(self.percentile(0.9) / 1000, 3),
+            "p99_us": round(self.percentile(0.99) / 1000, 3),
+            "p999_us": round(self.percentile(0.999) / 1000, 3),
+            "max_us": round(self.max_ns / 1000, 3),
+        }
+
+
+class ReplayStats:
+    """
+    Counters filled in while a log is replayed.
+    """
+
+    def __init__(self):
+        self.events = 0
+        self.malformed = 0     # Unparsable lines and unknown ops (also denied)
+        self.outcomes = {op: dict.fromkeys(OUTCOMES, 0) for op in EVENT_OPS}
+        self.retry_grants = 0  # Deferred events granted on a later retry
+        self.dropped = 0       # Deferred requests discarded because their process exited
+        self.pending = 0       # Deferred events still waiting at the end
+        self.full_checks = 0
+        self.fast_path_grants = 0
+        self.latency = LatencyHistogram()
+        self.elapsed_seconds = 0.0
+
+    @property
+    def events_per_second(self):
+        return self.events / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+    def as_dict(self):
+        return {
+            "events": self.events,
+            "malformed": self.malformed,
+            "outcomes": self.outcomes,
+            "retry_grants": self.retry_grants,
+            "dropped": self.dropped,
+            "pending": self.pending,
+            "full_checks": self.full_checks,
+            "fast_path_grants": self.fast_path_grants,
+            "latency": self.latency.as_dict(),
+            "elapsed_seconds": round(self.elapsed_seconds, 6),
+            "events_per_second": round(self.events_per_second, 1),
+        }
+
+
+def iter_events(lines):
+    """
+    Parses JSONL event lines lazily.
+
+    Yields:
+        dict | ValueError: One event per non-blank line, or the error for a
+        line that is not a JSON object (so one bad line does not stop the replay).
+    """
+    for line_number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            event = json.loads(line)
+        except ValueError as error:
+            yield ValueError(f"line {line_number}: {error}")
+            continue
+        if not isinstance(event, dict):
+            yield ValueError(f"line {line_number}: event must be a JSON object.")
+            continue
+        yield event
+
+
+def open_event_log(path):
+    """
+    Opens an event log for streaming; "-" is stdin and ".gz" files are decompressed on the fly.
+    """
+    if path == "-":
+        return sys.stdin
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, encoding="utf-8")
+
+
+def _field(event, name):
+    try:
+        return event[name]
+    except KeyError:
+        raise ValueError(f"{event['op']!r} event is missing {name!r}.") from None
+
+
+def _state_from_init(event, extra_available):
+    scenario = normalize_scenario(event, default_id=None)
+    available = list(scenario["available"])
+    if extra_available is not None:
+        if len(extra_available) != len(available):
+            raise ValueError(f"Extra capacity must have {len(available)} entries.")
+        available = [value + extra for value, extra in zip(available, extra_available)]
+    return BankerState(scenario["allocation"], scenario["max_need"], available)
+
+
+class _Replayer:
+    """
+    Applies events to a BankerState and keeps the pending (deferred) queue.
+    """
+
+    def __init__(self, state, stats, max_pending, extra_available):
+        self.state = state
+        self.stats = stats
+        self.max_pending = max_pending
+        self.extra_available = extra_available
+        self.pending = [] # (index, op, pid, event, blocked) in arrival order
+
+    def attempt(self, op, pid, event):
+        """
+        Tries to admit a request or spawn. Returns (admitted, pid).
+        """
+        if op == "request":
+            return self.state.request(pid, _field(event, "vector")), pid
+        new_pid = self.state.add_process(_field(event, "max"), event.get("allocation"), pid=pid)
+        return new_pid is not None, new_pid
+
+    def apply(self, index, event):
+        """
+        Applies one event.
+
+        Returns:
+            tuple: (op, pid, outcome, error message or None)
+        """
+        if isinstance(event, Exception):
+            return None, None, "deny", str(event)
+        op, pid = event.get("op"), event.get("pid")
+        try:
+            if op not in EVENT_OPS:
+                raise ValueError(f"Unknown event op {op!r}. Expected one of {', '.join(EVENT_OPS)}.")
+            if op == "init":
+                if self.state is not None:
+                    raise ValueError("The state is already initialized.")
+                self.state = _state_from_init(event, self.extra_available)
+                return op, pid, "grant", None
+            if self.state is None:
+                raise ValueError("The log must start with an 'init' event.")
+            if op in ("request", "spawn"):
+                admitted, pid = self.attempt(op, pid, event)
+                if admitted:
+                    return op, pid, "grant", None
+                if len(self.pending) >= self.max_pending:
+                    raise ValueError("The pending queue is full.")
+                blocked = self.state.last_blocked if op == "request" else None
+                self.pending.append((index, op, pid, event, blocked))
+                return op, pid, "defer", None
+            if op == "release":
+                self.state.release(pid, _field(event, "vector"))
+            else:
+                self.state.remove_process(pid)
+                remaining = [entry for entry in self.pending if entry[1] != "request" or entry[2] != pid]
+                self.stats.dropped += len(self.pending) - len(remaining)
+                self.pending = remaining
+            return op, pid, "grant", None
+        except (ValueError, KeyError, TypeError) as error:
+            message = error.args[0] if isinstance(error, KeyError) and error.args else str(error)
+            return op, pid, "deny", str(message)
+
+    def retry(self):
+        """
+        Retries every deferred event once, in arrival order. Deferred requests
+        that the releases cannot have helped (more than Available, or still
+        refused per BankerState.still_refused()) are skipped without a full check.
+
+        Yields:
+            ReplayDecision: One per deferred event that is granted now.
+        """
+        state = self.state
+        available = state.available
+        still_pending = []
+        for entry in self.pending:
+            index, op, pid, event, blocked = entry
+            if op == "request":
+                vector = _field(event, "vector")
+                if any(amount > free for amount, free in zip(vector, available)):
+                    still_pending.append(entry)
+                    continue
+                if blocked is not None and state.still_refused(blocked, pid, vector):
+                    still_pending.append(entry)
+                    continue
+            started = time.perf_counter_ns()
+            try:
+                admitted, pid = self.attempt(op, pid, event)
+            except (ValueError, KeyError, TypeError):
+                admitted = False # Became invalid (e.g. a Max claim the state no longer accepts)
+            latency_ns = time.perf_counter_ns() - started
+            if admitted:
+                self.stats.retry_grants += 1
+                self.stats.latency.record(latency_ns)
+                available = state.available
+                yield ReplayDecision(index, op, pid, "grant", latency_ns, True, None)
+            else:
+                if op == "request":
+                    blocked = state.last_blocked
+                still_pending.append((index, op, pid, event, blocked))
+        self.pending = still_pending
+
+
+def iter_replay(events, state=None, stats=None, max_pending=DEFAULT_MAX_PENDING, extra_available=None):
+    """
+    Replays events one at a time.
+
+    Args:
+        events (Iterable[dict | Exception]): Parsed events (see iter_events()).
+        state (BankerState | None): State to replay against; None expects an
+            "init" event first.
+        stats (ReplayStats | None): Filled in while iterating.
+        max_pending (int): Deferred events kept for retry; beyond that further
+            deferrals are denied.
+        extra_available (list[int] | None): Capacity added to Available of the
+            "init" event, to try out a capacity change.
+
+    Yields:
+        ReplayDecision: One per event, plus one per successful retry.
+    """
+    if stats is None:
+        stats = ReplayStats()
+    replayer = _Replayer(state, stats, max_pending, extra_available)
+    started = time.perf_counter()
+    try:
+        for index, event in enumerate(events):
+            event_started = time.perf_counter_ns()
+            op, pid, outcome, error = replayer.apply(index, event)
+            latency_ns = time.perf_counter_ns() - event_started
+            stats.events += 1
+            stats.latency.record(latency_ns)
+            if op in stats.outcomes:
+                stats.outcomes[op][outcome] += 1
+            else:
+                stats.malformed += 1
+            yield ReplayDecision(index, op, pid, outcome, latency_ns, False, error)
+            if outcome == "grant" and op in ("release", "exit") and replayer.pending:
+                yield from replayer.retry()
+    finally:
+        stats.elapsed_seconds = time.perf_counter() - started
+        stats.pending = len(replayer.pending)
+        if replayer.state is not None:
+            stats.full_checks = replayer.state.full_checks
+            stats.fast_path_grants = replayer.state.fast_path_grants
+
+
+def replay(events, state=None, max_pending=DEFAULT_MAX_PENDING, extra_available=None):
+    """
+    Replays a whole event stream and returns only the statistics.
+
+    Returns:
+        ReplayStats: Outcome counts, latency percentiles and throughput.
+    """
+    stats = ReplayStats()
+    for _ in iter_replay(events, state, stats, max_pending, extra_available):
+        pass
+    return stats
+
+
+def _parse_vector(text):
+    return [int(value) for value in text.split(",")]
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Replay a JSONL request/release event log against the Banker's Algorithm.")
+    parser.add_argument("log", help="Event log (JSONL, optionally .gz). Use '-' for stdin.")
+    parser.add_argument("--add-available", type=_parse_vector, default=None, metavar="N,N,...",
+                        help="Extra capacity added to the initial Available vector.")
+    parser.add_argument("--max-pending", type=int, default=DEFAULT_MAX_PENDING,
+                        help=f"Deferred events kept for retry (default: {DEFAULT_MAX_PENDING}).")
+    parser.add_argument("--decisions", action="store_true",
+                        help="Write one JSON line per decision to stdout; the summary goes to stderr.")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    stats = ReplayStats()
+    log_file = open_event_log(args.log)
+    try:
+        decisions = iter_replay(iter_events(log_file), stats=stats, max_pending=args.max_pending,
+                                extra_available=args.add_available)
+        if args.decisions:
+            output = sys.stdout
+            for decision in decisions:
+                output.write(json.dumps(decision._asdict(), separators=(",", ":")) + "\n")
+            summary_output = sys.stderr
+        else:
+            for _ in decisions:
+                pass
+            summary_output = sys.stdout
+    finally:
+        if log_file is not sys.stdin:
+            log_file.close()
+    summary_output.write(json.dumps(stats.as_dict(), indent=2) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+"""
+Headroom queries: how much more of each resource a process can be granted
+right now while the state stays safe.
+
+Granting x of resource j to process p keeps a safe state safe exactly when
+x <= Available[j], x <= Need[p][j] and, with Available[j] lowered by x, the
+other processes can still finish enough of themselves to cover p's original
+Need. (Once p can run with its original Need it can also run after the grant,
+and everything it releases afterwards is the same as before.)
+
+For one resource j this threshold is found for every process in a single
+bottleneck sweep, instead of a binary search of full safety checks per pair.
+The sweep always finishes next the runnable process with the smallest Need in
+j, which is the one leaving the most slack (Work[j] - Need[j]). The smallest
+slack seen so far is the largest x for which the processes finished up to that
+point still run. When a process's full Need first fits the Work of the
+finished processes, that value is its threshold. The whole n x m matrix
+therefore costs m sweeps, each about as expensive as one safety check.
+"""
+import heapq
+
+from banker_logic import compute_need_matrix, iter_safe_sequence, validate_bankers_input
+
+
+def _sorted_need_columns(need_matrix, num_processes, num_resources):
+    # For every resource, (need, pid) pairs in ascending need order.
+    return [sorted((need_matrix[pid][j], pid) for pid in range(num_processes)) for j in range(num_resources)]
+
+
+def _grant_thresholds(allocation, need_matrix, available, columns, resource, targets):
+    """
+    Bottleneck sweep for one resource.
+
+    Returns:
+        dict: {pid: largest x such that, with Available[resource] lowered by x,
+        the other processes can finish enough to cover pid's Need} for every
+        pid in `targets` (float("inf") if pid's Need fits Available already).
+    """
+    num_processes, num_resources = len(allocation), len(available)
+    work_vector = list(available)
+    level = float("inf") # Smallest slack in `resource` among the processes finished so far
+    thresholds = {}
+    waiting = set(targets)
+    # Resources whose Need still exceeds Work: over all resources (to decide when a
+    # process's Need is covered) and over the other resources (to decide when it can run).
+    blocked_all = [num_resources] * num_processes
+    blocked_other = [num_resources - 1] * num_processes
+    runnable = [] # Heap of (need in `resource`, pid) for processes whose other needs are met
+    if num_resources == 1:
+        runnable = [(need_matrix[pid][resource], pid) for pid in range(num_processes)]
+        heapq.heapify(runnable)
+    positions = [0] * num_resources
+
+    def advance():
+        for j in range(num_resources):
+            column, position, work = columns[j], positions[j], work_vector[j]
+            while position < num_processes and column[position][0] <= work:
+                pid = column[position][1]
+                position += 1
+                blocked_all[pid] -= 1
+                if blocked_all[pid] == 0 and pid in waiting:
+                    thresholds[pid] = level
+                    waiting.discard(pid)
+                if j != resource:
+                    blocked_other[pid] -= 1
+                    if blocked_other[pid] == 0:
+                        heapq.heappush(runnable, (need_matrix[pid][resource], pid))
+            positions[j] = position
+
+    advance()
+    while waiting and runnable:
+        need_value, pid = heapq.heappop(runnable)
+        level = min(level, work_vector[resource] - need_value)
+        for j, value in enumerate(allocation[pid]):
+            work_vector[j] += value
+        advance()
+    return thresholds
+
+
+def _headroom_rows(allocation, max_need, available, pids):
+    num_processes, num_resources = validate_bankers_input(allocation, max_need, available)
+    need_matrix = compute_need_matrix(allocation, max_need, num_processes, num_resources)
+    finished = sum(1 for _ in iter_safe_sequence(allocation, need_matrix, available, num_processes, num_resources))
+    if finished != num_processes:
+        return {pid: [0] * num_resources for pid in pids}
+    columns = _sorted_need_columns(need_matrix, num_processes, num_resources)
+    rows = {pid: [] for pid in pids}
+    for j in range(num_resources):
+        thresholds = _grant_thresholds(allocation, need_matrix, available, columns, j, pids)
+        for pid in pids:
+            rows[pid].append(min(available[j], need_matrix[pid][j], thresholds[pid]))
+    return rows
+
+
+def max_safe_grant(allocation, max_need, available, pid):
+    """
+    Largest amount of each resource that process `pid` can be granted (one
+    resource at a time) while the state stays safe.
+
+    Args:
+        allocation (list[list[int]]): Currently allocated resources per process.
+        max_need (list[list[int]]): Maximum resources each process may claim.
+        available (list[int]): Currently available resources.
+        pid (int): Process index.
+
+    Returns:
+        list[int]: Per-resource maximum safe grant (all zeros if the state is unsafe).
+
+    Raises:
+        ValueError: If the input is invalid.
+        IndexError: If `pid` is out of range.
+    """
+    if not 0 <= pid < len(allocation):
+        raise IndexError(f"Unknown process P{pid}.")
+    return _headroom_rows(allocation, max_need, available, [pid])[pid]
+
+
+def headroom_matrix(allocation, max_need, available):
+    """
+    Maximum safe grant of every resource for every process (see max_safe_grant()).
+
+    Returns:
+        list[list[int]]: n x m matrix; row i is the headroom of process Pi.
+    """
+    pids = list(range(len(allocation)))
+    rows = _headroom_rows(allocation, max_need, available, pids)
+    return [rows[pid] for pid in pids]
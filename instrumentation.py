@@ -0,0 +1,219 @@
+"""
+Instrumentation for the safety engine: phase timers, operation counters and
+optional cProfile / tracemalloc hooks.
+
+A Metrics object is passed to the code being measured (e.g.
+run_bankers_algorithm_logic(..., metrics=metrics)), which records into it and
+returns its usual result. Code that is not given a Metrics object skips all of
+this, so instrumentation costs nothing unless it is asked for.
+
+Example:
+    metrics = Metrics(profile=True)
+    run_bankers_algorithm_logic(allocation, max_need, available, n, m, metrics=metrics)
+    print(metrics.to_json(indent=2))
+    print(metrics.to_prometheus())
+"""
+import json
+import re
+import time
+from contextlib import contextmanager
+
+METRICS_FORMATS = ("json", "prometheus")
+DEFAULT_PROMETHEUS_PREFIX = "banker"
+
+
+class Metrics:
+    """
+    Collects phase timings, counters and gauges. Not thread-safe: use one
+    Metrics object per thread and merge() them afterwards.
+    """
+
+    def __init__(self, profile=False, trace_memory=False):
+        """
+        Args:
+            profile (bool): Run cProfile inside profiling() blocks.
+            trace_memory (bool): Record the peak traced memory of profiling() blocks.
+        """
+        self.profile = profile
+        self.trace_memory = trace_memory
+        self.counters = {}
+        self.gauges = {}
+        self.timings = {} # phase -> [seconds, calls]
+        self._profiler = None
+        if profile:
+            # Imported only when asked for, so the CLI does not pay for it at startup.
+            import cProfile
+            self._profiler = cProfile.Profile()
+        self._profiling_depth = 0
+
+    def count(self, name, amount=1):
+        """Adds `amount` to counter `name`."""
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def add_counts(self, counts):
+        """Adds every value of a {name: amount} dict to its counter."""
+        for name, amount in counts.items():
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def set_gauge(self, name, value):
+        """Sets gauge `name`; peak_* gauges keep the largest value seen."""
+        if name.startswith("peak_"):
+            value = max(value, self.gauges.get(name, value))
+        self.gauges[name] = value
+
+    def add_time(self, name, seconds, calls=1):
+        timing = self.timings.setdefault(name, [0.0, 0])
+        timing[0] += seconds
+        timing[1] += calls
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Times the enclosed block as phase `name` (times and calls add up over repeated blocks).
+        """
+        started = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.add_time(name, time.perf_counter() - started)
+
+    def timed_iter(self, name, iterable):
+        """
+        Yields the items of `iterable`, timing how long producing them takes as phase `name`.
+        """
+        iterator = iter(iterable)
+        while True:
+            started = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.add_time(name, time.perf_counter() - started, calls=0)
+                return
+            self.add_time(name, time.perf_counter() - started)
+            yield item
+
+    @contextmanager
+    def profiling(self):
+        """
+        Runs the enclosed block under cProfile and/or tracemalloc, if enabled.
+        Nested blocks are measured once, by the outermost one.
+        """
+        self._profiling_depth += 1
+        outermost = self._profiling_depth == 1
+        started_tracing = False
+        if outermost and self.trace_memory:
+            import tracemalloc
+            if tracemalloc.is_tracing():
+                tracemalloc.reset_peak()
+            else:
+                tracemalloc.start()
+                started_tracing = True
+            baseline = tracemalloc.get_traced_memory()[0]
+        if outermost and self._profiler is not None:
+            self._profiler.enable()
+        try:
+            yield self
+        finally:
+            self._profiling_depth -= 1
+            if outermost and self._profiler is not None:
+                self._profiler.disable()
+            if outermost and self.trace_memory:
+                self.set_gauge("peak_memory_bytes", tracemalloc.get_traced_memory()[1] - baseline)
+                if started_tracing:
+                    tracemalloc.stop()
+
+    def profile_rows(self, limit=20):
+        """
+        Returns the `limit` functions with the highest cumulative time in the
+        cProfile data, as dicts (empty if profiling is off or recorded nothing).
+        """
+        if self._profiler is None:
+            return []
+        import pstats
+        try:
+            stats = pstats.Stats(self._profiler)
+        except TypeError: # Nothing was profiled yet
+            return []
+        rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:limit]
+        return [{"function": f"{filename}:{line}({function})", "calls": calls,
+                 "own_seconds": round(own_time, 6), "cumulative_seconds": round(cumulative_time, 6)}
+                for (filename, line, function), (_, calls, own_time, cumulative_time, _) in rows]
+
+    def merge(self, other):
+        """
+        Adds the timings, counters and gauges of another Metrics object to this one.
+        """
+        self.add_counts(other.counters)
+        for name, value in other.gauges.items():
+            self.set_gauge(name, value)
+        for name, (seconds, calls) in other.timings.items():
+            self.add_time(name, seconds, calls)
+        return self
+
+    def as_dict(self):
+        result = {
+            "phases": {name: {"seconds": round(seconds, 6), "calls": calls}
+                       for name, (seconds, calls) in self.timings.items()},
+            "counters": dict(self.counters),
+            "gauges": dict(self.gauges),
+        }
+        if self._profiler is not None:
+            result["profile"] = self.profile_rows()
+        return result
+
+    def to_json(self, indent=None):
+        return json.dumps(self.as_dict(), indent=indent)
+
+    def to_prometheus(self, prefix=DEFAULT_PROMETHEUS_PREFIX):
+        """
+        Renders the metrics in the Prometheus text exposition format.
+        """
+        lines = []
+        if self.timings:
+            lines.append(f"# HELP {prefix}_phase_seconds_total Time spent in each phase.")
+            lines.append(f"# TYPE {prefix}_phase_seconds_total counter")
+            for name, (seconds, _) in self.timings.items():
+                lines.append(f'{prefix}_phase_seconds_total{{phase="{_label(name)}"}} {seconds:.9f}')
+            lines.append(f"# HELP {prefix}_phase_calls_total Number of times each phase ran.")
+            lines.append(f"# TYPE {prefix}_phase_calls_total counter")
+            for name, (_, calls) in self.timings.items():
+                lines.append(f'{prefix}_phase_calls_total{{phase="{_label(name)}"}} {calls}')
+        for name, value in self.counters.items():
+            metric = f"{prefix}_{_metric_name(name)}_total"
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"{metric} {value}")
+        for name, value in self.gauges.items():
+            metric = f"{prefix}_{_metric_name(name)}"
+            lines.append(f"# TYPE {metric} gauge")
+            lines.append(f"{metric} {value}")
+        return "\n".join(lines) + "\n"
+
+    def export(self, output_format):
+        """
+        Returns the metrics as text in one of METRICS_FORMATS.
+        """
+        if output_format == "json":
+            return self.to_json() + "\n"
+        if output_format == "prometheus":
+            return self.to_prometheus()
+        raise ValueError(f"Unknown metrics format '{output_format}'. Expected one of {METRICS_FORMATS}.")
+
+    def summary_lines(self):
+        """
+        Returns short human-readable lines (used by the GUI's metrics panel).
+        """
+        lines = [f"{name}: {seconds * 1000:.3f} ms" + (f" ({calls} calls)" if calls != 1 else "")
+                 for name, (seconds, calls) in self.timings.items()]
+        lines.extend(f"{name}: {value:,}" for name, value in self.counters.items())
+        lines.extend(f"{name}: {value:,}" for name, value in self.gauges.items())
+        for row in self.profile_rows(limit=10):
+            lines.append(f"{row['cumulative_seconds'] * 1000:9.3f} ms  {row['calls']:>7}  {row['function']}")
+        return lines
+
+
+def _metric_name(name):
+    return re.sub(r"[^a-zA-Z0-9_]", "_", name)
+
+
+def _label(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -1,10 +1,130 @@
 import customtkinter as ctk
-from tkinter import messagebox
-import random
+from tkinter import filedialog, messagebox
+import threading
+import time
 from windows import AboutWindow, ResultsWindow
-from banker_logic import run_bankers_algorithm_logic
+from widgets import MatrixEditor
+from banker_logic import CompactTrace, compute_need_matrix, iter_safe_sequence, safety_operation_counts
+from scenario_generator import generate_scenario
+from recovery_planner import plan_recovery
+from available_frontier import minimal_available_frontier, smallest_available
+from verdict_cache import VerdictCache, scenario_key
+from instrumentation import Metrics
+from scenario_format import SCENARIO_FILE_EXTENSION, load_scenario, save_scenario
+
+
+class BackgroundJob:
+    """
+    Runs `_work()` on a background thread.
+
+    The worker thread never touches any widget: it only updates its own
+    attributes and finally `result`, which the GUI reads from after() callbacks
+    on the Tk main loop.
+    """
+    def __init__(self, *args):
+        self.result = None         # Set by _work() once it has finished (left None if cancelled)
+        self.error = None          # Exception raised by the worker, if any
+        self.cancel_event = threading.Event()
+        self.done_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True, args=args)
+
+    def start(self):
+        self._thread.start()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def progress_text(self):
+        """Status line shown while the job runs."""
+        return "Working..."
+
+    def _run(self, *args):
+        try:
+            self._work(*args)
+        except Exception as error: # Reported to the user by the GUI thread
+            self.error = error
+        finally:
+            self.done_event.set()
+
+    def _work(self, *args):
+        raise NotImplementedError
+
+
+class SafetyCheckJob(BackgroundJob):
+    """
+    Runs the Banker's Algorithm safety check on a background thread, updating
+    `progress` as processes finish.
+    """
+    def __init__(self, allocation, max_need, initial_available, num_processes, num_resources, cache=None,
+                 metrics=None):
+        super().__init__(allocation, max_need, initial_available, num_processes, num_resources)
+        self.num_processes = num_processes
+        self.cache = cache         # VerdictCache consulted before running the check
+        self.metrics = metrics if metrics is not None else Metrics() # Phase timings and counters of the check
+        self.initial_available = initial_available
+        self.progress = 0          # Number of processes finished so far
+        self.recovery_plan = None  # RecoveryPlan for an unsafe state
+        # result: (need_matrix, simulation_steps, safe_sequence, is_safe_state)
+
+    def progress_text(self):
+        return f"Checking for deadlock... {self.progress}/{self.num_processes} processes finished"
+
+    def _work(self, allocation, max_need, initial_available, num_processes, num_resources):
+        metrics = self.metrics
+        with metrics.phase("need_matrix"):
+            need_matrix = compute_need_matrix(allocation, max_need, num_processes, num_resources)
+        # The same inputs are often checked again; a cached verdict skips the check.
+        cache_key = scenario_key(allocation, max_need, initial_available) if self.cache is not None else None
+        verdict = self.cache.get(cache_key) if cache_key is not None else None
+        if verdict is not None:
+            safe_sequence = verdict[0]
+            self.progress = len(safe_sequence)
+            metrics.count("cache_hits")
+        else:
+            safe_sequence = []
+            with metrics.phase("safety_check"):
+                for process_id in iter_safe_sequence(allocation, need_matrix, initial_available,
+                                                     num_processes, num_resources):
+                    if self.cancel_event.is_set():
+                        return
+                    safe_sequence.append(process_id)
+                    self.progress = len(safe_sequence)
+            metrics.add_counts(safety_operation_counts(allocation, need_matrix, initial_available,
+                                                       safe_sequence, num_resources))
+            if cache_key is not None:
+                self.cache.put(cache_key, safe_sequence, len(safe_sequence) == num_processes)
+        # A compact trace only stores the executed process ids; ResultsWindow rebuilds
+        # the Work vectors of each step from the allocation matrix when displaying it.
+        simulation_steps = CompactTrace(allocation, initial_available, safe_sequence, num_resources)
+        is_safe_state = len(safe_sequence) == num_processes
+        if not is_safe_state:
+            # Suggest the fewest processes to abort so the rest can finish.
+            with metrics.phase("recovery_plan"):
+                self.recovery_plan = plan_recovery(allocation, max_need, initial_available)
+        self.result = (need_matrix, simulation_steps, safe_sequence, is_safe_state)
+
+
+class MinimalAvailableJob(BackgroundJob):
+    """
+    Computes the minimal Available frontier (see available_frontier.py) on a background thread.
+    The search itself cannot be interrupted; a cancelled job's result is discarded.
+    """
+    def progress_text(self):
+        return "Searching for the minimal Available vectors..."
+
+    def _work(self, allocation, max_need):
+        frontier = minimal_available_frontier(allocation, max_need)
+        if not self.cancelled:
+            self.result = frontier
+
 
 class DeadlockDetectorApp(ctk.CTk):
+    SAFETY_CHECK_POLL_MS = 100 # How often the background safety check is polled for progress
+
     def __init__(self):
         super().__init__()
 
@@ -19,14 +139,19 @@ class DeadlockDetectorApp(ctk.CTk):
         self.about_window = None
         self.results_window = None
 
+        # --- Background Safety Check ---
+        self.background_job = None # SafetyCheckJob or MinimalAvailableJob currently running, if any
+        self.verdict_cache = VerdictCache() # Verdicts of previously checked inputs
+
         # --- Core Application Variables ---
         self.num_processes = 0 # Stores the number of processes (n)
         self.num_resources = 0 # Stores the number of resource types (m)
         
-        # Lists to hold references to the CTkEntry widgets for matrix input
-        self.allocation_entries = [] # 2D list of Entry widgets for Allocation matrix
-        self.max_entries = []        # 2D list of Entry widgets for Max Need matrix
-        self.available_entries = []  # 1D list of Entry widgets for Available resources
+        # Matrix editors holding the input values. Each editor keeps its values in an
+        # in-memory matrix and only renders the rows/columns that are in view.
+        self.allocation_editor = None # MatrixEditor for the Allocation matrix (n x m)
+        self.max_editor = None        # MatrixEditor for the Max Need matrix (n x m)
+        self.available_editor = None  # MatrixEditor for the Available resources (1 x m)
 
         # --- Build Main GUI Layout ---
         self.create_main_gui_layout()
@@ -114,6 +239,9 @@ class DeadlockDetectorApp(ctk.CTk):
             messagebox.showerror("Invalid Input", "Please enter valid integers for processes and resources.")
             return
 
+        # A running check refers to the old inputs; stop it before rebuilding the editors
+        self.cancel_bankers_algorithm()
+
         # Clear any existing matrix input widgets from the frame
         for widget in self.matrix_frame.winfo_children():
             widget.destroy()
@@ -128,15 +256,15 @@ class DeadlockDetectorApp(ctk.CTk):
         alloc_frame = ctk.CTkFrame(self.matrix_frame, corner_radius=10)
         alloc_frame.grid(row=0, column=0, padx=10, pady=10, sticky="nsew")
         ctk.CTkLabel(alloc_frame, text="Allocation Matrix", font=ctk.CTkFont(size=16, weight="bold")).pack(pady=10)
-        # Call helper to create grid of entry widgets
-        self.allocation_entries = self._create_grid_of_entries(alloc_frame, self.num_processes, self.num_resources, "P")
+        # Call helper to create the matrix editor
+        self.allocation_editor = self._create_matrix_editor(alloc_frame, self.num_processes, self.num_resources, "P")
 
         # --- Max Need Matrix Input ---
         max_frame = ctk.CTkFrame(self.matrix_frame, corner_radius=10)
         max_frame.grid(row=0, column=1, padx=10, pady=10, sticky="nsew")
         ctk.CTkLabel(max_frame, text="Max Need Matrix", font=ctk.CTkFont(size=16, weight="bold")).pack(pady=10)
-        # Call helper to create grid of entry widgets
-        self.max_entries = self._create_grid_of_entries(max_frame, self.num_processes, self.num_resources, "P")
+        # Call helper to create the matrix editor
+        self.max_editor = self._create_matrix_editor(max_frame, self.num_processes, self.num_resources, "P")
         
         # --- Controls Frame (Available Resources & Action Buttons) ---
         controls_frame = ctk.CTkFrame(self.matrix_frame, corner_radius=10)
@@ -146,16 +274,31 @@ class DeadlockDetectorApp(ctk.CTk):
         avail_frame = ctk.CTkFrame(controls_frame, corner_radius=10)
         avail_frame.pack(pady=10, padx=10, fill='x')
         ctk.CTkLabel(avail_frame, text="Available Resources", font=ctk.CTkFont(size=16, weight="bold")).pack(pady=10)
-        # _create_grid_of_entries returns a list of lists, but for Available, we only need the first (and only) row.
-        self.available_entries = self._create_grid_of_entries(avail_frame, 1, self.num_resources, "R")[0]
+        # Available is edited as a matrix with a single row.
+        self.available_editor = self._create_matrix_editor(avail_frame, 1, self.num_resources, "R", visible_cols=4)
 
         # Action Buttons Section
         buttons_frame = ctk.CTkFrame(controls_frame, fg_color="transparent") # Transparent for cleaner look
         buttons_frame.pack(pady=20, padx=20, fill='x', expand=True)
 
-        calculate_btn = ctk.CTkButton(buttons_frame, text="Check for Deadlock", command=self.run_bankers_algorithm,
-                                      font=ctk.CTkFont(size=16, weight="bold"))
-        calculate_btn.pack(side="top", fill="x", ipady=10, pady=5) # ipady adds internal padding
+        self.calculate_btn = ctk.CTkButton(buttons_frame, text="Check for Deadlock", command=self.run_bankers_algorithm,
+                                           font=ctk.CTkFont(size=16, weight="bold"))
+        self.calculate_btn.pack(side="top", fill="x", ipady=10, pady=5) # ipady adds internal padding
+
+        # Cancel button, only enabled while a safety check is running in the background
+        self.cancel_btn = ctk.CTkButton(buttons_frame, text="Cancel Check", command=self.cancel_bankers_algorithm,
+                                        fg_color="#C0392B", hover_color="#E74C3C", state="disabled")
+        self.cancel_btn.pack(side="top", fill="x", pady=5)
+
+        # Computes the smallest Available vectors that make the current matrices safe
+        self.min_available_btn = ctk.CTkButton(buttons_frame, text="Min Available", command=self.fill_minimal_available)
+        self.min_available_btn.pack(side="top", fill="x", pady=5)
+
+        # Binary scenario files (memory-mapped on load, so large matrices open quickly)
+        save_btn = ctk.CTkButton(buttons_frame, text="Save Scenario", command=self.save_scenario_to_file)
+        save_btn.pack(side="top", fill="x", pady=5)
+        load_btn = ctk.CTkButton(buttons_frame, text="Load Scenario", command=self.load_scenario_from_file)
+        load_btn.pack(side="top", fill="x", pady=5)
 
         randomize_btn = ctk.CTkButton(buttons_frame, text="Randomize Inputs", command=self.randomize_fields,
                                       fg_color="#D35400", hover_color="#E67E22") # Custom colors for distinction
@@ -165,128 +308,101 @@ class DeadlockDetectorApp(ctk.CTk):
                                   fg_color="#7f8c8d", hover_color="#95a5a6") # Custom colors for distinction
         reset_btn.pack(side="top", fill="x", pady=5)
 
-    def _create_grid_of_entries(self, parent_frame, rows, cols, row_label_prefix="R"):
+    def _create_matrix_editor(self, parent_frame, rows, cols, row_label_prefix="R", visible_cols=6):
         """
-        Helper method to create a grid of CTkEntry widgets with row/column labels
+        Helper method to create a MatrixEditor with row/column labels
         within a specified parent frame.
         
+        Only the visible window of cells is rendered as widgets, so large
+        process/resource counts do not create thousands of entries.
+
         Args:
-            parent_frame (ctk.CTkFrame): The frame where the grid will be packed.
-            rows (int): Number of rows for the grid.
-            cols (int): Number of columns for the grid.
+            parent_frame (ctk.CTkFrame): The frame where the editor will be packed.
+            rows (int): Number of rows of the matrix.
+            cols (int): Number of columns of the matrix.
             row_label_prefix (str): Prefix for row labels (e.g., "P" for process, "R" for resource).
+            visible_cols (int): Maximum number of columns shown at once.
         
         Returns:
-            list[list[ctk.CTkEntry]]: A 2D list (matrix) of the created Entry widgets.
+            MatrixEditor: The created editor (all values initialised to 0).
         """
-        grid_container_frame = ctk.CTkFrame(parent_frame, fg_color="transparent")
-        grid_container_frame.pack(pady=5, padx=5)
-        
-        entries_matrix = [] # This will store references to all entry widgets
-
-        # Create column headers (R0, R1, R2...)
-        for j in range(cols):
-            col_label = ctk.CTkLabel(grid_container_frame, text=f"R{j}", font=ctk.CTkFont(size=12, weight="bold"))
-            col_label.grid(row=0, column=j+1, padx=5, pady=2) # Column 0 is reserved for row labels
-
-        # Create rows of entry widgets with optional row labels (P0, P1...)
-        for i in range(rows):
-            current_row_entries = []
-            if rows > 1: # Only add row labels if it's a multi-row matrix (like Allocation or Max Need)
-                row_label = ctk.CTkLabel(grid_container_frame, text=f"{row_label_prefix}{i}", font=ctk.CTkFont(size=12, weight="bold"))
-                row_label.grid(row=i+1, column=0, padx=5, pady=2)
-            
-            # Create entry widgets for each cell in the current row
-            for j in range(cols):
-                entry_widget = ctk.CTkEntry(grid_container_frame, width=50, justify='center')
-                entry_widget.grid(row=i+1, column=j+1, padx=5, pady=5)
-                entry_widget.insert(0, "0") # Default value for each entry
-                current_row_entries.append(entry_widget)
-            
-            entries_matrix.append(current_row_entries) # Add the current row's entries to the main matrix
-        
-        return entries_matrix
+        matrix_editor = MatrixEditor(parent_frame, rows, cols, row_label_prefix, visible_cols=visible_cols)
+        matrix_editor.pack(pady=5, padx=5)
+        return matrix_editor
 
-    def get_matrix_values(self, entries_list):
+    def _report_invalid_cell(self, matrix_editor, negative_message, invalid_message):
         """
-        Parses integer values from a 2D list of CTkEntry widgets (for Allocation/Max matrices).
-        Performs basic validation for non-negative integers.
+        Shows an error for the first invalid cell of an editor, if there is one.
 
         Args:
-            entries_list (list[list[ctk.CTkEntry]]): A 2D list of Entry widgets.
+            matrix_editor (MatrixEditor): The editor to check.
+            negative_message (str): Message for a negative value; may use {row} and {col}.
+            invalid_message (str): Message for text that is not an integer.
 
         Returns:
-            list[list[int]] or None: The parsed 2D list of integers, or None if validation fails.
+            bool: True if an invalid cell was found (and reported).
         """
-        parsed_matrix = []
+        invalid_cells = matrix_editor.invalid_cells()
+        if not invalid_cells:
+            return False
+        (r_idx, c_idx), raw_text = min(invalid_cells.items())
+        matrix_editor.scroll_to(r_idx, c_idx) # Bring the offending cell into view
         try:
-            for r_idx, row_entries in enumerate(entries_list):
-                current_row_values = []
-                for c_idx, entry_widget in enumerate(row_entries):
-                    value = int(entry_widget.get())
-                    if value < 0:
-                        messagebox.showerror("Input Error", f"Negative value found at row {r_idx}, column {c_idx}. All matrix values must be non-negative.")
-                        return None
-                    current_row_values.append(value)
-                parsed_matrix.append(current_row_values)
-            return parsed_matrix
+            int(raw_text)
+            messagebox.showerror("Input Error", negative_message.format(row=r_idx, col=c_idx))
         except ValueError:
-            messagebox.showerror("Input Error", "All matrix fields must contain valid non-negative integers.")
-            return None
-        except IndexError:
-            # This handles cases where matrix dimensions might have changed unexpectedly.
+            messagebox.showerror("Input Error", invalid_message)
+        return True
+
+    def get_matrix_values(self, matrix_editor):
+        """
+        Reads the integer values of a matrix editor (for Allocation/Max matrices).
+        Values are taken from the editor's model rather than parsed from widgets;
+        cells holding invalid text are reported to the user.
+
+        Args:
+            matrix_editor (MatrixEditor): The editor to read.
+
+        Returns:
+            list[list[int]] or None: The 2D list of integers, or None if validation fails.
+        """
+        if matrix_editor is None:
             messagebox.showerror("Input Error", "Matrix dimensions mismatch with entered values. Please re-generate fields using 'Generate Fields' button.")
             return None
+        if self._report_invalid_cell(matrix_editor,
+                                     "Negative value found at row {row}, column {col}. All matrix values must be non-negative.",
+                                     "All matrix fields must contain valid non-negative integers."):
+            return None
+        return matrix_editor.get_values()
 
-    def get_vector_values(self, entries_list):
+    def get_vector_values(self, matrix_editor):
         """
-        Parses integer values from a 1D list of CTkEntry widgets (for Available resources).
-        Performs basic validation for non-negative integers.
+        Reads the integer values of a single-row editor (for Available resources).
 
         Args:
-            entries_list (list[ctk.CTkEntry]): A 1D list of Entry widgets.
+            matrix_editor (MatrixEditor): The 1 x m editor to read.
 
         Returns:
-            list[int] or None: The parsed list of integers, or None if validation fails.
+            list[int] or None: The list of integers, or None if validation fails.
         """
-        parsed_vector = []
-        try:
-            for idx, entry_widget in enumerate(entries_list):
-                value = int(entry_widget.get())
-                if value < 0:
-                    messagebox.showerror("Input Error", f"Negative value found for resource {idx}. All available resource values must be non-negative.")
-                    return None
-                parsed_vector.append(value)
-            return parsed_vector
-        except ValueError:
-            messagebox.showerror("Input Error", "All available resource fields must contain valid non-negative integers.")
-            return None
-        except IndexError:
-            # This handles cases where vector length might have changed unexpectedly.
+        if matrix_editor is None:
             messagebox.showerror("Input Error", "Available resources count mismatch. Please re-generate fields using 'Generate Fields' button.")
             return None
+        if self._report_invalid_cell(matrix_editor,
+                                     "Negative value found for resource {col}. All available resource values must be non-negative.",
+                                     "All available resource fields must contain valid non-negative integers."):
+            return None
+        return matrix_editor.get_values()[0]
 
     def reset_fields(self):
         """
         Resets all input fields (Allocation, Max Need, Available) to a default value of '0'.
         Updates the status label to inform the user.
         """
-        # Iterate through all Allocation matrix entries and set to '0'
-        for row_entries in self.allocation_entries:
-            for entry_widget in row_entries:
-                entry_widget.delete(0, 'end')
-                entry_widget.insert(0, '0')
-        
-        # Iterate through all Max Need matrix entries and set to '0'
-        for row_entries in self.max_entries:
-            for entry_widget in row_entries:
-                entry_widget.delete(0, 'end')
-                entry_widget.insert(0, '0')
-        
-        # Iterate through all Available resources entries and set to '0'
-        for entry_widget in self.available_entries:
-            entry_widget.delete(0, 'end')
-            entry_widget.insert(0, '0')
+        # Reset the models behind every editor; only the visible cells are redrawn
+        for matrix_editor in (self.allocation_editor, self.max_editor, self.available_editor):
+            if matrix_editor is not None:
+                matrix_editor.fill(0)
             
         self.status_label.configure(text="Fields reset. Enter new values.",
                                      text_color=ctk.ThemeManager.theme["CTkLabel"]["text_color"])
@@ -302,35 +418,115 @@ class DeadlockDetectorApp(ctk.CTk):
             messagebox.showinfo("Info", "Please set valid dimensions (Processes & Resources) first, then click 'Generate Fields'.")
             return
 
-        # Randomize values for Allocation and Max Need matrices
-        for i in range(self.num_processes):
-            for j in range(self.num_resources):
-                alloc_val = random.randint(0, 5) # Random value for allocation (0-5)
-                self.allocation_entries[i][j].delete(0, 'end')
-                self.allocation_entries[i][j].insert(0, str(alloc_val))
-                
-                max_val = random.randint(alloc_val, alloc_val + 5) # Max must be >= current allocation
-                self.max_entries[i][j].delete(0, 'end')
-                self.max_entries[i][j].insert(0, str(max_val))
-        
-        # Randomize values for Available resources
-        for j in range(self.num_resources):
-            avail_val = random.randint(3, 10) # Random value for available resources (3-10)
-            self.available_entries[j].delete(0, 'end')
-            self.available_entries[j].insert(0, str(avail_val))
-            
+        # Random allocation (0-5), Max = Allocation + (0-5) and Available (3-10)
+        allocation_values, max_values, available_values = generate_scenario(self.num_processes, self.num_resources)
+        self.allocation_editor.set_values(allocation_values)
+        self.max_editor.set_values(max_values)
+        self.available_editor.set_values([available_values])
+
         self.status_label.configure(text="Random values generated. Click 'Check for Deadlock'.", text_color="yellow")
 
+    def fill_minimal_available(self):
+        """
+        Computes the minimal Available vectors (the Pareto frontier) for which the
+        current Allocation and Max Need matrices are safe, fills the Available row
+        with the frontier point using the fewest resources and lists the frontier.
+        The search runs on a worker thread; _show_minimal_available() shows its result.
+        """
+        if self.background_job is not None:
+            return # A job is already running; the buttons are disabled meanwhile
+        current_allocation = self.get_matrix_values(self.allocation_editor)
+        current_max_need = self.get_matrix_values(self.max_editor)
+        if current_allocation is None or current_max_need is None:
+            return
+        self._start_background_job(MinimalAvailableJob(current_allocation, current_max_need),
+                                   self._show_minimal_available)
+
+    def _show_minimal_available(self, job):
+        """
+        Fills the Available row with the frontier found by a finished MinimalAvailableJob.
+        """
+        if isinstance(job.error, ValueError): # Invalid matrices
+            messagebox.showerror("Input Error", str(job.error))
+            self.status_label.configure(text="Invalid input for the minimal Available search.", text_color="red")
+            return
+        if self._report_unfinished_job(job, "Minimal Available search"):
+            return
+        frontier = job.result
+        best_available = smallest_available(frontier)
+        self.available_editor.set_values([best_available])
+        shown_points = "\n".join(str(point) for point in frontier[:10])
+        if len(frontier) > 10:
+            shown_points += f"\n... ({len(frontier) - 10} more)"
+        messagebox.showinfo("Minimal Available",
+                            f"The system is safe for any Available vector that is at least one of these "
+                            f"{len(frontier)} minimal vectors in every resource:\n\n{shown_points}")
+        self.status_label.configure(text=f"Available set to the minimal vector {best_available}. Click 'Check for Deadlock'.",
+                                    text_color="yellow")
+
+    def save_scenario_to_file(self):
+        """
+        Asks for a file name and writes the current inputs as a binary scenario file.
+        """
+        current_allocation = self.get_matrix_values(self.allocation_editor)
+        current_max_need = self.get_matrix_values(self.max_editor)
+        current_initial_available = self.get_vector_values(self.available_editor)
+        if current_allocation is None or current_max_need is None or current_initial_available is None:
+            return
+        path = filedialog.asksaveasfilename(parent=self, title="Save Scenario", defaultextension=SCENARIO_FILE_EXTENSION,
+                                            filetypes=[("Scenario files", f"*{SCENARIO_FILE_EXTENSION}")])
+        if not path:
+            return # Dialog cancelled
+        try:
+            save_scenario(path, current_allocation, current_max_need, current_initial_available)
+        except (OSError, ValueError) as error:
+            messagebox.showerror("Save Error", f"Could not save the scenario:\n{error}")
+            return
+        self.status_label.configure(text=f"Scenario saved to {path}.", text_color="cyan")
+
+    def load_scenario_from_file(self):
+        """
+        Asks for a binary scenario file, resizes the editors to it and shows its values.
+        The matrices stay memory-mapped; the editors copy only the rows that are edited.
+        """
+        path = filedialog.askopenfilename(parent=self, title="Load Scenario",
+                                          filetypes=[("Scenario files", f"*{SCENARIO_FILE_EXTENSION}"), ("All files", "*")])
+        if not path:
+            return # Dialog cancelled
+        try:
+            scenario = load_scenario(path)
+        except (OSError, ValueError) as error:
+            messagebox.showerror("Load Error", f"Could not load the scenario:\n{error}")
+            return
+        num_processes, num_resources = len(scenario["allocation"]), len(scenario["available"])
+        if num_processes <= 0 or num_resources <= 0:
+            messagebox.showerror("Load Error", "The scenario has no processes or no resources.")
+            return
+
+        # Rebuild the editors for the file's dimensions, then hand them the mapped rows
+        for entry, value in ((self.processes_entry, num_processes), (self.resources_entry, num_resources)):
+            entry.delete(0, "end")
+            entry.insert(0, str(value))
+        self.create_matrix_inputs()
+        self.allocation_editor.set_values(scenario["allocation"])
+        self.max_editor.set_values(scenario["max_need"])
+        self.available_editor.set_values([scenario["available"]])
+
+        self.status_label.configure(text=f"Loaded {num_processes} x {num_resources} scenario from {path}. "
+                                         "Click 'Check for Deadlock'.", text_color="yellow")
+
     def run_bankers_algorithm(self):
         """
         Gathers input data from the GUI, performs necessary validations,
         then calls the core Banker's Algorithm logic, and finally displays
         the results in a dedicated results window.
         """
-        # 1. Gather input values from the GUI entry widgets
-        current_allocation = self.get_matrix_values(self.allocation_entries)
-        current_max_need = self.get_matrix_values(self.max_entries)
-        current_initial_available = self.get_vector_values(self.available_entries)
+        # 1. Gather input values from the matrix editors' models
+        metrics = Metrics() # Timings shown in the ResultsWindow's metrics panel
+        parse_started = time.perf_counter()
+        current_allocation = self.get_matrix_values(self.allocation_editor)
+        current_max_need = self.get_matrix_values(self.max_editor)
+        current_initial_available = self.get_vector_values(self.available_editor)
 
         # If any of the input parsing functions returned None, an error message
         # has already been displayed, so stop execution here.
@@ -361,11 +557,82 @@ class DeadlockDetectorApp(ctk.CTk):
                     messagebox.showerror("Input Error", f"Error: Max Need for P{i} R{j} ({current_max_need[i][j]}) must be >= Allocation for P{i} R{j} ({current_allocation[i][j]}).")
                     return # Stop if this crucial condition is violated
 
-        # 4. Call the core Banker's Algorithm logic (from banker_logic.py)
-        # This function performs the actual safety check and generates simulation steps.
-        need_matrix, simulation_steps, safe_sequence, is_safe_state = \
-            run_bankers_algorithm_logic(current_allocation, current_max_need, 
-                                        current_initial_available, self.num_processes, self.num_resources)
+        # 4. Run the core Banker's Algorithm logic (from banker_logic.py) on a worker
+        # thread so the Tk main loop stays responsive for large inputs. Progress and
+        # the final result are picked up by _poll_background_job() via after().
+        if self.background_job is not None:
+            return # A job is already running; the buttons are disabled meanwhile
+        metrics.add_time("parse", time.perf_counter() - parse_started)
+        job = SafetyCheckJob(current_allocation, current_max_need, current_initial_available,
+                             self.num_processes, self.num_resources, cache=self.verdict_cache, metrics=metrics)
+        self._start_background_job(job, self._show_safety_check_results)
+
+    def _start_background_job(self, job, on_done):
+        """
+        Starts `job` and polls it from the Tk main loop; on_done(job) runs once it has finished.
+        """
+        self.background_job = job
+        self.calculate_btn.configure(state="disabled")
+        self.min_available_btn.configure(state="disabled")
+        self.cancel_btn.configure(state="normal")
+        self.status_label.configure(text=job.progress_text(), text_color="yellow")
+        job.start()
+        self.after(self.SAFETY_CHECK_POLL_MS, self._poll_background_job, on_done)
+
+    def cancel_bankers_algorithm(self):
+        """
+        Asks the running background job (if any) to stop.
+        """
+        if self.background_job is not None:
+            self.background_job.cancel()
+            self.status_label.configure(text="Cancelling...", text_color="yellow")
+
+    def _finish_background_job(self):
+        """
+        Clears the running job and restores the action buttons.
+        """
+        self.background_job = None
+        if self.calculate_btn.winfo_exists():
+            self.calculate_btn.configure(state="normal")
+            self.min_available_btn.configure(state="normal")
+            self.cancel_btn.configure(state="disabled")
+
+    def _poll_background_job(self, on_done):
+        """
+        Runs on the Tk main loop: shows live progress of the background job and
+        hands it to on_done() once the worker thread has finished.
+        """
+        job = self.background_job
+        if job is None:
+            return
+        if not job.done_event.is_set():
+            self.status_label.configure(text=job.progress_text(), text_color="yellow")
+            self.after(self.SAFETY_CHECK_POLL_MS, self._poll_background_job, on_done)
+            return
+        self._finish_background_job()
+        on_done(job)
+
+    def _report_unfinished_job(self, job, description):
+        """
+        Reports a job that failed or was cancelled. Returns True if it did not produce a result.
+        """
+        if job.error is not None:
+            messagebox.showerror("Error", f"The {description.lower()} failed: {job.error}")
+            self.status_label.configure(text=f"{description} failed.", text_color="red")
+            return True
+        if job.result is None: # Stopped through the Cancel button
+            self.status_label.configure(text=f"{description} cancelled.",
+                                        text_color=ctk.ThemeManager.theme["CTkLabel"]["text_color"])
+            return True
+        return False
+
+    def _show_safety_check_results(self, job):
+        """
+        Displays the results of a finished SafetyCheckJob.
+        """
+        if self._report_unfinished_job(job, "Safety check"):
+            return
+        need_matrix, simulation_steps, safe_sequence, is_safe_state = job.result
 
         # 5. Display results in the ResultsWindow
         # If a ResultsWindow is already open, destroy it first to ensure fresh content.
@@ -373,8 +640,10 @@ class DeadlockDetectorApp(ctk.CTk):
             self.results_window.destroy() 
         
         # Create and show the new ResultsWindow with all algorithm outputs
-        self.results_window = ResultsWindow(current_initial_available, need_matrix, 
-                                            simulation_steps, safe_sequence, is_safe_state, self)
+        with job.metrics.phase("render"):
+            self.results_window = ResultsWindow(job.initial_available, need_matrix,
+                                                simulation_steps, safe_sequence, is_safe_state, self,
+                                                recovery_plan=job.recovery_plan, metrics=job.metrics)
         self.results_window.focus() # Bring the results window to the foreground
 
         # 6. Update the status label on the main window based on the algorithm's outcome
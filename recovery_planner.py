@@ -0,0 +1,221 @@
+"""
+Minimum-cost recovery plans for unsafe states.
+
+Given an unsafe state, plan_recovery() picks the cheapest set of victims to
+abort (their processes are terminated) or preempt (their allocation is taken
+back and they restart later from nothing) so that the remaining system is safe.
+
+The search relies on three properties of the safety check:
+
+* Aborting or preempting more processes never makes a safe outcome unsafe, so
+  a candidate set can be rejected early when even aborting every remaining
+  candidate would not help.
+* Processes the safety check already finishes never need to be victims: the
+  search only branches over the processes left stuck by the initial check.
+* The processes finished for a victim set stay finished when more victims are
+  added, so each branch resumes its parent's partial check (its Work vector and
+  the processes still stuck) instead of re-running the check from scratch.
+
+A greedy pass provides the first upper bound for the branch-and-bound search.
+"""
+from collections import namedtuple
+
+from banker_logic import compute_need_matrix, iter_safe_sequence, validate_bankers_input
+
+RECOVERY_MODES = ("abort", "preempt")
+
+# victims: sorted process ids to abort / preempt; cost: sum of their weights;
+# safe_sequence: a safe sequence of the recovered state; optimal: False if the
+# search hit its node limit and the plan is only the best one found.
+RecoveryPlan = namedtuple("RecoveryPlan", ["victims", "cost", "safe_sequence", "optimal"])
+
+
+class _RecoverySearch:
+    """
+    Branch-and-bound over the processes left stuck by the initial safety check.
+    """
+
+    def __init__(self, allocation, max_need, need_matrix, weights, mode, num_resources):
+        self.allocation = allocation
+        self.max_need = max_need
+        self.need_matrix = need_matrix
+        self.weights = weights
+        self.preempt = mode == "preempt"
+        self.num_resources = num_resources
+        self.zero_row = [0] * num_resources
+        self.nodes = 0
+
+    def rows(self, pid, victim):
+        """(allocation, need) of a process for the check; a preempted victim holds nothing and needs its Max."""
+        if victim:
+            return self.zero_row, self.max_need[pid]
+        return self.allocation[pid], self.need_matrix[pid]
+
+    def close(self, work_vector, pending):
+        """
+        Runs the safety check over `pending` [(pid, is_victim)] starting from `work_vector`.
+
+        Returns:
+            tuple: (pids finished in order, entries still pending, Work afterwards)
+        """
+        row_pairs = [self.rows(pid, victim) for pid, victim in pending]
+        order = list(iter_safe_sequence([allocation_row for allocation_row, _ in row_pairs],
+                                        [need_row for _, need_row in row_pairs],
+                                        work_vector, len(pending), self.num_resources))
+        work_vector = list(work_vector)
+        for k in order:
+            for j, value in enumerate(row_pairs[k][0]):
+                work_vector[j] += value
+        finished = set(order)
+        return ([pending[k][0] for k in order],
+                [entry for k, entry in enumerate(pending) if k not in finished], work_vector)
+
+    def victimize(self, work_vector, pending, pid):
+        """
+        Work and pending entries after making `pid` a victim.
+        """
+        work_vector = [work + value for work, value in zip(work_vector, self.allocation[pid])]
+        if self.preempt:
+            pending = [(other, victim or other == pid) for other, victim in pending]
+        else:
+            pending = [(other, victim) for other, victim in pending if other != pid]
+        return work_vector, pending
+
+    def greedy(self, work_vector, stuck, candidates):
+        """
+        Victimizes candidates in heuristic order until the state is safe, then
+        drops victims that turn out to be unnecessary.
+
+        Returns:
+            list[int]: Victims that make the state safe.
+        """
+        pending = [(pid, False) for pid in stuck]
+        current_work = work_vector
+        victims = []
+        for pid in candidates:
+            if not pending:
+                break
+            if all(other != pid for other, _ in pending):
+                continue # Already finished thanks to earlier victims
+            current_work, pending = self.victimize(current_work, pending, pid)
+            _, pending, current_work = self.close(current_work, pending)
+            victims.append(pid)
+        for pid in sorted(victims, key=lambda victim: -self.weights[victim]):
+            trial = [victim for victim in victims if victim != pid]
+            if self.is_enough(work_vector, stuck, trial):
+                victims = trial
+        return victims
+
+    def is_enough(self, work_vector, stuck, victims):
+        """
+        True if victimizing `victims` lets every stuck process finish.
+        """
+        pending = [(pid, False) for pid in stuck]
+        for pid in victims:
+            work_vector, pending = self.victimize(work_vector, pending, pid)
+        return not self.close(work_vector, pending)[1]
+
+    def search(self, work_vector, stuck, candidates, best_victims, max_nodes):
+        """
+        Depth-first branch-and-bound: every candidate is either a victim or kept.
+
+        Returns:
+            tuple: (best victims, whether the search space was exhausted)
+        """
+        best_cost = sum(self.weights[pid] for pid in best_victims)
+        rank = {pid: k for k, pid in enumerate(candidates)}
+        # Node: (next candidate index, victims, cost, work, pending after the check)
+        stack = [(0, (), 0, work_vector, [(pid, False) for pid in stuck])]
+        while stack:
+            if self.nodes >= max_nodes:
+                return best_victims, False
+            self.nodes += 1
+            index, victims, cost, work_vector, pending = stack.pop()
+            if not pending:
+                if cost < best_cost:
+                    best_victims, best_cost = list(victims), cost
+                continue
+            # Only candidates that are still stuck are worth deciding on.
+            undecided = sorted(rank[pid] for pid, victim in pending if not victim and rank[pid] >= index)
+            if not undecided:
+                continue
+            if cost + min(self.weights[candidates[k]] for k in undecided) >= best_cost:
+                continue # At least one more victim is needed
+            optimistic_work, optimistic_pending = work_vector, pending
+            for k in undecided:
+                optimistic_work, optimistic_pending = self.victimize(optimistic_work, optimistic_pending, candidates[k])
+            if self.close(optimistic_work, optimistic_pending)[1]:
+                continue # Even making every undecided candidate a victim leaves someone stuck
+            pid = candidates[undecided[0]]
+            # Keep `pid` (explored second) ...
+            stack.append((undecided[0] + 1, victims, cost, work_vector, pending))
+            # ... or make it a victim (explored first), resuming the parent's check.
+            child_work, child_pending = self.victimize(work_vector, pending, pid)
+            _, child_pending, child_work = self.close(child_work, child_pending)
+            stack.append((undecided[0] + 1, victims + (pid,), cost + self.weights[pid], child_work, child_pending))
+        return best_victims, True
+
+
+def plan_recovery(allocation, max_need, available, weights=None, mode="abort", max_nodes=100000):
+    """
+    Finds the cheapest set of processes to abort or preempt so that the state becomes safe.
+
+    Args:
+        allocation (list[list[int]]): Currently allocated resources per process.
+        max_need (list[list[int]]): Maximum resources each process may claim.
+        available (list[int]): Currently available resources.
+        weights (list[float] | None): Non-negative cost of each process as a
+            victim (default: 1 each, i.e. the fewest victims).
+        mode (str): "abort" removes the victims; "preempt" takes their
+            allocation back and keeps them, so they must finish from nothing.
+        max_nodes (int): Search node budget; when it runs out the best plan
+            found so far is returned with optimal=False.
+
+    Returns:
+        RecoveryPlan | None: The plan (no victims if the state is already
+        safe), or None in "preempt" mode when some process's Max exceeds the
+        total resources, so no preemption can help.
+
+    Raises:
+        ValueError: If the input or the options are invalid.
+    """
+    num_processes, num_resources = validate_bankers_input(allocation, max_need, available)
+    if mode not in RECOVERY_MODES:
+        raise ValueError(f"Unknown recovery mode {mode!r}. Expected one of {', '.join(RECOVERY_MODES)}.")
+    if weights is None:
+        weights = [1] * num_processes
+    if len(weights) != num_processes or any(weight < 0 for weight in weights):
+        raise ValueError(f"Weights must be {num_processes} non-negative numbers.")
+
+    need_matrix = compute_need_matrix(allocation, max_need, num_processes, num_resources)
+    search = _RecoverySearch(allocation, max_need, need_matrix, weights, mode, num_resources)
+    finished, stuck, work_vector = search.close(available, [(pid, False) for pid in range(num_processes)])
+    if not stuck:
+        return RecoveryPlan([], 0, finished, True)
+    stuck = [pid for pid, _ in stuck]
+
+    totals = list(available)
+    for allocation_row in allocation:
+        for j, value in enumerate(allocation_row):
+            totals[j] += value
+    if search.preempt and any(any(value > total for value, total in zip(max_need[pid], totals)) for pid in stuck):
+        return None
+
+    # Try the candidates that free the most (relative to the resource totals) per unit of weight first.
+    def freed_per_weight(pid):
+        freed = sum(value / total for value, total in zip(allocation[pid], totals) if total)
+        return freed / weights[pid] if weights[pid] else float("inf")
+    candidates = sorted(stuck, key=freed_per_weight, reverse=True)
+
+    best_victims = search.greedy(work_vector, stuck, candidates)
+    best_victims, optimal = search.search(work_vector, stuck, candidates, best_victims, max_nodes)
+
+    victims = sorted(best_victims)
+    victim_set = set(victims)
+    recovered_available = list(available)
+    for pid in victims:
+        for j, value in enumerate(allocation[pid]):
+            recovered_available[j] += value
+    remaining = [(pid, pid in victim_set) for pid in range(num_processes) if search.preempt or pid not in victim_set]
+    safe_sequence = search.close(recovered_available, remaining)[0]
+    return RecoveryPlan(victims, sum(weights[pid] for pid in victims), safe_sequence, optimal)
@@ -0,0 +1,353 @@
+"""
+Banker's Algorithm deadlock avoidance for real threads and asyncio tasks.
+
+A BankerResourceManager owns a pool of resource instances. Every worker first
+registers its maximum claim and then acquires and releases resources through
+the returned ResourceClaim. An acquire that would leave the system in an
+unsafe state (or that does not fit the available instances) blocks until
+releases make it safe, so the workers can never deadlock on the pool.
+
+    manager = BankerResourceManager([4, 2, 3])
+    with manager.register([2, 1, 2]) as claim:   # close() releases everything
+        with claim.hold([1, 0, 1]):               # acquire ... release
+            do_work()
+
+Decisions are made by a shared BankerState under one lock that is held only
+for the decision itself, which is usually the O(m) fast path of the cached
+safe sequence. Blocked callers wait on their own waiter object instead of a
+shared condition, and a release grants waiters directly, oldest first, so only
+the waiters whose requests were granted are woken and none of them has to
+compete for the lock again.
+
+A request that fails in some state also fails after any further grant, so a
+new acquire can be decided against the current state without first retrying
+the queue: every queued request already failed against it. When resources are
+released, a waiter is skipped without a full safety check if its request
+still exceeds Available, or if the processes that blocked it last time still
+could not finish (BankerState.still_refused()).
+"""
+import asyncio
+import threading
+from collections import deque
+
+from banker_logic import BankerState
+
+
+class _Waiter:
+    """
+    A blocked acquire. `result` is set under the manager lock: True once granted,
+    or the exception to raise if the request became invalid (e.g. its claim was closed).
+    """
+    __slots__ = ("pid", "vector", "result", "notify", "blocked")
+
+    def __init__(self, pid, vector, notify, blocked):
+        self.pid = pid
+        self.vector = vector
+        self.result = None
+        self.notify = notify
+        self.blocked = blocked # BankerState.last_blocked of the check that refused it
+
+
+class BankerResourceManager:
+    """
+    Thread-safe resource pool that only grants requests that keep the system safe.
+    """
+
+    def __init__(self, available):
+        """
+        Args:
+            available (list[int]): Instances of each resource type in the pool.
+
+        Raises:
+            ValueError: If `available` is not a list of non-negative integers.
+        """
+        self._state = BankerState([], [], available)
+        self._lock = threading.Lock()
+        self._waiters = deque() # _Waiter objects in arrival order
+        self.grants = 0
+        self.waits = 0
+        self.timeouts = 0
+
+    @property
+    def num_resources(self):
+        return self._state.num_resources
+
+    @property
+    def available(self):
+        """Copy of the currently free instances of each resource."""
+        with self._lock:
+            return self._state.available
+
+    def register(self, max_claim):
+        """
+        Declares a new worker and its maximum claim.
+
+        Args:
+            max_claim (list[int]): Most instances of each resource the worker will ever hold at once.
+
+        Returns:
+            ResourceClaim: Handle used to acquire and release resources.
+
+        Raises:
+            ValueError: If the claim is malformed or exceeds the pool.
+        """
+        with self._lock:
+            pid = self._state.add_process(max_claim)
+        if pid is None:
+            # A process holding nothing can only make the state unsafe if its claim
+            # exceeds the pool, since every other process can still finish first.
+            raise ValueError(f"Max claim {list(max_claim)} exceeds the resource pool.")
+        return ResourceClaim(self, pid, list(max_claim))
+
+    def stats(self):
+        """
+        Returns the manager's counters as a dict.
+        """
+        with self._lock:
+            return {
+                "processes": len(self._state.processes),
+                "available": self._state.available,
+                "waiting": len(self._waiters),
+                "grants": self.grants,
+                "waits": self.waits,
+                "timeouts": self.timeouts,
+                "full_checks": self._state.full_checks,
+                "fast_path_grants": self._state.fast_path_grants,
+            }
+
+    # --- Internals (ResourceClaim calls these) ---
+
+    def _try_acquire(self, pid, vector, notify):
+        """
+        Grants the request now or, if `notify` is given, queues a waiter for it.
+
+        Returns:
+            bool | _Waiter: True if granted now, False if refused and not queued,
+            otherwise the queued waiter; `notify` is called once it is decided.
+        """
+        with self._lock:
+            if self._state.request(pid, vector):
+                self.grants += 1
+                return True
+            if notify is None:
+                return False
+            waiter = _Waiter(pid, list(vector), notify, self._state.last_blocked)
+            self._waiters.append(waiter)
+            self.waits += 1
+            return waiter
+
+    def _serve_waiters(self):
+        """
+        Grants queued requests, oldest first, after the state became less constrained.
+        Caller holds the lock. Returns the waiters to notify once it is released.
+        """
+        if not self._waiters:
+            return []
+        state = self._state
+        available = state.available
+        woken = []
+        for waiter in self._waiters:
+            if waiter.result is not None: # Failed by _remove_process()
+                woken.append(waiter)
+                continue
+            # Waiters the releases cannot have helped are skipped without a full check.
+            if any(amount > free for amount, free in zip(waiter.vector, available)):
+                continue
+            if waiter.blocked is not None and state.still_refused(waiter.blocked, waiter.pid, waiter.vector):
+                continue
+            try:
+                result = state.request(waiter.pid, waiter.vector)
+            except (KeyError, ValueError) as error:
+                result = error
+            if result is False:
+                waiter.blocked = state.last_blocked
+                continue
+            waiter.result = result
+            woken.append(waiter)
+            if result is True:
+                self.grants += 1
+                available = state.available
+        if woken:
+            self._waiters = deque(waiter for waiter in self._waiters if waiter.result is None)
+        return woken
+
+    def _remove_process(self, pid):
+        """
+        Removes a process and fails its queued requests. Caller holds the lock.
+        (A queued request that exceeds Available would otherwise be skipped by
+        _serve_waiters() before request() could report the unknown process.)
+        """
+        allocation = self._state.remove_process(pid)
+        for waiter in self._waiters:
+            if waiter.pid == pid:
+                waiter.result = KeyError(f"The claim of P{pid} was closed.")
+        return allocation
+
+    def _change(self, operation, *args):
+        """
+        Applies a release or process removal and wakes the waiters it satisfies.
+        """
+        with self._lock:
+            result = operation(*args)
+            woken = self._serve_waiters()
+        for waiter in woken:
+            waiter.notify()
+        return result
+
+    def _abandon(self, waiter):
+        """
+        Removes a waiter that gave up. Returns its result if it was decided meanwhile.
+        """
+        with self._lock:
+            if waiter.result is None:
+                self._waiters.remove(waiter)
+                self.timeouts += 1
+            return waiter.result
+
+
+class ResourceClaim:
+    """
+    A registered worker's handle. Meant to be used by one thread or task at a time.
+    """
+
+    def __init__(self, manager, pid, max_claim):
+        self.manager = manager
+        self.pid = pid
+        self.max_claim = max_claim
+        self.closed = False
+
+    def __repr__(self):
+        return f"ResourceClaim(pid={self.pid}, max_claim={self.max_claim})"
+
+    @property
+    def held(self):
+        """Copy of the resources this claim currently holds."""
+        with self.manager._lock:
+            return self.manager._state.allocation(self.pid)
+
+    def acquire(self, vector, timeout=None):
+        """
+        Blocks until `vector` can be granted safely.
+
+        Args:
+            vector (list[int]): Instances of each resource to acquire.
+            timeout (float | None): Seconds to wait; None waits forever, 0 does not wait.
+
+        Returns:
+            bool: True if acquired, False on timeout.
+
+        Raises:
+            KeyError: If the claim was closed.
+            ValueError: If the request is malformed or exceeds the remaining claim.
+        """
+        signal = None
+        if timeout is None or timeout > 0:
+            signal = threading.Lock()
+            signal.acquire() # Released by the thread that decides the request
+        waiter = self.manager._try_acquire(self.pid, vector, signal and signal.release)
+        if waiter is True or waiter is False:
+            return waiter
+        if not signal.acquire(timeout=-1 if timeout is None else timeout):
+            if self.manager._abandon(waiter) is None:
+                return False
+        if isinstance(waiter.result, Exception):
+            raise waiter.result
+        return True
+
+    async def acquire_async(self, vector, timeout=None):
+        """
+        Asyncio version of acquire(): waits without blocking the event loop.
+
+        Cancelling the waiting task withdraws the request; resources granted
+        at the same moment are released again.
+        """
+        notify = future = None
+        if timeout is None or timeout > 0:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            notify = lambda: loop.call_soon_threadsafe(_resolve, future)
+        waiter = self.manager._try_acquire(self.pid, vector, notify)
+        if waiter is True or waiter is False:
+            return waiter
+        try:
+            await asyncio.wait_for(future, timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as error:
+            result = self.manager._abandon(waiter)
+            if result is None:
+                if isinstance(error, asyncio.CancelledError):
+                    raise
+                return False
+            if isinstance(error, asyncio.CancelledError):
+                if result is True:
+                    self.release(vector)
+                raise
+        if isinstance(waiter.result, Exception):
+            raise waiter.result
+        return True
+
+    def release(self, vector=None):
+        """
+        Returns resources to the pool and wakes the waiters that can now proceed.
+
+        Args:
+            vector (list[int] | None): Instances to release; None releases everything held.
+
+        Raises:
+            ValueError: If the claim does not hold the resources.
+        """
+        manager = self.manager
+        if vector is None:
+            with manager._lock:
+                vector = manager._state.allocation(self.pid)
+        manager._change(manager._state.release, self.pid, vector)
+
+    def hold(self, vector, timeout=None):
+        """
+        Context manager that acquires `vector` on entry and releases it on exit.
+
+        Raises:
+            TimeoutError: If the resources could not be acquired within `timeout`.
+        """
+        return _Hold(self, vector, timeout)
+
+    def close(self):
+        """
+        Unregisters the worker, releasing everything it holds. Safe to call twice.
+        """
+        if not self.closed:
+            self.closed = True
+            self.manager._change(self.manager._remove_process, self.pid)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class _Hold:
+    def __init__(self, claim, vector, timeout):
+        self.claim = claim
+        self.vector = list(vector)
+        self.timeout = timeout
+
+    def __enter__(self):
+        if not self.claim.acquire(self.vector, self.timeout):
+            raise TimeoutError(f"P{self.claim.pid} could not acquire {self.vector} within {self.timeout}s.")
+        return self.claim
+
+    def __exit__(self, *exc_info):
+        self.claim.release(self.vector)
+
+    async def __aenter__(self):
+        if not await self.claim.acquire_async(self.vector, self.timeout):
+            raise TimeoutError(f"P{self.claim.pid} could not acquire {self.vector} within {self.timeout}s.")
+        return self.claim
+
+    async def __aexit__(self, *exc_info):
+        self.claim.release(self.vector)
+
+
+def _resolve(future):
+    if not future.done():
+        future.set_result(None)
@@ -0,0 +1,190 @@
+"""
+Counting, enumeration and ranking of all safe sequences of a state.
+
+The Work vector after some processes finished depends only on *which* processes
+finished, not on their order, so the search is keyed by the set of finished
+processes (a bitmask). Two facts keep it small:
+
+* Finishing a runnable process only grows Work, so from a safe state every
+  reachable state is safe as well: the search never meets a dead end once the
+  initial state passed the safety check.
+* A process that is runnable stays runnable. When every remaining process is
+  runnable, any order of them is safe and they contribute k! sequences at once.
+
+Example:
+    total = count_safe_sequences(allocation, max_need, available)
+    first_ten = list(itertools.islice(iter_safe_sequences(allocation, max_need, available), 10))
+    cheapest = k_best_safe_sequences(allocation, max_need, available, 3, cost=lambda pid, position: ...)
+"""
+import heapq
+import itertools
+from math import factorial
+from operator import add, le
+
+from banker_logic import compute_need_matrix, iter_safe_sequence
+
+
+def _prepare(allocation, max_need, available):
+    """
+    Returns (num_processes, need_matrix), or (num_processes, None) when the
+    state is unsafe and has no safe sequence at all.
+    """
+    num_processes, num_resources = len(allocation), len(available)
+    need_matrix = compute_need_matrix(allocation, max_need, num_processes, num_resources)
+    finished = sum(1 for _ in iter_safe_sequence(allocation, need_matrix, available, num_processes, num_resources))
+    return num_processes, (need_matrix if finished == num_processes else None)
+
+
+def _split_runnable(candidates, need_matrix, work_vector):
+    """
+    Splits process ids into (runnable, blocked) lists for the given Work vector.
+    """
+    runnable, blocked = [], []
+    for pid in candidates:
+        (runnable if all(map(le, need_matrix[pid], work_vector)) else blocked).append(pid)
+    return runnable, blocked
+
+
+def count_safe_sequences(allocation, max_need, available):
+    """
+    Counts the distinct safe sequences of a state.
+
+    Args:
+        allocation (list[list[int]]): Currently allocated resources per process.
+        max_need (list[list[int]]): Maximum resources each process may claim.
+        available (list[int]): Currently available resources.
+
+    Returns:
+        int: Number of orders in which every process can finish (0 if unsafe).
+    """
+    num_processes, need_matrix = _prepare(allocation, max_need, available)
+    if need_matrix is None:
+        return 0
+    counts = {} # finished-set bitmask -> number of safe completions
+    runnable, blocked = _split_runnable(range(num_processes), need_matrix, available)
+    # Explicit stack so that long forced chains do not hit the recursion limit.
+    # Frame: [mask, work, runnable, blocked, next runnable index, partial total]
+    stack = [[0, list(available), runnable, blocked, 0, 0]]
+    while stack:
+        frame = stack[-1]
+        mask, work_vector, runnable, blocked, index, total = frame
+        if blocked:
+            while index < len(runnable):
+                child_count = counts.get(mask | (1 << runnable[index]))
+                if child_count is None:
+                    break
+                total += child_count
+                index += 1
+            if index < len(runnable):
+                frame[4], frame[5] = index, total
+                pid = runnable[index]
+                child_work = list(map(add, work_vector, allocation[pid]))
+                unblocked, still_blocked = _split_runnable(blocked, need_matrix, child_work)
+                child_runnable = [other for other in runnable if other != pid] + unblocked
+                stack.append([mask | (1 << pid), child_work, child_runnable, still_blocked, 0, 0])
+                continue
+        else:
+            # Every remaining process can run: each of their orders is safe.
+            total = factorial(len(runnable))
+        counts[mask] = total
+        stack.pop()
+    return counts[0]
+
+
+def iter_safe_sequences(allocation, max_need, available):
+    """
+    Streams every safe sequence in lexicographic order of process ids.
+
+    Args:
+        allocation (list[list[int]]): Currently allocated resources per process.
+        max_need (list[list[int]]): Maximum resources each process may claim.
+        available (list[int]): Currently available resources.
+
+    Yields:
+        list[int]: One safe sequence at a time (nothing if the state is unsafe).
+    """
+    num_processes, need_matrix = _prepare(allocation, max_need, available)
+    if need_matrix is None:
+        return
+    runnable, blocked = _split_runnable(range(num_processes), need_matrix, available)
+    prefix = [] # One process id per frame below the root
+    # Frame: [work, sorted runnable, blocked, next runnable index]
+    stack = [[list(available), runnable, blocked, 0]]
+    while stack:
+        frame = stack[-1]
+        work_vector, runnable, blocked, index = frame
+        if blocked and index < len(runnable):
+            frame[3] = index + 1
+            pid = runnable[index]
+            child_work = list(map(add, work_vector, allocation[pid]))
+            unblocked, still_blocked = _split_runnable(blocked, need_matrix, child_work)
+            child_runnable = sorted([other for other in runnable if other != pid] + unblocked)
+            prefix.append(pid)
+            stack.append([child_work, child_runnable, still_blocked, 0])
+            continue
+        if not blocked:
+            # permutations() of a sorted list comes out in lexicographic order.
+            for tail in itertools.permutations(runnable):
+                yield prefix + list(tail)
+        stack.pop()
+        if stack:
+            prefix.pop()
+
+
+def k_best_safe_sequences(allocation, max_need, available, k, cost):
+    """
+    Finds the k cheapest safe sequences, where a sequence costs the sum of
+    cost(pid, position) over its steps.
+
+    The search is A* over partial sequences. Its heuristic charges each
+    unfinished process its cheapest remaining position, which never overestimates,
+    so complete sequences leave the queue in order of cost.
+
+    Args:
+        allocation (list[list[int]]): Currently allocated resources per process.
+        max_need (list[list[int]]): Maximum resources each process may claim.
+        available (list[int]): Currently available resources.
+        k (int): Number of sequences wanted.
+        cost (Callable[[int, int], float]): Non-negative cost of running `pid`
+            as step `position` (0-based).
+
+    Returns:
+        list[tuple[float, list[int]]]: Up to k (cost, sequence) pairs, cheapest
+        first. Among sequences of equal cost the choice is deterministic but not
+        lexicographic.
+
+    Raises:
+        ValueError: If a cost is negative.
+    """
+    num_processes, need_matrix = _prepare(allocation, max_need, available)
+    if need_matrix is None or k <= 0:
+        return []
+    costs = [[cost(pid, position) for position in range(num_processes)] for pid in range(num_processes)]
+    if any(value < 0 for row in costs for value in row):
+        raise ValueError("Sequence costs must be non-negative.")
+    # cheapest[pid][position]: lowest cost of running pid at `position` or later
+    cheapest = []
+    for row in costs:
+        suffix_min = list(itertools.accumulate(reversed(row), min))
+        suffix_min.reverse()
+        cheapest.append(suffix_min + [0])
+
+    best = []
+    # Entry: (cost so far + heuristic, -length, sequence, cost so far, finished bitmask, work).
+    # Among equal estimates longer sequences go first, so ties are explored depth-first.
+    queue = [(sum(row[0] for row in cheapest), 0, (), 0, 0, tuple(available))]
+    while queue and len(best) < k:
+        _, _, sequence, spent, mask, work_vector = heapq.heappop(queue)
+        position = len(sequence)
+        if position == num_processes:
+            best.append((spent, list(sequence)))
+            continue
+        remaining = [pid for pid in range(num_processes) if not mask >> pid & 1]
+        for pid in remaining:
+            if not all(map(le, need_matrix[pid], work_vector)):
+                continue
+            child_spent = spent + costs[pid][position]
+            estimate = sum(cheapest[other][position + 1] for other in remaining if other != pid)
+            heapq.heappush(queue, (child_spent + estimate, -position - 1, sequence + (pid,), child_spent,
+                                   mask | (1 << pid), tuple(map(add, work_vector, allocation[pid]))))
+    return best
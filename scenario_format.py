@@ -0,0 +1,332 @@
+"""
+Binary scenario files: an uncompressed, .npz-compatible archive of fixed-width integers.
+
+A scenario file is a ZIP archive whose members are stored without compression:
+
+    allocation.npy   n x m   little-endian int64 (or int32), C order
+    max_need.npy     n x m
+    available.npy    m
+
+Each member is a standard .npy array, so numpy.load() reads these files as
+usual. The archive comment holds a small JSON header,
+
+    {"format": "banker-scenario", "version": 1, "processes": n, "resources": m, "id": ...}
+
+and the data of every member starts on a 64-byte boundary of the file (the
+gap is filled with a ZIP padding extra field). load_scenario() therefore
+memory-maps the file once and returns MappedMatrix objects whose rows are
+memoryview slices of the mapping: opening a 100k x 500 scenario parses three
+short headers and copies nothing, and the safety engine reads the values
+straight from the mapped pages.
+
+Archives written by numpy.savez() with the same member names (or "max"
+instead of "max_need") load too; compressed ones are read into memory instead
+of being mapped.
+
+Example:
+    save_scenario("big.npz", allocation, max_need, available)
+    scenario = load_scenario("big.npz")
+    run_bankers_algorithm_logic(scenario["allocation"], scenario["max_need"], scenario["available"], n, m)
+"""
+import ast
+import json
+import mmap
+import struct
+import sys
+import zipfile
+from array import array
+
+SCENARIO_FILE_EXTENSION = ".npz"
+SCENARIO_FILE_FORMAT = "banker-scenario"
+SCENARIO_FILE_VERSION = 1
+DEFAULT_DTYPE = "<i8"
+
+_ALIGNMENT = 64
+_PADDING_EXTRA_ID = 0xD935 # Extra field id zipalign uses for alignment padding
+_NPY_MAGIC = b"\x93NUMPY"
+_LOCAL_HEADER = struct.Struct("<4s5H3L2H")
+_MAX_NAMES = ("max_need", "max")
+# .npy dtype descriptions that can be mapped, with the matching array/memoryview type codes.
+_TYPECODES = {"|i1": "b", "<i2": "h", "<i4": "i", "<i8": "q", "|u1": "B", "<u2": "H", "<u4": "I", "<u8": "Q"}
+_WRITE_DTYPES = ("<i4", "<i8")
+
+
+class MappedMatrix:
+    """
+    Read-only n x m integer matrix over a flat buffer (usually a memory-mapped file).
+
+    Indexing returns a row as a memoryview slice of the buffer, which supports
+    len(), indexing and iteration like a list of ints, so the safety engine
+    accepts a MappedMatrix wherever it takes a list of lists. NumPy gets a
+    zero-copy view through np.asarray().
+    """
+
+    def __init__(self, flat, num_rows, num_cols, dtype):
+        """
+        Args:
+            flat (memoryview): num_rows * num_cols items, already cast to the item type.
+            num_rows (int): Number of rows (n).
+            num_cols (int): Number of columns (m).
+            dtype (str): .npy dtype description of the items (e.g. "<i8").
+        """
+        self.buffer = flat
+        self.shape = (num_rows, num_cols)
+        self.dtype = dtype
+        self._rows = [flat[i * num_cols:(i + 1) * num_cols] for i in range(num_rows)]
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __getitem__(self, index):
+        return self._rows[index]
+
+    def __iter__(self):
+        return iter(self._rows)
+
+    def __repr__(self):
+        return f"MappedMatrix(shape={self.shape}, dtype='{self.dtype}')"
+
+    def tolist(self):
+        """Copies the matrix into a list of lists."""
+        return [row.tolist() for row in self._rows]
+
+    def __array__(self, dtype=None, copy=None):
+        import numpy as np
+        values = np.frombuffer(self.buffer, dtype=self.dtype).reshape(self.shape)
+        if dtype is not None and values.dtype != dtype:
+            return values.astype(dtype)
+        return values.copy() if copy else values
+
+
+def _npy_header(dtype, shape):
+    """
+    Returns the .npy header for a C-order array, padded to a multiple of 64 bytes.
+    """
+    shape_text = f"({shape[0]},)" if len(shape) == 1 else f"({', '.join(map(str, shape))})"
+    header = f"{{'descr': '{dtype}', 'fortran_order': False, 'shape': {shape_text}, }}".encode("latin1")
+    if len(header) + 11 < 65536:
+        prefix_length, version = 10, b"\x01\x00"
+    else:
+        prefix_length, version = 12, b"\x02\x00"
+    padding = -(prefix_length + len(header) + 1) % _ALIGNMENT
+    header += b" " * padding + b"\n"
+    length = struct.pack("<H" if prefix_length == 10 else "<I", len(header))
+    return _NPY_MAGIC + version + length + header
+
+
+def _parse_npy_header(data, member_name):
+    """
+    Parses a .npy header at the start of `data` (a bytes-like object).
+
+    Returns:
+        tuple: (dtype, shape, header_length)
+    """
+    if bytes(data[:6]) != _NPY_MAGIC:
+        raise ValueError(f"{member_name} is not a .npy array.")
+    major_version = data[6]
+    if major_version == 1:
+        header_length, = struct.unpack("<H", bytes(data[8:10]))
+        start = 10
+    elif major_version in (2, 3):
+        header_length, = struct.unpack("<I", bytes(data[8:12]))
+        start = 12
+    else:
+        raise ValueError(f"{member_name} uses unsupported .npy version {major_version}.")
+    try:
+        header = ast.literal_eval(bytes(data[start:start + header_length]).decode("latin1"))
+        dtype, fortran_order, shape = header["descr"], header["fortran_order"], tuple(header["shape"])
+    except (ValueError, SyntaxError, KeyError, TypeError):
+        raise ValueError(f"{member_name} has a malformed .npy header.") from None
+    if dtype not in _TYPECODES:
+        raise ValueError(f"{member_name} must hold little-endian integers, not '{dtype}'.")
+    if fortran_order and len(shape) > 1:
+        raise ValueError(f"{member_name} must be stored in C order.")
+    return dtype, shape, start + header_length
+
+
+def _iter_row_bytes(matrix, dtype):
+    """
+    Yields the values of `matrix` (rows of ints, a MappedMatrix or a NumPy array) as raw bytes.
+    """
+    typecode = _TYPECODES[dtype]
+    if isinstance(matrix, MappedMatrix) and matrix.dtype == dtype and sys.byteorder == "little":
+        yield matrix.buffer.cast("B")
+        return
+    if hasattr(matrix, "__array__") and not isinstance(matrix, (list, tuple, MappedMatrix)):
+        import numpy as np
+        values = np.ascontiguousarray(np.asarray(matrix), dtype=np.dtype(dtype))
+        flat = memoryview(values.reshape(-1)).cast("B")
+        step = 1 << 24
+        for start in range(0, len(flat), step):
+            yield flat[start:start + step]
+        return
+    for row in matrix:
+        packed = array(typecode, row)
+        if sys.byteorder == "big":
+            packed.byteswap()
+        yield packed.tobytes()
+
+
+def _write_member(archive, offset, name, matrix, shape, dtype):
+    """
+    Writes one .npy member with its data aligned to _ALIGNMENT bytes in the file.
+
+    Returns:
+        int: The file offset just past the member.
+    """
+    typecode = _TYPECODES[dtype]
+    header = _npy_header(dtype, shape)
+    data_size = array(typecode).itemsize
+    for dimension in shape:
+        data_size *= dimension
+    member = zipfile.ZipInfo(f"{name}.npy", date_time=(1980, 1, 1, 0, 0, 0))
+    member.compress_type = zipfile.ZIP_STORED
+    member.file_size = len(header) + data_size
+    member.CRC = member.compress_size = 0 # Filled in by ZipFile.open() once the data is written
+    zip64 = member.file_size * 1.05 > zipfile.ZIP64_LIMIT # The same test ZipFile.open() applies
+    member.extra = struct.pack("<HH", _PADDING_EXTRA_ID, 0)
+    padding = -(offset + len(member.FileHeader(zip64))) % _ALIGNMENT
+    member.extra = struct.pack("<HH", _PADDING_EXTRA_ID, padding) + bytes(padding)
+    local_header_size = len(member.FileHeader(zip64))
+    written = 0
+    with archive.open(member, "w", force_zip64=zip64) as stream:
+        stream.write(header)
+        for chunk in _iter_row_bytes(matrix, dtype):
+            stream.write(chunk)
+            written += len(chunk)
+    if written != data_size:
+        raise ValueError(f"{name} does not have the shape {shape}.")
+    return offset + local_header_size + member.file_size
+
+
+def save_scenario(path, allocation, max_need, available, scenario_id=None, dtype=DEFAULT_DTYPE):
+    """
+    Writes a scenario as a binary scenario file.
+
+    Args:
+        path (str): Destination file (conventionally *.npz).
+        allocation (list[list[int]] | MappedMatrix): n x m Allocation matrix.
+        max_need (list[list[int]] | MappedMatrix): n x m Max Need matrix.
+        available (list[int]): Available vector (m entries).
+        scenario_id (str | int | None): Optional id stored in the header.
+        dtype (str): "<i8" (default) or "<i4" for half the size when every value fits.
+
+    Raises:
+        ValueError: If the matrices are ragged or hold values that are not
+            integers fitting `dtype`.
+    """
+    if dtype not in _WRITE_DTYPES:
+        raise ValueError(f"Unknown dtype '{dtype}'. Expected one of {_WRITE_DTYPES}.")
+    num_processes, num_resources = len(allocation), len(available)
+    if len(max_need) != num_processes:
+        raise ValueError(f"Allocation has {num_processes} rows but Max Need has {len(max_need)}.")
+    for matrix in (allocation, max_need):
+        if isinstance(matrix, (list, tuple)) and any(len(row) != num_resources for row in matrix):
+            raise ValueError(f"Every matrix row must have {num_resources} columns.")
+    header = {"format": SCENARIO_FILE_FORMAT, "version": SCENARIO_FILE_VERSION,
+              "processes": num_processes, "resources": num_resources}
+    if scenario_id is not None:
+        header["id"] = scenario_id
+    try:
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_STORED, allowZip64=True) as archive:
+            archive.comment = json.dumps(header, separators=(",", ":")).encode()
+            offset = 0
+            for name, matrix, shape in (("allocation", allocation, (num_processes, num_resources)),
+                                        ("max_need", max_need, (num_processes, num_resources)),
+                                        ("available", [available], (num_resources,))):
+                offset = _write_member(archive, offset, name, matrix, shape, dtype)
+    except (TypeError, OverflowError):
+        raise ValueError(f"All matrix fields must contain integers that fit '{dtype}'.") from None
+
+
+def _read_header(archive):
+    if not archive.comment:
+        return {}
+    try:
+        header = json.loads(archive.comment)
+    except ValueError:
+        return {} # Some other tool's comment: treat the file as a plain .npz
+    if not isinstance(header, dict) or header.get("format") != SCENARIO_FILE_FORMAT:
+        return {}
+    if header.get("version", SCENARIO_FILE_VERSION) > SCENARIO_FILE_VERSION:
+        raise ValueError(f"Scenario file version {header['version']} is newer than this program supports.")
+    return header
+
+
+def _member_values(archive, member, mapping):
+    """
+    Returns (flat memoryview, dtype, shape) for one member, mapped when possible.
+    """
+    if mapping is not None and member.compress_type == zipfile.ZIP_STORED:
+        fields = _LOCAL_HEADER.unpack(mapping[member.header_offset:member.header_offset + _LOCAL_HEADER.size])
+        start = member.header_offset + _LOCAL_HEADER.size + fields[9] + fields[10]
+        data = memoryview(mapping)[start:start + member.file_size]
+    else:
+        data = memoryview(archive.read(member))
+    dtype, shape, header_length = _parse_npy_header(data, member.filename)
+    typecode = _TYPECODES[dtype]
+    data = data[header_length:]
+    itemsize = array(typecode).itemsize
+    count = 1
+    for dimension in shape:
+        count *= dimension
+    if len(data) < count * itemsize:
+        raise ValueError(f"{member.filename} is truncated.")
+    data = data[:count * itemsize]
+    if sys.byteorder == "big" and itemsize > 1:
+        swapped = array(typecode, data.tobytes())
+        swapped.byteswap()
+        data = memoryview(swapped).cast("B")
+    return data.cast(typecode), dtype, shape
+
+
+def load_scenario(path, use_mmap=True):
+    """
+    Opens a binary scenario file.
+
+    Args:
+        path (str): File written by save_scenario() or numpy.savez().
+        use_mmap (bool): Map the file instead of reading it into memory.
+
+    Returns:
+        dict: {"allocation": MappedMatrix, "max_need": MappedMatrix,
+        "available": list[int]} plus "id" if the file stores one.
+
+    Raises:
+        ValueError: If the file is not a valid scenario file.
+    """
+    try:
+        archive = zipfile.ZipFile(path)
+    except zipfile.BadZipFile as error:
+        raise ValueError(f"Not a scenario file: {error}.") from None
+    with archive, open(path, "rb") as raw_file:
+        header = _read_header(archive)
+        members = {name[:-4]: archive.getinfo(name) for name in archive.namelist() if name.endswith(".npy")}
+        max_name = next((name for name in _MAX_NAMES if name in members), None)
+        missing = [name for name, present in (("allocation", "allocation" in members), ("max_need", max_name),
+                                              ("available", "available" in members)) if not present]
+        if missing:
+            raise ValueError(f"Scenario file is missing: {', '.join(missing)}.")
+        mapping = None
+        if use_mmap and all(members[name].compress_type == zipfile.ZIP_STORED
+                            for name in ("allocation", max_name, "available")):
+            mapping = mmap.mmap(raw_file.fileno(), 0, access=mmap.ACCESS_READ)
+        values = {name: _member_values(archive, members[member_name], mapping)
+                  for name, member_name in (("allocation", "allocation"), ("max_need", max_name),
+                                            ("available", "available"))}
+
+    available, _, available_shape = values["available"]
+    if len(available_shape) != 1:
+        raise ValueError("available.npy must be a vector.")
+    num_resources = available_shape[0]
+    scenario = {"available": available.tolist()}
+    for name in ("allocation", "max_need"):
+        flat, dtype, shape = values[name]
+        if len(shape) != 2 or shape[1] != num_resources:
+            raise ValueError(f"{name} must be an n x {num_resources} matrix, not {shape}.")
+        scenario[name] = MappedMatrix(flat, shape[0], shape[1], dtype)
+    if len(scenario["allocation"]) != len(scenario["max_need"]):
+        raise ValueError("allocation and max_need have different numbers of rows.")
+    if "id" in header:
+        scenario["id"] = header["id"]
+    return scenario
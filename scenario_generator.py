@@ -0,0 +1,235 @@
+"""
+Seeded workload generator for Banker's Algorithm scenarios.
+
+Produces (allocation, max_need, available) triples of any size directly as
+lists of integer rows, without touching the GUI. Scenarios are reproducible
+from a seed and can be forced to be safe (optionally along a chosen safe
+sequence) or unsafe.
+
+Matrices are drawn in bulk (random bytes mapped through a lookup table) and
+combined row by row with map(), so a million-cell matrix takes a fraction of a
+second in pure Python.
+
+Usage:
+    python scenario_generator.py --processes 200 --resources 8 --verdict unsafe --count 50 > scenarios.jsonl
+"""
+import argparse
+import functools
+import json
+import random
+import sys
+from array import array
+from operator import add
+
+# "any" draws every value independently (the verdict falls where it may),
+# "safe" and "unsafe" build the state so the safety check has that outcome.
+VERDICTS = ("any", "safe", "unsafe")
+
+DEFAULT_ALLOCATION_RANGE = (0, 5)
+DEFAULT_EXTRA_NEED_RANGE = (0, 5)
+DEFAULT_AVAILABLE_RANGE = (3, 10)
+
+# Random values are drawn as 16-bit indices into a table of this many entries.
+_TABLE_SIZE = 1 << 16
+
+
+def _check_range(name, value_range):
+    low, high = value_range
+    if low < 0 or high < low:
+        raise ValueError(f"{name} must be a (low, high) pair with 0 <= low <= high, got {value_range!r}.")
+    return low, high
+
+
+@functools.lru_cache(maxsize=16)
+def _value_table(value_range, density):
+    """
+    Builds a lookup table of _TABLE_SIZE entries: a 1 - density share of zeros and
+    the rest spread evenly over `value_range`, so that indexing it with uniform
+    16-bit random numbers draws from the requested distribution.
+    """
+    low, high = value_range
+    span = high - low + 1
+    zeros = round(_TABLE_SIZE * (1.0 - density))
+    rest = _TABLE_SIZE - zeros
+    return tuple([0] * zeros + [low + (k * span) // rest for k in range(rest)])
+
+
+def _draw_values(rng, count, value_range, density):
+    """
+    Draws `count` integers uniformly from `value_range`; each one is replaced by
+    0 with probability 1 - density.
+    """
+    low, high = value_range
+    if count < _TABLE_SIZE // 16 or high - low + 1 > _TABLE_SIZE * density:
+        # Small draws are not worth building a table for, and very wide ranges
+        # would not stay uniform in one.
+        return [rng.randint(low, high) if rng.random() < density else 0 for _ in range(count)]
+    indices = array("H", rng.randbytes(2 * count))
+    return list(map(_value_table(value_range, density).__getitem__, indices))
+
+
+def _split_rows(values, num_rows, num_cols):
+    return [values[i * num_cols:(i + 1) * num_cols] for i in range(num_rows)]
+
+
+def _fill_finishing_order(allocation, extra_need, work_vector, max_need, order, need_ceiling):
+    """
+    Sets max_need for the processes in `order` so that each can finish with the
+    Work vector left by its predecessors (its need is clamped to that Work).
+
+    Args:
+        need_ceiling (int): Largest value in extra_need. Once every Work entry
+            reaches it no further clamping can happen.
+
+    Returns:
+        list[int]: The Work vector after every process in `order` finished.
+    """
+    for position, pid in enumerate(order):
+        if min(work_vector) >= need_ceiling:
+            break
+        need = list(map(min, extra_need[pid], work_vector))
+        max_need[pid] = list(map(add, allocation[pid], need))
+        work_vector = list(map(add, work_vector, allocation[pid]))
+    else:
+        return work_vector
+    # The rest of the order needs no clamping; only the final Work is still required.
+    remaining = order[position:]
+    for pid in remaining:
+        max_need[pid] = list(map(add, allocation[pid], extra_need[pid]))
+    return [total + sum(column) for total, column in zip(work_vector, zip(*(allocation[pid] for pid in remaining)))]
+
+
+def generate_scenario(num_processes, num_resources, verdict="any", safe_order=None, density=1.0,
+                      allocation_range=DEFAULT_ALLOCATION_RANGE, extra_need_range=DEFAULT_EXTRA_NEED_RANGE,
+                      available_range=DEFAULT_AVAILABLE_RANGE, stuck_processes=1, seed=None, rng=None):
+    """
+    Generates one scenario.
+
+    Args:
+        num_processes (int): Number of processes (n).
+        num_resources (int): Number of resource types (m).
+        verdict (str): "any", "safe" or "unsafe" (see VERDICTS).
+        safe_order (list[int] | None): For verdict="safe", a permutation of the
+            process ids that is guaranteed to be a safe sequence (the checker may
+            still report a different one). Random when None.
+        density (float): Probability that an allocation / extra need entry is non-zero.
+        allocation_range (tuple[int, int]): Inclusive range of allocated values.
+        extra_need_range (tuple[int, int]): Inclusive range of Max - Allocation.
+            In "safe" mode needs are additionally clamped so the order can finish;
+            in "unsafe" mode one need per stuck process is raised above it.
+        available_range (tuple[int, int]): Inclusive range of available values.
+        stuck_processes (int): For verdict="unsafe", how many processes can never finish.
+        seed: Seed for a new random.Random (ignored when `rng` is given).
+        rng (random.Random | None): Random source to draw from.
+
+    Returns:
+        tuple: (allocation, max_need, available) as lists of ints.
+
+    Raises:
+        ValueError: If the sizes, ranges or verdict options are invalid.
+    """
+    if num_processes < 1 or num_resources < 1:
+        raise ValueError("Number of processes and resources must be at least 1.")
+    if verdict not in VERDICTS:
+        raise ValueError(f"Unknown verdict {verdict!r}. Expected one of {', '.join(VERDICTS)}.")
+    if not 0.0 <= density <= 1.0:
+        raise ValueError("Density must be between 0 and 1.")
+    allocation_range = _check_range("allocation_range", allocation_range)
+    extra_need_range = _check_range("extra_need_range", extra_need_range)
+    available_range = _check_range("available_range", available_range)
+    if safe_order is not None:
+        if verdict != "safe":
+            raise ValueError("safe_order can only be used with verdict='safe'.")
+        if sorted(safe_order) != list(range(num_processes)):
+            raise ValueError(f"safe_order must be a permutation of 0..{num_processes - 1}.")
+    if verdict == "unsafe" and not 1 <= stuck_processes <= num_processes:
+        raise ValueError(f"stuck_processes must be between 1 and {num_processes}.")
+    if rng is None:
+        rng = random.Random(seed)
+
+    cells = num_processes * num_resources
+    allocation = _split_rows(_draw_values(rng, cells, allocation_range, density), num_processes, num_resources)
+    extra_need = _split_rows(_draw_values(rng, cells, extra_need_range, density), num_processes, num_resources)
+    available = _draw_values(rng, num_resources, available_range, 1.0)
+
+    if verdict == "any":
+        max_need = [list(map(add, alloc_row, need_row)) for alloc_row, need_row in zip(allocation, extra_need)]
+        return allocation, max_need, available
+
+    max_need = [None] * num_processes
+    if verdict == "safe":
+        if safe_order is None:
+            safe_order = list(range(num_processes))
+            rng.shuffle(safe_order)
+        _fill_finishing_order(allocation, extra_need, list(available), max_need, safe_order,
+                              extra_need_range[1])
+        return allocation, max_need, available
+
+    # Unsafe: every process outside the stuck set finishes in a random order. Each
+    # stuck process then needs more of some resource than the final Work vector
+    # holds, so none of them can ever run.
+    order = list(range(num_processes))
+    rng.shuffle(order)
+    stuck, finishing = order[:stuck_processes], order[stuck_processes:]
+    final_work = _fill_finishing_order(allocation, extra_need, list(available), max_need, finishing,
+                                      extra_need_range[1])
+    for pid in stuck:
+        need = extra_need[pid]
+        j = rng.randrange(num_resources)
+        need[j] = max(need[j], final_work[j] + 1)
+        max_need[pid] = list(map(add, allocation[pid], need))
+    return allocation, max_need, available
+
+
+def generate_scenarios(count, num_processes, num_resources, seed=None, **options):
+    """
+    Yields `count` scenario dicts ({"id", "allocation", "max", "available"}) in the
+    layout read by scenario_io. All options are passed to generate_scenario().
+    """
+    rng = random.Random(seed)
+    for index in range(count):
+        allocation, max_need, available = generate_scenario(num_processes, num_resources, rng=rng, **options)
+        yield {"id": index, "allocation": allocation, "max": max_need, "available": available}
+
+
+def _parse_range(text):
+    low, _, high = text.partition(",")
+    return int(low), int(high or low)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Generate Banker's Algorithm scenarios as JSONL.")
+    parser.add_argument("--processes", type=int, required=True, help="Number of processes per scenario.")
+    parser.add_argument("--resources", type=int, required=True, help="Number of resource types per scenario.")
+    parser.add_argument("--count", type=int, default=1, help="Number of scenarios (default: 1).")
+    parser.add_argument("--verdict", choices=VERDICTS, default="any", help="Target verdict (default: any).")
+    parser.add_argument("--density", type=float, default=1.0, help="Fraction of non-zero entries (default: 1.0).")
+    parser.add_argument("--allocation-range", type=_parse_range, default=DEFAULT_ALLOCATION_RANGE,
+                        metavar="LOW,HIGH", help="Allocated values (default: 0,5).")
+    parser.add_argument("--extra-need-range", type=_parse_range, default=DEFAULT_EXTRA_NEED_RANGE,
+                        metavar="LOW,HIGH", help="Max - Allocation values (default: 0,5).")
+    parser.add_argument("--available-range", type=_parse_range, default=DEFAULT_AVAILABLE_RANGE,
+                        metavar="LOW,HIGH", help="Available values (default: 3,10).")
+    parser.add_argument("--stuck", type=int, default=1, help="Stuck processes in unsafe scenarios (default: 1).")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for reproducible output.")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    scenarios = generate_scenarios(args.count, args.processes, args.resources, seed=args.seed,
+                                   verdict=args.verdict, density=args.density,
+                                   allocation_range=args.allocation_range,
+                                   extra_need_range=args.extra_need_range,
+                                   available_range=args.available_range, stuck_processes=args.stuck)
+    try:
+        for scenario in scenarios:
+            sys.stdout.write(json.dumps(scenario, separators=(",", ":")) + "\n")
+    except ValueError as error:
+        parser.error(str(error))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,207 @@
+"""
+Readers for Banker's Algorithm scenarios stored as JSON, JSONL, CSV or binary .npz files.
+
+A scenario is a mapping with the keys "allocation", "max" (or "max_need") and
+"available", plus an optional "id" (or "name"). Every reader is a generator,
+so large JSONL and CSV inputs are streamed one scenario at a time.
+
+CSV layout (one row per matrix row, grouped by scenario):
+
+    scenario,matrix,process,R0,R1,R2
+    s1,allocation,0,0,1,0
+    s1,max,0,7,5,3
+    s1,available,,3,3,2
+
+`matrix` is one of "allocation", "max" or "available"; `process` is left empty
+for the available vector.
+
+A .npz file holds one scenario in the binary format of scenario_format.py; it
+is memory-mapped rather than parsed, so it suits very large matrices.
+"""
+import csv
+import itertools
+import json
+import os
+import sys
+
+from scenario_format import load_scenario
+
+SCENARIO_FORMATS = ("json", "jsonl", "csv", "npz")
+
+_EXTENSION_FORMATS = {".json": "json", ".jsonl": "jsonl", ".ndjson": "jsonl", ".csv": "csv", ".npz": "npz"}
+
+
+def normalize_scenario(raw_scenario, default_id):
+    """
+    Converts a raw scenario mapping into {"id", "allocation", "max_need", "available"}.
+
+    Raises:
+        ValueError: If a required matrix is missing.
+    """
+    if not isinstance(raw_scenario, dict):
+        raise ValueError("Scenario must be a JSON object.")
+    max_need = raw_scenario.get("max", raw_scenario.get("max_need"))
+    missing = [key for key, value in (("allocation", raw_scenario.get("allocation")), ("max", max_need),
+                                      ("available", raw_scenario.get("available"))) if value is None]
+    if missing:
+        raise ValueError(f"Scenario is missing: {', '.join(missing)}.")
+    return {
+        "id": raw_scenario.get("id", raw_scenario.get("name", default_id)),
+        "allocation": raw_scenario["allocation"],
+        "max_need": max_need,
+        "available": raw_scenario["available"],
+    }
+
+
+def _iter_json(lines):
+    document = json.loads("".join(lines))
+    if isinstance(document, dict) and "scenarios" in document:
+        document = document["scenarios"]
+    if isinstance(document, dict):
+        document = [document]
+    yield from document
+
+
+def _iter_jsonl(lines):
+    for line_number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as error:
+            # Report the bad line but keep streaming the rest of the file.
+            yield ValueError(f"line {line_number}: {error}")
+
+
+def _iter_csv(lines):
+    reader = csv.reader(lines)
+    header = next(reader, None)
+    if header is None:
+        return
+    if [column.strip().lower() for column in header[:3]] != ["scenario", "matrix", "process"]:
+        raise ValueError("CSV header must start with: scenario,matrix,process")
+    current_id = None
+    current = None
+    for row in reader:
+        if not row or not any(cell.strip() for cell in row):
+            continue
+        scenario_id, matrix_name = row[0].strip(), row[1].strip().lower()
+        values = [int(cell) for cell in row[3:] if cell.strip() != ""]
+        if scenario_id != current_id:
+            if current is not None:
+                yield current
+            current_id = scenario_id
+            current = {"id": scenario_id, "allocation": [], "max": [], "available": None}
+        if matrix_name == "available":
+            current["available"] = values
+        elif matrix_name in ("allocation", "max", "max_need"):
+            rows = current["max" if matrix_name == "max_need" else matrix_name]
+            process_index = int(row[2]) if row[2].strip() else len(rows)
+            if process_index != len(rows):
+                raise ValueError(f"Scenario {scenario_id}: {matrix_name} rows must be listed in process order.")
+            rows.append(values)
+        else:
+            raise ValueError(f"Scenario {scenario_id}: unknown matrix '{row[1]}'.")
+    if current is not None:
+        yield current
+
+
+def detect_format(path):
+    """
+    Guesses the input format from a file extension. Returns None when unknown.
+    """
+    return _EXTENSION_FORMATS.get(os.path.splitext(path)[1].lower())
+
+
+def _sniff_stream(stream):
+    """
+    Guesses the format of an unnamed stream (e.g. stdin) from its first line.
+
+    Returns:
+        tuple: (format, lines) where `lines` still starts with the sniffed line.
+    """
+    first_line = stream.readline()
+    while first_line and not first_line.strip():
+        first_line = stream.readline()
+    stripped = first_line.lstrip()
+    if stripped.startswith("{"):
+        try:
+            json.loads(first_line)
+            input_format = "jsonl"
+        except ValueError:
+            input_format = "json"
+    elif stripped.startswith("["):
+        input_format = "json"
+    else:
+        input_format = "csv"
+    return input_format, itertools.chain([first_line], stream)
+
+
+def iter_raw_scenarios(lines, input_format):
+    """
+    Yields raw scenario mappings from an iterable of text lines (e.g. an open file).
+    """
+    if input_format == "json":
+        return _iter_json(lines)
+    if input_format == "jsonl":
+        return _iter_jsonl(lines)
+    if input_format == "csv":
+        return _iter_csv(lines)
+    raise ValueError(f"Unknown scenario format '{input_format}'. Expected one of {SCENARIO_FORMATS}.")
+
+
+def iter_scenarios(sources, input_format=None):
+    """
+    Streams normalized scenarios from files and/or stdin.
+
+    Args:
+        sources (list[str]): File paths; "-" (or an empty list) reads stdin.
+        input_format (str | None): Force a format instead of detecting it.
+
+    Yields:
+        dict | Exception: A normalized scenario, or the ValueError raised while
+        reading it (so one bad scenario does not stop the stream).
+    """
+    counter = 0
+    for source in sources or ["-"]:
+        if (input_format or (source != "-" and detect_format(source))) == "npz":
+            # One scenario per file, mapped instead of read line by line.
+            try:
+                if source == "-":
+                    raise ValueError("binary scenario files cannot be read from stdin")
+                scenario = normalize_scenario(load_scenario(source), default_id=counter)
+            except ValueError as error:
+                scenario = ValueError(f"{source}: {error}")
+            yield scenario
+            counter += 1
+            continue
+        if source == "-":
+            source_format, lines = input_format, sys.stdin
+            if source_format is None:
+                source_format, lines = _sniff_stream(sys.stdin)
+            stream = None
+        else:
+            source_format = input_format or detect_format(source) or "json"
+            stream = lines = open(source, newline="" if source_format == "csv" else None, encoding="utf-8")
+        try:
+            raw_scenarios = iter_raw_scenarios(lines, source_format)
+            while True:
+                try:
+                    raw_scenario = next(raw_scenarios)
+                except StopIteration:
+                    break
+                except ValueError as error:
+                    # A malformed document or CSV row; the rest of this source is unreadable.
+                    yield ValueError(f"{source}: {error}")
+                    break
+                try:
+                    if isinstance(raw_scenario, Exception):
+                        raise raw_scenario
+                    yield normalize_scenario(raw_scenario, default_id=counter)
+                except ValueError as error:
+                    yield ValueError(f"Scenario {counter}: {error}")
+                counter += 1
+        finally:
+            if stream is not None:
+                stream.close()
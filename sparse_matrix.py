@@ -0,0 +1,378 @@
+"""
+Compressed sparse row (CSR) matrices and a safety check that works on them.
+
+Large systems often have thousands of processes and hundreds of resource types
+while each process only touches a few of them. SparseMatrix stores just the
+nonzero entries (row pointers, column indices and values in flat int64
+arrays), and run_sparse_safety_check() runs the worklist safety check over
+those entries only: Need is derived from the nonzero Max entries of each row,
+only Need entries that exceed Work are queued, and executing a process walks
+its nonzero Allocation entries. Memory and time grow with the number of
+nonzeros instead of n * m.
+
+Since Max Need >= Allocation, every nonzero Allocation entry is also a nonzero
+Max entry, so a row's Need can be computed by walking the two rows together.
+
+Example:
+    allocation = SparseMatrix.from_dict_of_rows((4000, 300), {0: {12: 1}, 7: {3: 2, 250: 1}})
+    max_need = SparseMatrix.from_coo((4000, 300), rows, cols, values)
+    need, _, safe_sequence, is_safe = run_sparse_safety_check(allocation, max_need, available)
+"""
+import bisect
+import heapq
+from array import array
+
+from banker_logic import MAX_VALUE, SAFETY_ORDERS, TRACE_LEVELS, CompactTrace
+
+# Layouts accepted by SparseMatrix.from_json() in scenario files.
+SPARSE_JSON_FORMATS = ("coo", "rows")
+
+
+def _length(value, message):
+    try:
+        return len(value)
+    except TypeError:
+        raise ValueError(message) from None
+
+
+def _check_entry(value, row, col):
+    # Entries are stored in int64 arrays, so the bound is the same as validate_bankers_input()'s.
+    if not isinstance(value, int) or isinstance(value, bool) or not 0 <= value <= MAX_VALUE:
+        raise ValueError(f"Invalid value found at row {row}, column {col}. "
+                         "All matrix values must be non-negative 64-bit integers.")
+
+
+class SparseMatrix:
+    """
+    Immutable n x m matrix of non-negative integers in CSR form.
+
+    Row i's nonzero entries are indices[indptr[i]:indptr[i + 1]] (ascending
+    column numbers) with the matching values in data. Indexing a row
+    (matrix[i]) returns it as a dense list, so a SparseMatrix can be passed
+    where row lookups of a list-of-lists are expected (e.g. CompactTrace).
+    """
+
+    def __init__(self, shape, indptr, indices, data):
+        """
+        Args:
+            shape (tuple[int, int]): (rows, columns).
+            indptr (array): rows + 1 offsets into indices / data.
+            indices (array): Column of every stored entry, ascending within a row.
+            data (array): Value of every stored entry.
+
+        Use the from_* constructors, which validate their input, instead of
+        calling this directly.
+        """
+        self.num_rows, self.num_cols = shape
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+
+    @classmethod
+    def from_coo(cls, shape, rows, cols, values):
+        """
+        Builds a matrix from coordinate lists. Duplicate entries are summed
+        and zeros are dropped.
+
+        Args:
+            shape (tuple[int, int]): (rows, columns).
+            rows (Sequence[int]): Row of every entry.
+            cols (Sequence[int]): Column of every entry.
+            values (Sequence[int]): Non-negative value of every entry.
+
+        Raises:
+            ValueError: If the lists differ in length, an index is out of range
+                or a value is not a non-negative integer.
+        """
+        num_rows, num_cols = shape
+        if not len(rows) == len(cols) == len(values):
+            raise ValueError("COO rows, cols and values must have the same length.")
+        entries = {}
+        for row, col, value in zip(rows, cols, values):
+            if not (0 <= row < num_rows and 0 <= col < num_cols):
+                raise ValueError(f"Entry ({row}, {col}) is outside a {num_rows} x {num_cols} matrix.")
+            _check_entry(value, row, col)
+            if value:
+                total = entries.get((row, col), 0) + value
+                if total > MAX_VALUE:
+                    raise ValueError(f"The entries at row {row}, column {col} add up to more than {MAX_VALUE}.")
+                entries[row, col] = total
+        indptr = array("q", [0]) * (num_rows + 1)
+        indices, data = array("q"), array("q")
+        for (row, col), value in sorted(entries.items()):
+            indptr[row + 1] += 1
+            indices.append(col)
+            data.append(value)
+        for row in range(num_rows):
+            indptr[row + 1] += indptr[row]
+        return cls((num_rows, num_cols), indptr, indices, data)
+
+    @classmethod
+    def from_dict_of_rows(cls, shape, rows):
+        """
+        Builds a matrix from {row: {column: value}}. Missing rows and columns are zero.
+
+        Keys may be ints or numeric strings (as they come out of JSON objects).
+
+        Raises:
+            ValueError: If an index is out of range or a value is invalid.
+        """
+        num_rows, num_cols = shape
+        if not isinstance(rows, dict):
+            raise ValueError("Sparse rows must be given as {row: {column: value}}.")
+        indptr = array("q", [0]) * (num_rows + 1)
+        indices, data = array("q"), array("q")
+        row_entries = {}
+        for row, entries in rows.items():
+            row = int(row)
+            if not 0 <= row < num_rows:
+                raise ValueError(f"Row {row} is outside a {num_rows} x {num_cols} matrix.")
+            if not isinstance(entries, dict):
+                raise ValueError(f"Row {row} must be given as {{column: value}}.")
+            row_entries[row] = sorted((int(col), value) for col, value in entries.items())
+        for row in range(num_rows):
+            for col, value in row_entries.get(row, ()):
+                if not 0 <= col < num_cols:
+                    raise ValueError(f"Entry ({row}, {col}) is outside a {num_rows} x {num_cols} matrix.")
+                _check_entry(value, row, col)
+                if value:
+                    indices.append(col)
+                    data.append(value)
+            indptr[row + 1] = len(indices)
+        return cls((num_rows, num_cols), indptr, indices, data)
+
+    @classmethod
+    def from_dense(cls, matrix, num_cols=None):
+        """
+        Builds a matrix from a list of lists.
+
+        Args:
+            matrix (list[list[int]]): Dense rows.
+            num_cols (int | None): Column count; required when `matrix` has no rows.
+
+        Raises:
+            ValueError: If the rows are ragged or a value is invalid.
+        """
+        num_rows = _length(matrix, "A dense matrix must be a list of rows.")
+        if num_cols is None:
+            num_cols = _length(matrix[0], "Row 0 must be a list of integers.") if num_rows else 0
+        indptr = array("q", [0])
+        indices, data = array("q"), array("q")
+        for row, values in enumerate(matrix):
+            if _length(values, f"Row {row} must be a list of integers.") != num_cols:
+                raise ValueError(f"Row {row} has {len(values)} columns, expected {num_cols}.")
+            for col, value in enumerate(values):
+                if value:
+                    _check_entry(value, row, col)
+                    indices.append(col)
+                    data.append(value)
+                elif value != 0:
+                    _check_entry(value, row, col)
+            indptr.append(len(indices))
+        return cls((num_rows, num_cols), indptr, indices, data)
+
+    @classmethod
+    def from_json(cls, document):
+        """
+        Builds a matrix from its scenario-file form:
+
+            {"format": "coo", "shape": [n, m], "row": [...], "col": [...], "data": [...]}
+            {"format": "rows", "shape": [n, m], "rows": {"0": {"3": 2}, ...}}
+
+        Raises:
+            ValueError: If the document is not one of these layouts.
+        """
+        layout = document.get("format")
+        if layout not in SPARSE_JSON_FORMATS:
+            raise ValueError(f"Unknown sparse matrix format {layout!r}. Expected one of {SPARSE_JSON_FORMATS}.")
+        try:
+            num_rows, num_cols = document["shape"]
+            if not all(isinstance(size, int) and not isinstance(size, bool) and size >= 0
+                       for size in (num_rows, num_cols)):
+                raise ValueError(f"Malformed sparse matrix ({layout}): the shape must be two non-negative integers.")
+            if layout == "coo":
+                return cls.from_coo((num_rows, num_cols), document["row"], document["col"], document["data"])
+            return cls.from_dict_of_rows((num_rows, num_cols), document["rows"])
+        except (KeyError, TypeError, AttributeError, OverflowError) as error:
+            raise ValueError(f"Malformed sparse matrix ({layout}): {error}") from None
+
+    @property
+    def shape(self):
+        return self.num_rows, self.num_cols
+
+    @property
+    def nnz(self):
+        """Number of stored (nonzero) entries."""
+        return len(self.data)
+
+    def row(self, i):
+        """
+        Returns (column indices, values) of row i's nonzero entries.
+        """
+        start, stop = self.indptr[i], self.indptr[i + 1]
+        return self.indices[start:stop], self.data[start:stop]
+
+    def get(self, i, j):
+        """
+        Returns the entry at (i, j), 0 if it is not stored.
+        """
+        start, stop = self.indptr[i], self.indptr[i + 1]
+        position = bisect.bisect_left(self.indices, j, start, stop)
+        if position < stop and self.indices[position] == j:
+            return self.data[position]
+        return 0
+
+    def __len__(self):
+        return self.num_rows
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self.num_rows
+        if not 0 <= i < self.num_rows:
+            raise IndexError("matrix row out of range")
+        dense_row = [0] * self.num_cols
+        for position in range(self.indptr[i], self.indptr[i + 1]):
+            dense_row[self.indices[position]] = self.data[position]
+        return dense_row
+
+    def to_dense(self):
+        """
+        Returns the matrix as a list of lists.
+        """
+        return [self[i] for i in range(self.num_rows)]
+
+
+def as_sparse(value, num_cols=None):
+    """
+    Converts any supported matrix input into a SparseMatrix: a SparseMatrix
+    (returned as is), a scenario-file sparse document or a dense list of lists.
+    """
+    if isinstance(value, SparseMatrix):
+        return value
+    if isinstance(value, dict):
+        return SparseMatrix.from_json(value)
+    return SparseMatrix.from_dense(value, num_cols)
+
+
+def _iter_sparse_releases(allocation, max_need, available, order, need_parts):
+    """
+    Worklist safety check over the nonzero entries, as a generator.
+
+    Validates Allocation <= Max Need while deriving Need, and appends the
+    nonzero Need entries to need_parts = (indptr, indices, data).
+
+    Yields:
+        int: Each process as it is executed, before its allocation is returned to Work.
+    """
+    num_processes = allocation.num_rows
+    work_vector = list(available)
+    blocked_counts = [0] * num_processes
+    resource_queues = {} # resource -> [(need, pid)] for the Need entries above Work
+    need_indptr, need_indices, need_data = need_parts
+    allocation_indptr, allocation_indices, allocation_data = allocation.indptr, allocation.indices, allocation.data
+    max_indptr, max_indices, max_data = max_need.indptr, max_need.indices, max_need.data
+    for i in range(num_processes):
+        position, stop = allocation_indptr[i], allocation_indptr[i + 1]
+        for k in range(max_indptr[i], max_indptr[i + 1]):
+            j, need = max_indices[k], max_data[k]
+            if position < stop and allocation_indices[position] <= j:
+                if allocation_indices[position] < j or allocation_data[position] > need:
+                    break
+                need -= allocation_data[position]
+                position += 1
+            if need:
+                need_indices.append(j)
+                need_data.append(need)
+                if need > work_vector[j]:
+                    blocked_counts[i] += 1
+                    resource_queues.setdefault(j, []).append((need, i))
+        if position < stop:
+            # An Allocation entry was larger than Max, or had no Max entry at all.
+            j = allocation_indices[position]
+            raise ValueError(f"Max Need for P{i} R{j} ({max_need.get(i, j)}) must be >= "
+                             f"Allocation for P{i} R{j} ({allocation_data[position]}).")
+        need_indptr.append(len(need_indices))
+    for queue in resource_queues.values():
+        queue.sort()
+    queue_positions = dict.fromkeys(resource_queues, 0)
+
+    def release(i, woken_processes, on_wake):
+        for position in range(allocation_indptr[i], allocation_indptr[i + 1]):
+            j = allocation_indices[position]
+            work_vector[j] += allocation_data[position]
+            queue = resource_queues.get(j)
+            if queue is None:
+                continue
+            queue_position = queue_positions[j]
+            limit = work_vector[j]
+            while queue_position < len(queue) and queue[queue_position][0] <= limit:
+                waiting_process = queue[queue_position][1]
+                blocked_counts[waiting_process] -= 1
+                if blocked_counts[waiting_process] == 0:
+                    on_wake(woken_processes, waiting_process)
+                queue_position += 1
+            queue_positions[j] = queue_position
+
+    ready_processes = [i for i in range(num_processes) if blocked_counts[i] == 0]
+    if order == "index":
+        while ready_processes:
+            i = heapq.heappop(ready_processes)
+            yield i
+            release(i, ready_processes, heapq.heappush)
+    else:
+        while ready_processes:
+            next_round = []
+            for i in ready_processes:
+                yield i
+                release(i, next_round, list.append)
+            next_round.sort()
+            ready_processes = next_round
+
+
+def run_sparse_safety_check(allocation, max_need, available, order="index", trace="none"):
+    """
+    Runs the safety check on sparse matrices.
+
+    Args:
+        allocation (SparseMatrix | dict | list[list[int]]): Allocation matrix
+            (see as_sparse() for the accepted forms).
+        max_need (SparseMatrix | dict | list[list[int]]): Max Need matrix.
+        available (list[int]): Currently available instances of each resource (dense).
+        order (str): "index" or "rounds", as in run_bankers_algorithm_logic().
+        trace (str): "none" (default), "compact" or "full". Trace steps hold
+            dense Work vectors, so a trace costs O(m) per step that is read.
+
+    Returns:
+        tuple: (need_matrix, simulation_steps, safe_sequence, is_safe_state),
+        where need_matrix is a SparseMatrix. The safe sequence is the one the
+        dense engine finds with the same order.
+
+    Raises:
+        ValueError: If the input or the options are invalid.
+    """
+    if order not in SAFETY_ORDERS:
+        raise ValueError(f"Unknown safety order '{order}'. Expected one of {SAFETY_ORDERS}.")
+    if trace not in TRACE_LEVELS:
+        raise ValueError(f"Unknown trace level '{trace}'. Expected one of {TRACE_LEVELS}.")
+    num_resources = _length(available, "Available must be a list of integers.")
+    allocation = as_sparse(allocation, num_resources)
+    max_need = as_sparse(max_need, num_resources)
+    if allocation.shape != max_need.shape:
+        raise ValueError(f"Allocation is {allocation.num_rows} x {allocation.num_cols} "
+                         f"but Max Need is {max_need.num_rows} x {max_need.num_cols}.")
+    if allocation.num_cols != num_resources:
+        raise ValueError(f"The matrices have {allocation.num_cols} columns but Available has {num_resources} values.")
+    for idx, value in enumerate(available):
+        if not isinstance(value, int) or isinstance(value, bool) or not 0 <= value <= MAX_VALUE:
+            raise ValueError(f"Invalid value found for resource {idx}. All available resource values must be non-negative 64-bit integers.")
+
+    need_parts = (array("q", [0]), array("q"), array("q"))
+    safe_sequence = list(_iter_sparse_releases(allocation, max_need, available, order, need_parts))
+    need_matrix = SparseMatrix(allocation.shape, *need_parts)
+    if trace == "none":
+        simulation_steps = None
+    else:
+        simulation_steps = CompactTrace(allocation, available, safe_sequence, num_resources)
+        if trace == "full":
+            simulation_steps = list(simulation_steps)
+    return need_matrix, simulation_steps, safe_sequence, len(safe_sequence) == allocation.num_rows
@@ -0,0 +1,187 @@
+"""
+Stress test for resource_manager.py.
+
+Starts many worker threads (or asyncio tasks with --async) that share one
+BankerResourceManager. Every worker registers a random maximum claim and then
+repeatedly acquires a random part of its remaining claim, holds it for a
+while and releases it (everything it holds, or the whole claim once reached).
+The run reports throughput, acquire latency percentiles and the manager's
+counters, and checks that the pool is whole and the state safe at the end.
+
+Python threads share the GIL, so the Banker decisions themselves do not run
+in parallel on a multi-core machine; what the test measures is how well the
+manager keeps the lock short and the wakeups targeted while many workers
+contend. --hold-us simulates work done while holding resources (sleeping, so
+other threads run meanwhile).
+
+Usage:
+    python stress_resource_manager.py --threads 64 --ops 2000
+    python stress_resource_manager.py --threads 256 --async --hold-us 100
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import threading
+import time
+
+from event_replay import LatencyHistogram
+from resource_manager import BankerResourceManager
+
+
+class _WorkerStats:
+    def __init__(self):
+        self.acquired = 0
+        self.timed_out = 0
+        self.latency = LatencyHistogram()
+
+
+def _plan(rng, claim, held):
+    return [rng.randint(0, limit - amount) for limit, amount in zip(claim, held)]
+
+
+def _thread_worker(manager, rng, claim_vector, num_ops, hold_seconds, timeout, start, stats):
+    start.wait()
+    with manager.register(claim_vector) as claim:
+        held = [0] * len(claim_vector)
+        for _ in range(num_ops):
+            vector = _plan(rng, claim_vector, held)
+            started = time.perf_counter_ns()
+            if claim.acquire(vector, timeout):
+                stats.latency.record(time.perf_counter_ns() - started)
+                stats.acquired += 1
+                held = [amount + value for amount, value in zip(held, vector)]
+                if hold_seconds:
+                    time.sleep(hold_seconds)
+            else:
+                stats.timed_out += 1
+            if held == claim_vector or rng.random() < 0.5:
+                claim.release(held)
+                held = [0] * len(held)
+
+
+async def _task_worker(manager, rng, claim_vector, num_ops, hold_seconds, timeout, stats):
+    with manager.register(claim_vector) as claim:
+        held = [0] * len(claim_vector)
+        for _ in range(num_ops):
+            vector = _plan(rng, claim_vector, held)
+            started = time.perf_counter_ns()
+            if await claim.acquire_async(vector, timeout):
+                stats.latency.record(time.perf_counter_ns() - started)
+                stats.acquired += 1
+                held = [amount + value for amount, value in zip(held, vector)]
+                await asyncio.sleep(hold_seconds)
+            else:
+                stats.timed_out += 1
+            if held == claim_vector or rng.random() < 0.5:
+                claim.release(held)
+                held = [0] * len(held)
+
+
+def run_stress(num_workers, num_ops, pool, max_claim_range, hold_seconds=0.0, timeout=None,
+               use_async=False, seed=None):
+    """
+    Runs the workers to completion and collects the results.
+
+    Args:
+        num_workers (int): Concurrent threads or tasks.
+        num_ops (int): Acquire attempts per worker.
+        pool (list[int]): Instances of each resource in the manager.
+        max_claim_range (tuple[int, int]): Range of each resource in a worker's claim (capped by the pool).
+        hold_seconds (float): Time each acquisition is held.
+        timeout (float | None): Acquire timeout (None = wait until granted).
+        use_async (bool): Use asyncio tasks and acquire_async() instead of threads.
+        seed (int | None): Seed for reproducible runs.
+
+    Returns:
+        dict: Throughput, latency and manager counters.
+
+    Raises:
+        RuntimeError: If the manager ends in an inconsistent state.
+    """
+    rng = random.Random(seed)
+    manager = BankerResourceManager(pool)
+    claims = [[min(rng.randint(*max_claim_range), total) for total in pool] for _ in range(num_workers)]
+    worker_stats = [_WorkerStats() for _ in range(num_workers)]
+    worker_rngs = [random.Random(rng.random()) for _ in range(num_workers)]
+
+    if use_async:
+        async def run_tasks():
+            await asyncio.gather(*(_task_worker(manager, worker_rng, claim, num_ops, hold_seconds, timeout, stats)
+                                   for worker_rng, claim, stats in zip(worker_rngs, claims, worker_stats)))
+        started = time.perf_counter()
+        asyncio.run(run_tasks())
+    else:
+        start = threading.Event()
+        threads = [threading.Thread(target=_thread_worker,
+                                    args=(manager, worker_rng, claim, num_ops, hold_seconds, timeout, start, stats))
+                   for worker_rng, claim, stats in zip(worker_rngs, claims, worker_stats)]
+        for thread in threads:
+            thread.start()
+        started = time.perf_counter()
+        start.set()
+        for thread in threads:
+            thread.join()
+    elapsed = time.perf_counter() - started
+
+    manager_stats = manager.stats()
+    if manager_stats["available"] != list(pool) or manager_stats["processes"] or manager_stats["waiting"]:
+        raise RuntimeError(f"Manager did not return to its initial state: {manager_stats}")
+    latency = LatencyHistogram()
+    for stats in worker_stats:
+        latency.merge(stats.latency)
+    acquired = sum(stats.acquired for stats in worker_stats)
+    return {
+        "mode": "async" if use_async else "threads",
+        "workers": num_workers,
+        "acquired": acquired,
+        "timed_out": sum(stats.timed_out for stats in worker_stats),
+        "elapsed_seconds": round(elapsed, 6),
+        "acquires_per_second": round(acquired / elapsed, 1) if elapsed else 0.0,
+        "acquire_latency": latency.as_dict(),
+        "manager": manager_stats,
+    }
+
+
+def _parse_vector(text):
+    return [int(value) for value in text.split(",")]
+
+
+def _parse_range(text):
+    low, _, high = text.partition(",")
+    return int(low), int(high or low)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Stress test BankerResourceManager with many contending workers.")
+    parser.add_argument("--threads", type=int, default=64, help="Concurrent workers (default: 64).")
+    parser.add_argument("--ops", type=int, default=1000, help="Acquire attempts per worker (default: 1000).")
+    parser.add_argument("--pool", type=_parse_vector, default=[16, 12, 8, 8], metavar="A,B,...",
+                        help="Instances of each resource (default: 16,12,8,8).")
+    parser.add_argument("--max-claim", type=_parse_range, default=(1, 4), metavar="LOW,HIGH",
+                        help="Range of every resource in a worker's claim (default: 1,4).")
+    parser.add_argument("--hold-us", type=float, default=0.0,
+                        help="Microseconds each acquisition is held (default: 0).")
+    parser.add_argument("--timeout", type=float, default=None,
+                        help="Acquire timeout in seconds (default: wait until granted).")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="Run asyncio tasks with acquire_async() instead of threads.")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for reproducible runs.")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        result = run_stress(args.threads, args.ops, args.pool, args.max_claim, args.hold_us / 1e6,
+                            args.timeout, args.use_async, args.seed)
+    except (ValueError, RuntimeError) as error:
+        parser.error(str(error))
+    sys.stdout.write(json.dumps(result, indent=2) + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+"""
+AdmissionServer over TCP: batched requests and over-long message lines.
+"""
+import asyncio
+import json
+
+import admission_server
+from admission_server import MAX_LINE_BYTES, AdmissionServer
+from banker_logic import BankerState
+
+
+class _SlowServer(AdmissionServer):
+    # Holds every reply for a moment and records how many were in flight at once.
+    running = peak = 0
+
+    async def _answer(self, line, writer, received_ns):
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        await super()._answer(line, writer, received_ns)
+
+
+async def _with_server(client, server_class=AdmissionServer):
+    server = server_class(BankerState([[0], [0]], [[2], [2]], [3]))
+    await server.start(port=0)
+    reader, writer = await asyncio.open_connection(*server.address[:2])
+    try:
+        return await client(reader, writer), server
+    finally:
+        writer.close()
+        await server.stop()
+
+
+async def _exchange(reader, writer, message):
+    writer.write(json.dumps(message).encode() + b"\n")
+    await writer.drain()
+    return json.loads(await reader.readline())
+
+
+def test_request_and_release():
+    async def client(reader, writer):
+        return [await _exchange(reader, writer, {"op": "request", "pid": 0, "vector": [2], "id": 1}),
+                await _exchange(reader, writer, {"op": "request", "pid": 1, "vector": [2], "id": 2}),
+                await _exchange(reader, writer, {"op": "release", "pid": 0, "vector": [2]})]
+
+    assert asyncio.run(_with_server(client))[0] == [{"granted": True, "id": 1}, {"granted": False, "id": 2},
+                                                 {"ok": True}]
+
+
+def test_over_long_line_gets_an_error_and_closes_the_connection():
+    async def client(reader, writer):
+        first = await _exchange(reader, writer, {"op": "request", "pid": 0, "vector": [1]})
+        writer.write(b"[" + b"0," * MAX_LINE_BYTES + b"0]\n")
+        await writer.drain()
+        error = json.loads(await reader.readline())
+        return first, error, await reader.read()
+
+    (first, error, rest), _ = asyncio.run(_with_server(client))
+    assert first == {"granted": True}
+    assert "longer than" in error["error"]
+    assert rest == b""
+
+
+def test_in_flight_replies_are_capped_per_connection(monkeypatch):
+    monkeypatch.setattr(admission_server, "MAX_PENDING_REPLIES", 2)
+
+    async def client(reader, writer):
+        writer.write(b"".join(json.dumps({"op": "stats", "id": i}).encode() + b"\n" for i in range(8)))
+        await writer.drain()
+        return sorted([json.loads(await reader.readline())["id"] for _ in range(8)])
+
+    ids, server = asyncio.run(_with_server(client, _SlowServer))
+    assert ids == list(range(8))
+    assert server.peak == 2
@@ -0,0 +1,68 @@
+"""
+Minimal-Available frontier: each point is minimal, and together they cover every safe vector.
+"""
+import itertools
+import random
+
+import pytest
+
+from available_frontier import covers, minimal_available_1d, minimal_available_frontier, smallest_available
+from banker_logic import run_bankers_algorithm_logic
+from scenario_generator import generate_scenario
+
+
+def _is_safe(allocation, max_need, available):
+    return run_bankers_algorithm_logic(allocation, max_need, available, len(allocation), len(available))[3]
+
+
+def _check_frontier(allocation, max_need, frontier):
+    for point in frontier:
+        assert _is_safe(allocation, max_need, point)
+        for j, value in enumerate(point):
+            if value:
+                assert not _is_safe(allocation, max_need, point[:j] + [value - 1] + point[j + 1:])
+    largest_need = max(maximum - held for max_row, alloc_row in zip(max_need, allocation)
+                       for maximum, held in zip(max_row, alloc_row))
+    for available in itertools.product(range(largest_need + 2), repeat=len(allocation[0])):
+        assert covers(available, frontier) == _is_safe(allocation, max_need, list(available))
+
+
+def test_crossed_needs_have_two_minimal_points():
+    # Either P1 or P0 has to go first; each order needs a different Available.
+    allocation = [[1, 1, 1, 1], [1, 1, 1, 1]]
+    max_need = [[9, 1, 1, 9], [1, 9, 9, 1]]
+    frontier = minimal_available_frontier(allocation, max_need)
+    assert frontier == [[7, 8, 8, 7], [8, 7, 7, 8]]
+    assert smallest_available(frontier) == [7, 8, 8, 7]
+    assert covers([8, 8, 8, 8], frontier) and not covers([7, 7, 7, 7], frontier)
+
+
+@pytest.mark.parametrize("num_resources", [1, 2, 3])
+def test_random_frontiers_are_exact(num_resources):
+    rng = random.Random(num_resources)
+    for _ in range(25):
+        allocation, max_need, _ = generate_scenario(rng.randint(1, 6), num_resources, allocation_range=(0, 3),
+                                                    extra_need_range=(0, 4), rng=rng)
+        _check_frontier(allocation, max_need, minimal_available_frontier(allocation, max_need))
+
+
+def test_one_resource_bound():
+    # Run by ascending need: P1 (0), P0 (3 - 2 freed = 1), P2 (5 - 3 freed = 2).
+    assert minimal_available_1d([1, 2, 0], [3, 0, 5]) == 2
+    assert minimal_available_frontier([[2]], [[5]]) == [[3]]
+    assert minimal_available_frontier([[0, 0]], [[0, 0]]) == [[0, 0]]
+
+
+def test_worker_pool_gives_the_same_frontier():
+    allocation, max_need, _ = generate_scenario(6, 4, allocation_range=(0, 3), extra_need_range=(0, 4), seed=3)
+    assert minimal_available_frontier(allocation, max_need, workers=2) == \
+        minimal_available_frontier(allocation, max_need)
+
+
+def test_rejected_inputs():
+    with pytest.raises(ValueError, match="At least one process"):
+        minimal_available_frontier([], [])
+    with pytest.raises(ValueError, match="grid cells"):
+        minimal_available_frontier([[1, 1, 1, 1], [1, 1, 1, 1]], [[9, 1, 1, 9], [1, 9, 9, 1]], max_grid_points=2)
+    with pytest.raises(ValueError):
+        minimal_available_frontier([[2]], [[1]])  # Max below Allocation
@@ -0,0 +1,62 @@
+"""
+check_many() on a process pool: results match the in-process path and input is read lazily.
+"""
+import random
+
+import pytest
+
+from banker_batch import check_many
+from banker_logic import validate_bankers_input
+
+INVALID = [
+    ([[0]], [[1]], [-1]),                   # Negative, caught by the workers
+    ([[2, 0]], [[1, 0]], [0, 0]),           # Max below Allocation, caught by the workers
+    ([[0]], [[-1]], [0]),
+    ([[True]], [[1]], [1]),                 # The rest cannot be packed as is
+    ([[0.5]], [[1]], [1]),
+    ([[0, 0], [0]], [[0, 0], [0, 0]], [1, 1]),
+    ([[2 ** 63]], [[2 ** 63]], [0]),
+    ([[0]], [[1]], [-1, 2 ** 63]),
+    ([[0]], [[1], [1]], [1]),
+    ("00", [[1]], [1]),
+]
+
+
+def _scenarios(count, consumed):
+    rng = random.Random(count)
+    for _ in range(count):
+        consumed.append(1)
+        max_need = [[rng.randint(0, 5) for _ in range(3)] for _ in range(4)]
+        yield {"allocation": [[rng.randint(0, value) for value in row] for row in max_need],
+               "max": max_need, "available": [rng.randint(0, 3) for _ in range(3)]}
+
+
+@pytest.mark.parametrize("ordered", [True, False])
+def test_pool_matches_single_process_and_bounds_input(ordered):
+    expected = [(result.is_safe, result.safe_sequence) for result in check_many(_scenarios(600, []), workers=1)]
+    consumed = []
+    results = check_many(_scenarios(600, consumed), workers=2, chunksize=10, ordered=ordered)
+    got = {}
+    first = next(results)
+    # At most 2 * workers chunks are read ahead of the consumer.
+    assert len(consumed) <= 4 * 10 + 10
+    got[first.index] = (first.is_safe, first.safe_sequence)
+    for result in results:
+        got[result.index] = (result.is_safe, result.safe_sequence)
+    assert [got[index] for index in range(600)] == expected
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_invalid_scenarios_get_the_validation_message(workers):
+    scenarios = []
+    for allocation, max_need, available in INVALID:
+        scenarios += [(allocation, max_need, available), ([[0]], [[1]], [1])]
+    scenarios.append({"allocation": {"format": "rows", "shape": [1, 1], "rows": [[0]]}, "max": [[1]], "available": [1]})
+    results = list(check_many(scenarios, workers=workers, chunksize=3))
+    for (allocation, max_need, available), result, valid in zip(INVALID, results[::2], results[1::2]):
+        with pytest.raises(ValueError) as expected:
+            validate_bankers_input(allocation, max_need, available)
+        assert result.error == str(expected.value)
+        assert (valid.is_safe, valid.safe_sequence, valid.error) == (True, [0], None)
+    assert "must be given as" in results[-1].error
+    assert [result.index for result in results] == list(range(len(scenarios)))
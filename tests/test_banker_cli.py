@@ -0,0 +1,60 @@
+"""
+End-to-end checks of banker_cli on well-formed and malformed scenario records.
+"""
+import json
+
+import pytest
+
+import banker_cli
+
+RECORDS = [
+    {"id": "classic", "allocation": [[0, 1, 0], [2, 0, 0], [3, 0, 2], [2, 1, 1], [0, 0, 2]],
+     "max": [[7, 5, 3], [3, 2, 2], [9, 0, 2], [2, 2, 2], [4, 3, 3]], "available": [3, 3, 2]},
+    {"id": "scalar-allocation", "allocation": 5, "max": [[1]], "available": [1]},
+    {"id": "scalar-available", "allocation": [[0]], "max": [[1]], "available": 5},
+    {"id": "flat-allocation", "allocation": [1], "max": [[1]], "available": [1]},
+    {"id": "string-allocation", "allocation": "ab", "max": [[1]], "available": [1]},
+    {"id": "object-available", "allocation": [[0]], "max": [[1]], "available": {"a": 1}},
+    {"id": "int-value", "allocation": [[1]], "max": [[1]], "available": [1]},  # Cached before its bool twin
+    {"id": "bool-value", "allocation": [[True]], "max": [[1]], "available": [1]},
+    {"id": "beyond-int64", "allocation": [[0]], "max": [[2 ** 63]], "available": [1]},
+    {"id": "sparse-rows-list", "allocation": {"format": "rows", "shape": [1, 1], "rows": [[0]]},
+     "max": [[1]], "available": [1]},
+    {"id": "sparse-beyond-int64", "allocation": [[0]],
+     "max": {"format": "coo", "shape": [1, 1], "row": [0], "col": [0], "data": [2 ** 63]}, "available": [1]},
+    {"id": "unsafe", "allocation": [[1, 0], [0, 1]], "max": [[2, 1], [1, 2]], "available": [0, 0]},
+]
+MODES = {
+    "sequential": [],
+    "cached": ["--cache", "{tmp}/verdicts.sqlite"],
+    "workers": ["--workers", "2", "--chunksize", "3"],
+    "workers-cached": ["--workers", "2", "--chunksize", "3", "--cache", "{tmp}/batch-verdicts.sqlite"],
+}
+
+
+def _run(tmp_path, capsys, extra_args):
+    scenario_file = tmp_path / "scenarios.jsonl"
+    scenario_file.write_text("".join(json.dumps(record) + "\n" for record in RECORDS))
+    exit_code = banker_cli.main([str(scenario_file)] + [arg.format(tmp=tmp_path) for arg in extra_args])
+    results = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    return exit_code, {result["id"]: result for result in results}
+
+
+@pytest.mark.parametrize("mode", sorted(MODES))
+def test_malformed_records_get_per_record_errors(tmp_path, capsys, mode):
+    exit_code, results = _run(tmp_path, capsys, MODES[mode])
+    assert exit_code == 1
+    assert len(results) == len(RECORDS)
+    assert results["classic"] == {"id": "classic", "safe": True, "safe_sequence": [1, 3, 0, 2, 4]}
+    assert results["unsafe"]["safe"] is False
+    assert results["int-value"] == {"id": "int-value", "safe": True, "safe_sequence": [0]}
+    for record in RECORDS:
+        if record["id"] not in ("classic", "unsafe", "int-value"):
+            assert "error" in results[record["id"]], record["id"]
+
+
+def test_modes_agree(tmp_path, capsys):
+    outputs = {mode: _run(tmp_path, capsys, args)[1] for mode, args in MODES.items()}
+    reference = outputs.pop("sequential")
+    for results in outputs.values():
+        assert results == reference
@@ -0,0 +1,170 @@
+"""
+The worklist safety check compared with the original restart-from-P0 scan,
+and the trace levels compared with each other.
+"""
+import random
+
+import pytest
+
+from banker_logic import CompactTrace, iter_bankers_steps, run_bankers_algorithm_logic
+
+
+def _classic_scan(allocation, max_need, available):
+    # The scan the worklist engine replaced, kept here as the reference.
+    num_processes, num_resources = len(allocation), len(available)
+    need_matrix = [[max_need[i][j] - allocation[i][j] for j in range(num_resources)] for i in range(num_processes)]
+    work_vector = list(available)
+    finish_flags = [False] * num_processes
+    safe_sequence = []
+    steps = []
+    progress = True
+    while progress:
+        progress = False
+        for i in range(num_processes):
+            if not finish_flags[i] and all(need_matrix[i][j] <= work_vector[j] for j in range(num_resources)):
+                work_before = list(work_vector)
+                for j in range(num_resources):
+                    work_vector[j] += allocation[i][j]
+                finish_flags[i] = progress = True
+                safe_sequence.append(i)
+                steps.append({"process_executed": i, "work_before_execution": work_before,
+                              "allocation": list(allocation[i]), "work_after_execution": list(work_vector),
+                              "safe_sequence_progress": list(safe_sequence)})
+                break
+    return need_matrix, steps, safe_sequence, all(finish_flags)
+
+
+def _assert_matches_scan(allocation, max_need, available):
+    expected = _classic_scan(allocation, max_need, available)
+    need_matrix, steps, safe_sequence, is_safe = run_bankers_algorithm_logic(
+        allocation, max_need, available, len(allocation), len(available))
+    assert need_matrix == expected[0]
+    assert safe_sequence == expected[2]
+    assert is_safe == expected[3]
+    # Later trace formats may add keys; the classic ones must be unchanged.
+    assert [{key: step[key] for key in reference} for step, reference in zip(steps, expected[1])] == expected[1]
+    assert len(steps) == len(expected[1])
+
+
+def _random_state(rng, num_processes, num_resources):
+    allocation = [[rng.randint(0, 4) for _ in range(num_resources)] for _ in range(num_processes)]
+    max_need = [[held + rng.randint(0, 5) for held in row] for row in allocation]
+    return allocation, max_need, [rng.randint(0, 6) for _ in range(num_resources)]
+
+
+@pytest.mark.parametrize("seed", range(60))
+def test_index_order_reproduces_the_scan(seed):
+    rng = random.Random(seed)
+    _assert_matches_scan(*_random_state(rng, rng.randint(1, 12), rng.randint(1, 5)))
+
+
+@pytest.mark.parametrize("allocation, max_need, available", [
+    # Textbook example: safe via P1, P3, P4, P0, P2.
+    ([[0, 1, 0], [2, 0, 0], [3, 0, 2], [2, 1, 1], [0, 0, 2]],
+     [[7, 5, 3], [3, 2, 2], [9, 0, 2], [2, 2, 2], [4, 3, 3]], [3, 3, 2]),
+    # Every process runnable from the start: ties go to the lowest index.
+    ([[1, 0], [0, 1], [1, 1]], [[1, 0], [0, 1], [1, 1]], [0, 0]),
+    # A late process unblocks an early one, which must then run before the rest.
+    ([[0], [0], [5]], [[4], [9], [5]], [0]),
+    # Unsafe: nobody can start.
+    ([[1, 0], [0, 1]], [[3, 1], [1, 3]], [1, 1]),
+    # Unsafe after a partial sequence.
+    ([[1], [2], [0]], [[2], [2], [9]], [0]),
+    # No processes, no resources.
+    ([], [], [2]),
+    ([[], []], [[], []], []),
+])
+def test_hand_written_states(allocation, max_need, available):
+    _assert_matches_scan(allocation, max_need, available)
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_rounds_order_gives_the_same_verdict(seed):
+    rng = random.Random(seed)
+    allocation, max_need, available = _random_state(rng, rng.randint(1, 12), rng.randint(1, 5))
+    _, steps, safe_sequence, is_safe = run_bankers_algorithm_logic(
+        allocation, max_need, available, len(allocation), len(available), order="rounds")
+    assert is_safe == _classic_scan(allocation, max_need, available)[3]
+    for step in steps:
+        pid = step["process_executed"]
+        assert all(maximum - held <= work for maximum, held, work
+                   in zip(max_need[pid], allocation[pid], step["work_before_execution"]))
+
+
+def test_unknown_order():
+    with pytest.raises(ValueError):
+        run_bankers_algorithm_logic([[0]], [[1]], [1], 1, 1, order="fastest")
+
+
+def _chain_state(num_processes):
+    # Pk needs exactly what P0..Pk-1 release, so the safe sequence is 0, 1, 2, ...
+    allocation = [[1 + k % 3, k % 2] for k in range(num_processes)]
+    max_need = []
+    released = 0
+    for held, other in allocation:
+        max_need.append([held + released, other])
+        released += held
+    return allocation, max_need, [0, 0]
+
+
+def _run(allocation, max_need, available, trace):
+    return run_bankers_algorithm_logic(allocation, max_need, available, len(allocation), len(available),
+                                       trace=trace)
+
+
+@pytest.mark.parametrize("num_processes", [1, 255, 256, 257, 600])
+def test_compact_trace_expands_to_the_full_trace(num_processes):
+    allocation, max_need, available = _chain_state(num_processes)
+    full = _run(allocation, max_need, available, "full")
+    compact = _run(allocation, max_need, available, "compact")
+    assert isinstance(compact[1], CompactTrace)
+    assert compact[2] == full[2] == list(range(num_processes))
+    assert len(compact[1]) == len(full[1])
+    assert list(compact[1]) == full[1]
+    # Random access, starting on and around checkpoint boundaries, in any order.
+    for index in (num_processes - 1, 0, 256, 255, 257, 512, -1):
+        if -num_processes <= index < num_processes:
+            assert compact[1][index] == full[1][index]
+    for start in sorted({0, 255, 256, 257, num_processes} & set(range(num_processes + 1))):
+        streamed = list(compact[1].iter_steps(start))
+        expected = full[1][start:]
+        assert [{key: value for key, value in step.items() if key != "safe_sequence_progress"}
+                for step in expected] == streamed
+
+
+@pytest.mark.parametrize("interval", [1, 2, 3, 7])
+def test_small_checkpoint_intervals(monkeypatch, interval):
+    monkeypatch.setattr(CompactTrace, "CHECKPOINT_INTERVAL", interval)
+    allocation, max_need, available = _chain_state(20)
+    full = _run(allocation, max_need, available, "full")
+    compact = _run(allocation, max_need, available, "compact")[1]
+    assert [compact[k] for k in reversed(range(20))] == full[1][::-1]
+    assert compact[3:11] == full[1][3:11]
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_trace_levels_agree_on_the_verdict(seed):
+    rng = random.Random(seed)
+    allocation, max_need, available = _random_state(rng, rng.randint(1, 12), rng.randint(1, 5))
+    full = _run(allocation, max_need, available, "full")
+    none = _run(allocation, max_need, available, "none")
+    compact = _run(allocation, max_need, available, "compact")
+    assert none[1] is None
+    assert none[0] == compact[0] == full[0]
+    assert none[2:] == compact[2:] == full[2:]
+    assert list(compact[1]) == full[1]
+    streamed = list(iter_bankers_steps(allocation, max_need, available, len(allocation), len(available)))
+    assert [step["process_executed"] for step in streamed] == full[2]
+
+
+def test_compact_trace_index_errors():
+    trace = _run(*_chain_state(3), "compact")[1]
+    with pytest.raises(IndexError):
+        trace[3]
+    with pytest.raises(IndexError):
+        trace.work_before(4)
+
+
+def test_unknown_trace_level():
+    with pytest.raises(ValueError):
+        _run([[0]], [[1]], [1], "verbose")
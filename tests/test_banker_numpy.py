@@ -0,0 +1,37 @@
+"""
+NumPy backend: same Need matrix and safe sequence as the pure-Python backend.
+"""
+import random
+
+import pytest
+
+from banker_logic import MAX_VALUE, get_safety_backend
+from scenario_generator import generate_scenario
+
+pytest.importorskip("numpy")
+import banker_numpy  # noqa: E402
+
+
+def _both_backends(allocation, max_need, available, order):
+    arguments = (allocation, max_need, available, len(allocation), len(available), order)
+    return get_safety_backend("python")(*arguments), banker_numpy.numpy_backend(*arguments)
+
+
+@pytest.mark.parametrize("order", ["index", "rounds"])
+def test_same_result_as_the_python_backend(order):
+    rng = random.Random(order)
+    for _ in range(80):
+        allocation, max_need, available = generate_scenario(rng.randint(1, 15), rng.randint(1, 6),
+                                                            available_range=(0, 4), rng=rng)
+        expected, actual = _both_backends(allocation, max_need, available, order)
+        assert actual == expected
+
+
+@pytest.mark.parametrize("order", ["index", "rounds"])
+def test_work_beyond_int64_does_not_wrap(order):
+    # Releasing P0 and P1 pushes Work to 3 * 2**62, past the int64 range.
+    allocation = [[2 ** 62], [2 ** 62], [0]]
+    max_need = [[2 ** 62], [2 ** 62], [MAX_VALUE]]
+    expected, actual = _both_backends(allocation, max_need, [2 ** 62], order)
+    assert actual == expected
+    assert sorted(actual[1]) == [0, 1, 2]
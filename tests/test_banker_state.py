@@ -0,0 +1,93 @@
+"""
+Randomized equivalence of the incremental BankerState with the baseline safety check.
+"""
+import random
+
+import pytest
+
+from banker_logic import BankerState, run_bankers_algorithm_logic
+
+
+def _baseline_is_safe(allocation, max_need, available):
+    return run_bankers_algorithm_logic(allocation, max_need, available, len(allocation), len(available),
+                                       trace="none")[3]
+
+
+def _assert_matches_baseline(state):
+    pids, allocation, max_need, available = state.snapshot()
+    expected = _baseline_is_safe(allocation, max_need, available)
+    assert state.is_safe == expected
+    sequence = state.safe_sequence
+    if not expected:
+        assert sequence is None
+        return
+    assert sorted(sequence) == sorted(pids)
+    work_vector = list(available)
+    for pid in sequence:
+        assert all(need <= work for need, work in zip(state.need(pid), work_vector))
+        work_vector = [work + held for work, held in zip(work_vector, state.allocation(pid))]
+
+
+def _random_state(rng, num_processes, num_resources):
+    max_need = [[rng.randint(0, 6) for _ in range(num_resources)] for _ in range(num_processes)]
+    allocation = [[rng.randint(0, value) for value in row] for row in max_need]
+    available = [rng.randint(0, 4) for _ in range(num_resources)]
+    return BankerState(allocation, max_need, available)
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_random_operations_match_baseline(seed):
+    rng = random.Random(seed)
+    num_resources = rng.randint(1, 4)
+    state = _random_state(rng, rng.randint(0, 6), num_resources)
+    _assert_matches_baseline(state)
+    for _ in range(60):
+        pids = state.processes
+        operation = rng.choice(("request", "request", "release", "add", "remove", "batch") if pids else ("add",))
+        if operation == "request":
+            pid = rng.choice(pids)
+            vector = [rng.randint(0, need) for need in state.need(pid)]
+            expected = _expected_sequential_grants(state, [(pid, vector)])[0]
+            assert state.request(pid, vector) == expected
+        elif operation == "release":
+            pid = rng.choice(pids)
+            state.release(pid, [rng.randint(0, held) for held in state.allocation(pid)])
+        elif operation == "add":
+            max_claim = [rng.randint(0, 6) for _ in range(num_resources)]
+            allocation = [rng.randint(0, min(value, free)) for value, free in zip(max_claim, state.available)]
+            _, allocation_matrix, max_need, available = state.snapshot()
+            expected = _baseline_is_safe(allocation_matrix + [allocation], max_need + [max_claim],
+                                         [free - amount for free, amount in zip(available, allocation)])
+            assert (state.add_process(max_claim, allocation) is not None) == expected
+        elif operation == "remove":
+            state.remove_process(rng.choice(pids))
+        else:
+            requests = [(pid, [rng.randint(0, min(need, 1)) for need in state.need(pid)])
+                        for pid in rng.sample(pids, min(len(pids), 3))]
+            expected = _expected_sequential_grants(state, requests)
+            assert state.request_many(requests) == expected
+        _assert_matches_baseline(state)
+
+
+def _expected_sequential_grants(state, requests):
+    """Decides the requests one at a time on a plain copy of the state."""
+    pids, allocation, max_need, available = state.snapshot()
+    results = []
+    for pid, vector in requests:
+        row = pids.index(pid)
+        granted_allocation = [held + amount for held, amount in zip(allocation[row], vector)]
+        granted_available = [free - amount for free, amount in zip(available, vector)]
+        granted = min(granted_available) >= 0 and _baseline_is_safe(
+            allocation[:row] + [granted_allocation] + allocation[row + 1:], max_need, granted_available)
+        if granted:
+            allocation[row], available = granted_allocation, granted_available
+        results.append(granted)
+    return results
+
+
+def test_refused_request_keeps_pending_recheck():
+    state = BankerState([[2], [2]], [[3], [4]], [0])
+    state.release(1, [1])
+    assert state.request(1, [1]) is False
+    assert state.is_safe
+    assert state.safe_sequence == [0, 1]
@@ -0,0 +1,62 @@
+"""
+Component decomposition: the per-component check must give the monolithic result.
+"""
+import random
+
+import pytest
+
+from banker_logic import compute_need_matrix, run_bankers_algorithm_logic
+from component_decomposition import find_components, run_decomposed_safety_check
+from scenario_generator import generate_scenario
+
+
+def _loosely_coupled(rng, num_processes=12, num_resources=8):
+    # A low density splits the process / resource graph into several components.
+    return generate_scenario(num_processes, num_resources, density=0.12, available_range=(0, 3), rng=rng)
+
+
+@pytest.mark.parametrize("order", ["index", "rounds"])
+def test_same_result_as_the_monolithic_check(order):
+    rng = random.Random(order)
+    for _ in range(60):
+        allocation, max_need, available = _loosely_coupled(rng)
+        expected = run_bankers_algorithm_logic(allocation, max_need, available, len(allocation),
+                                               len(available), order=order, trace="full")
+        assert run_decomposed_safety_check(allocation, max_need, available, order=order, trace="full") == expected
+
+
+def test_components():
+    allocation = [[1, 0, 0], [0, 0, 0], [0, 0, 1], [0, 0, 0]]
+    need_matrix = [[0, 1, 0], [0, 0, 0], [0, 0, 0], [0, 0, 2]]
+    # P0 links R0 and R1; P2 and P3 share R2; P1 touches nothing.
+    assert find_components(allocation, need_matrix) == [([0], [0, 1]), ([1], []), ([2, 3], [2])]
+
+
+def test_components_partition_processes_and_resources():
+    rng = random.Random(3)
+    for _ in range(20):
+        allocation, max_need, available = _loosely_coupled(rng)
+        need_matrix = compute_need_matrix(allocation, max_need, len(allocation), len(available))
+        components = find_components(allocation, need_matrix)
+        owner = {j: k for k, (_, resources) in enumerate(components) for j in resources}
+        assert sorted(pid for pids, _ in components for pid in pids) == list(range(len(allocation)))
+        for k, (pids, _) in enumerate(components):
+            for pid in pids:
+                used = [j for j in range(len(available)) if allocation[pid][j] or need_matrix[pid][j]]
+                assert all(owner[j] == k for j in used)
+
+
+def test_empty_state():
+    assert run_decomposed_safety_check([], [], [1], trace="none") == ([], None, [], True)
+
+
+def test_worker_pool_matches_in_process():
+    allocation, max_need, available = _loosely_coupled(random.Random(5), num_processes=40, num_resources=20)
+    assert run_decomposed_safety_check(allocation, max_need, available, workers=2) == \
+        run_decomposed_safety_check(allocation, max_need, available)
+
+
+@pytest.mark.parametrize("options", [{"order": "random"}, {"trace": "verbose"}, {"backend": "gpu"}])
+def test_invalid_options(options):
+    with pytest.raises(ValueError):
+        run_decomposed_safety_check([[0]], [[1]], [1], **options)
@@ -0,0 +1,110 @@
+"""
+Deadlock detection with a Request matrix, one-shot and incremental.
+"""
+import random
+
+import pytest
+
+from deadlock_detection import DeadlockDetector, detect_deadlock
+
+
+def _reduce(allocation, request, available):
+    # Textbook detection: finish any process whose request fits Work until none does.
+    work_vector = list(available)
+    finished = {pid for pid, row in enumerate(allocation) if not any(row)}
+    progress = True
+    while progress:
+        progress = False
+        for pid, request_row in enumerate(request):
+            if pid not in finished and all(wanted <= work for wanted, work in zip(request_row, work_vector)):
+                finished.add(pid)
+                work_vector = [work + held for work, held in zip(work_vector, allocation[pid])]
+                progress = True
+    return sorted(set(range(len(allocation))) - finished)
+
+
+def _random_state(rng, num_processes, num_resources, high):
+    def matrix():
+        return [[rng.randint(0, high) for _ in range(num_resources)] for _ in range(num_processes)]
+
+    return matrix(), matrix(), [rng.randint(0, high) for _ in range(num_resources)]
+
+
+def test_two_process_cycle():
+    # Each process holds the unit the other one waits for.
+    assert detect_deadlock([[1, 0], [0, 1]], [[0, 1], [1, 0]], [0, 0]) == [0, 1]
+    assert detect_deadlock([[1, 0], [0, 1]], [[0, 1], [1, 0]], [0, 1]) == []
+
+
+def test_waiting_process_that_holds_nothing_is_not_deadlocked():
+    assert detect_deadlock([[1], [0]], [[1], [1]], [0]) == [0]
+
+
+@pytest.mark.parametrize("high", [1, 2, 4])
+def test_matches_textbook_reduction(high):
+    # high=1 only produces single-instance resources, which use the wait-for graph.
+    rng = random.Random(high)
+    for _ in range(80):
+        state = _random_state(rng, rng.randint(0, 9), rng.randint(1, 4), high)
+        assert detect_deadlock(*state) == _reduce(*state)
+
+
+@pytest.mark.parametrize("allocation, request_matrix, available", [
+    ([[1, 0]], [[1]], [0, 0]),          # Request row too short
+    ([[1], [0]], [[1]], [0]),           # Fewer request rows than processes
+    ([[-1]], [[0]], [0]),               # Negative allocation
+    ([[1]], [[0]], [-2]),               # Negative Available
+])
+def test_invalid_states(allocation, request_matrix, available):
+    with pytest.raises(ValueError):
+        detect_deadlock(allocation, request_matrix, available)
+
+
+def test_detector_follows_random_changes():
+    rng = random.Random(5)
+    detector = DeadlockDetector(*_random_state(rng, 6, 3, 2))
+    for _ in range(1500):
+        pids = detector.processes
+        pid = rng.choice(pids) if pids else None
+        vector = [rng.randint(0, 1) for _ in range(3)]
+        action = rng.randrange(6)
+        try:
+            if pid is None or action == 0:
+                detector.add_process([rng.randint(0, 1) for _ in range(3)], vector)
+            elif action == 1:
+                detector.add_request(pid, vector)
+            elif action == 2:
+                detector.cancel_request(pid, vector)
+            elif action == 3:
+                detector.grant(pid, vector)
+            elif action == 4:
+                detector.release(pid, vector)
+            else:
+                detector.remove_process(pid)
+        except ValueError:
+            pass
+        pids = detector.processes
+        allocation = [detector.allocation(pid) for pid in pids]
+        request = [detector.outstanding_request(pid) for pid in pids]
+        assert detector.deadlocked() == [pids[k] for k in _reduce(allocation, request, detector.available)]
+    assert detector.full_reductions + detector.resumed_reductions > 0
+
+
+def test_detector_errors():
+    detector = DeadlockDetector([[1, 0]], [[0, 1]], [0, 1])
+    with pytest.raises(KeyError):
+        detector.add_request(7, [0, 0])
+    with pytest.raises(ValueError):
+        detector.cancel_request(0, [0, 2])   # More than requested
+    with pytest.raises(ValueError):
+        detector.grant(0, [1, 0])            # Nothing of R0 is available
+    with pytest.raises(ValueError):
+        detector.release(0, [2, 0])          # More than held
+    with pytest.raises(ValueError):
+        detector.add_process(pid=0)          # Id in use
+    with pytest.raises(ValueError):
+        detector.add_request(0, [1])         # Wrong length
+    assert detector.add_process() == 1
+    assert detector.remove_process(0) == [1, 0]
+    assert detector.available == [1, 1]
+    assert not detector.is_deadlocked
@@ -0,0 +1,85 @@
+"""
+Event replay: the pruned retry of deferred requests against retrying every one of them.
+"""
+import random
+
+import pytest
+
+from banker_logic import BankerState
+from event_replay import ReplayStats, iter_replay
+
+
+def _random_log(rng, num_processes=5, num_resources=3, num_events=300):
+    max_need = [[rng.randint(0, 6) for _ in range(num_resources)] for _ in range(num_processes)]
+    allocation = [[rng.randint(0, need) // 2 for need in row] for row in max_need]
+    events = [{"op": "init", "allocation": allocation, "max": max_need,
+               "available": [rng.randint(0, 4) for _ in range(num_resources)]}]
+    for _ in range(num_events):
+        roll = rng.random()
+        pid = rng.randrange(num_processes + 2)
+        vector = [rng.randint(0, 3) for _ in range(num_resources)]
+        if roll < 0.55:
+            events.append({"op": "request", "pid": pid, "vector": vector})
+        elif roll < 0.9:
+            events.append({"op": "release", "pid": pid, "vector": [amount // 2 for amount in vector]})
+        elif roll < 0.95:
+            events.append({"op": "spawn", "max": [amount + 2 for amount in vector]})
+        else:
+            events.append({"op": "exit", "pid": pid})
+    return events
+
+
+def _reference_decisions(events):
+    # Retries every deferred event with a full request() / add_process() on each release or exit.
+    state, pending, decisions = None, [], []
+
+    def attempt(event):
+        if event["op"] == "request":
+            return state.request(event["pid"], event["vector"]), event["pid"]
+        pid = state.add_process(event["max"], event.get("allocation"), pid=event.get("pid"))
+        return pid is not None, pid
+
+    for index, event in enumerate(events):
+        op = event["op"]
+        if op == "init":
+            state = BankerState(event["allocation"], event["max"], event["available"])
+            decisions.append((index, op, None, "grant", False))
+            continue
+        try:
+            if op in ("request", "spawn"):
+                admitted, pid = attempt(event)
+                if not admitted:
+                    pending.append((index, event))
+                decisions.append((index, op, pid, "grant" if admitted else "defer", False))
+                continue
+            if op == "release":
+                state.release(event["pid"], event["vector"])
+            else:
+                state.remove_process(event["pid"])
+                pending = [entry for entry in pending
+                           if entry[1]["op"] != "request" or entry[1]["pid"] != event["pid"]]
+        except (ValueError, KeyError):
+            decisions.append((index, op, event.get("pid"), "deny", False))
+            continue
+        decisions.append((index, op, event.get("pid"), "grant", False))
+        still_pending = []
+        for pending_index, pending_event in pending:
+            try:
+                admitted, pid = attempt(pending_event)
+            except (ValueError, KeyError):
+                admitted = False
+            if admitted:
+                decisions.append((pending_index, pending_event["op"], pid, "grant", True))
+            else:
+                still_pending.append((pending_index, pending_event))
+        pending = still_pending
+    return decisions
+
+
+@pytest.mark.parametrize("seed", range(30))
+def test_pruned_retry_matches_full_retry(seed):
+    events = _random_log(random.Random(seed))
+    stats = ReplayStats()
+    decisions = list(iter_replay(events, stats=stats))
+    assert [(d.index, d.op, d.pid, d.outcome, d.retry) for d in decisions] == _reference_decisions(events)
+    assert stats.retry_grants == sum(1 for d in decisions if d.retry)
@@ -0,0 +1,62 @@
+"""
+Headroom queries: the largest single-resource grant that keeps the state safe.
+"""
+import random
+
+import pytest
+
+from banker_logic import run_bankers_algorithm_logic
+from headroom import headroom_matrix, max_safe_grant
+from scenario_generator import generate_scenario
+
+
+def _is_safe(allocation, max_need, available):
+    return run_bankers_algorithm_logic(allocation, max_need, available, len(allocation), len(available))[3]
+
+
+def _largest_safe_grant(allocation, max_need, available, pid, resource):
+    # Try every amount; safety is monotone in the grant, but checking all of them proves it.
+    if not _is_safe(allocation, max_need, available):
+        return 0
+    safe_amounts = [0]
+    for amount in range(1, min(available[resource], max_need[pid][resource] - allocation[pid][resource]) + 1):
+        granted = [list(row) for row in allocation]
+        granted[pid][resource] += amount
+        remaining = list(available)
+        remaining[resource] -= amount
+        if _is_safe(granted, max_need, remaining):
+            safe_amounts.append(amount)
+    assert safe_amounts == list(range(len(safe_amounts)))
+    return safe_amounts[-1]
+
+
+def test_matches_granting_every_amount():
+    rng = random.Random(15)
+    for _ in range(60):
+        num_processes, num_resources = rng.randint(1, 7), rng.randint(1, 3)
+        allocation, max_need, available = generate_scenario(num_processes, num_resources,
+                                                            available_range=(0, 6), rng=rng)
+        expected = [[_largest_safe_grant(allocation, max_need, available, pid, j) for j in range(num_resources)]
+                    for pid in range(num_processes)]
+        assert headroom_matrix(allocation, max_need, available) == expected
+        pid = rng.randrange(num_processes)
+        assert max_safe_grant(allocation, max_need, available, pid) == expected[pid]
+
+
+def test_textbook_state():
+    allocation = [[0, 1, 0], [2, 0, 0], [3, 0, 2], [2, 1, 1], [0, 0, 2]]
+    max_need = [[7, 5, 3], [3, 2, 2], [9, 0, 2], [2, 2, 2], [4, 3, 3]]
+    # P1 can take everything it may still claim of R0 and R2 on its own.
+    assert max_safe_grant(allocation, max_need, [3, 3, 2], 1) == [1, 2, 2]
+
+
+def test_unsafe_state_has_no_headroom():
+    assert headroom_matrix([[1, 0], [0, 1]], [[3, 1], [1, 3]], [1, 1]) == [[0, 0], [0, 0]]
+
+
+def test_edge_cases():
+    assert headroom_matrix([], [], [3]) == []
+    assert max_safe_grant([[2]], [[2]], [5], 0) == [0]  # Nothing left to claim
+    for pid in (-1, 1):
+        with pytest.raises(IndexError):
+            max_safe_grant([[0]], [[1]], [1], pid)
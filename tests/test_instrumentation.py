@@ -0,0 +1,86 @@
+"""
+Metrics: counters, gauges, phase timers and their JSON / Prometheus output.
+"""
+import json
+
+import pytest
+
+from banker_logic import run_bankers_algorithm_logic
+from instrumentation import Metrics
+
+
+def test_counters_gauges_and_phases():
+    metrics = Metrics()
+    metrics.count("probes")
+    metrics.count("probes", 4)
+    metrics.add_counts({"probes": 1, "releases": 2})
+    metrics.set_gauge("peak_rows", 5)
+    metrics.set_gauge("peak_rows", 3) # peak_* keeps the largest value
+    metrics.set_gauge("rows", 7)
+    metrics.set_gauge("rows", 2)
+    with metrics.phase("check"):
+        pass
+    with metrics.phase("check"):
+        pass
+    assert list(metrics.timed_iter("parse", iter([1, 2, 3]))) == [1, 2, 3]
+    result = metrics.as_dict()
+    assert result["counters"] == {"probes": 6, "releases": 2}
+    assert result["gauges"] == {"peak_rows": 5, "rows": 2}
+    assert result["phases"]["check"]["calls"] == 2
+    assert result["phases"]["parse"]["calls"] == 3
+    assert "profile" not in result
+
+
+def test_merge_adds_everything():
+    first, second = Metrics(), Metrics()
+    first.count("grants", 2)
+    second.count("grants", 3)
+    first.add_time("check", 0.5)
+    second.add_time("check", 0.25, calls=2)
+    second.set_gauge("peak_memory_bytes", 100)
+    merged = first.merge(second).as_dict()
+    assert merged["counters"] == {"grants": 5}
+    assert merged["phases"]["check"] == {"seconds": 0.75, "calls": 3}
+    assert merged["gauges"] == {"peak_memory_bytes": 100}
+
+
+def test_prometheus_format():
+    metrics = Metrics()
+    metrics.add_time('load "a"', 1.5, calls=2)
+    metrics.count("cache-hits", 4)
+    metrics.set_gauge("queue depth", 9)
+    assert metrics.export("prometheus").splitlines() == [
+        "# HELP banker_phase_seconds_total Time spent in each phase.",
+        "# TYPE banker_phase_seconds_total counter",
+        'banker_phase_seconds_total{phase="load \\"a\\""} 1.500000000',
+        "# HELP banker_phase_calls_total Number of times each phase ran.",
+        "# TYPE banker_phase_calls_total counter",
+        'banker_phase_calls_total{phase="load \\"a\\""} 2',
+        "# TYPE banker_cache_hits_total counter",
+        "banker_cache_hits_total 4",
+        "# TYPE banker_queue_depth gauge",
+        "banker_queue_depth 9",
+    ]
+    assert Metrics().to_prometheus() == "\n"
+
+
+def test_json_format_and_unknown_format():
+    metrics = Metrics()
+    metrics.count("grants")
+    assert json.loads(metrics.export("json")) == {"phases": {}, "counters": {"grants": 1}, "gauges": {}}
+    with pytest.raises(ValueError):
+        metrics.export("xml")
+
+
+def test_safety_check_records_phases_and_profile():
+    metrics = Metrics(profile=True, trace_memory=True)
+    allocation = [[0, 1, 0], [2, 0, 0], [3, 0, 2], [2, 1, 1], [0, 0, 2]]
+    max_need = [[7, 5, 3], [3, 2, 2], [9, 0, 2], [2, 2, 2], [4, 3, 3]]
+    expected = run_bankers_algorithm_logic(allocation, max_need, [3, 3, 2], 5, 3)
+    assert run_bankers_algorithm_logic(allocation, max_need, [3, 3, 2], 5, 3, metrics=metrics) == expected
+    result = metrics.as_dict()
+    assert {"safety_check", "trace"} <= set(result["phases"])
+    assert result["counters"]["processes_released"] == 5
+    assert result["gauges"]["peak_memory_bytes"] >= 0
+    assert result["profile"] and all("cumulative_seconds" in row for row in result["profile"])
+    assert any("safety_check" in line for line in metrics.summary_lines())
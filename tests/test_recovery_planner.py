@@ -0,0 +1,82 @@
+"""
+Recovery planning: the cheapest victims, the node budget and option checks.
+"""
+import itertools
+import random
+
+import pytest
+
+from banker_logic import run_bankers_algorithm_logic
+from recovery_planner import plan_recovery
+from scenario_generator import generate_scenario
+
+
+def _is_safe(allocation, max_need, available):
+    return run_bankers_algorithm_logic(allocation, max_need, available, len(allocation), len(available))[3]
+
+
+def _recovers(allocation, max_need, available, victims, mode):
+    freed = list(available)
+    for pid in victims:
+        freed = [free + held for free, held in zip(freed, allocation[pid])]
+    if mode == "abort":
+        kept = [pid for pid in range(len(allocation)) if pid not in victims]
+        return _is_safe([allocation[pid] for pid in kept], [max_need[pid] for pid in kept], freed)
+    preempted = [[0] * len(available) if pid in victims else row for pid, row in enumerate(allocation)]
+    return _is_safe(preempted, max_need, freed)
+
+
+def _cheapest_cost(allocation, max_need, available, weights, mode):
+    return min((sum(weights[pid] for pid in victims)
+                for size in range(len(allocation) + 1)
+                for victims in itertools.combinations(range(len(allocation)), size)
+                if _recovers(allocation, max_need, available, victims, mode)), default=None)
+
+
+@pytest.mark.parametrize("mode", ["abort", "preempt"])
+def test_plan_is_the_cheapest_victim_set(mode):
+    rng = random.Random(mode)
+    for _ in range(40):
+        num_processes = rng.randint(2, 7)
+        allocation, max_need, available = generate_scenario(
+            num_processes, rng.randint(1, 3), verdict="unsafe", stuck_processes=rng.randint(1, num_processes),
+            available_range=(0, 3), rng=rng)
+        weights = [rng.choice([1, 2, 5]) for _ in range(num_processes)]
+        plan = plan_recovery(allocation, max_need, available, weights=weights, mode=mode)
+        expected = _cheapest_cost(allocation, max_need, available, weights, mode)
+        if plan is None:
+            assert mode == "preempt" and expected is None
+            continue
+        assert plan.optimal and plan.cost == expected == sum(weights[pid] for pid in plan.victims)
+        assert plan.victims == sorted(plan.victims)
+        assert _recovers(allocation, max_need, available, plan.victims, mode)
+
+
+def test_weights_choose_between_victims():
+    # Aborting either process frees enough for the other one.
+    allocation, max_need, available = [[2], [2]], [[4], [4]], [0]
+    assert plan_recovery(allocation, max_need, available, weights=[5, 1]).victims == [1]
+    assert plan_recovery(allocation, max_need, available, weights=[1, 5]).victims == [0]
+
+
+def test_safe_state_needs_no_victims():
+    plan = plan_recovery([[1], [0]], [[2], [1]], [1])
+    assert plan.victims == [] and plan.cost == 0 and plan.optimal
+    assert sorted(plan.safe_sequence) == [0, 1]
+
+
+def test_preempting_cannot_help_an_oversized_claim():
+    # P0 may claim 5 units but only 1 exists in total.
+    assert plan_recovery([[1]], [[5]], [0], mode="preempt") is None
+
+
+def test_node_budget_returns_the_best_plan_found():
+    plan = plan_recovery([[1], [1]], [[3], [3]], [0], max_nodes=1)
+    assert not plan.optimal
+    assert _recovers([[1], [1]], [[3], [3]], [0], plan.victims, "abort")
+
+
+@pytest.mark.parametrize("options", [{"mode": "kill"}, {"weights": [1, 2]}, {"weights": [-1]}])
+def test_invalid_options(options):
+    with pytest.raises(ValueError):
+        plan_recovery([[1]], [[2]], [0], **options)
@@ -0,0 +1,65 @@
+"""
+BankerResourceManager: blocking, wakeups and closing claims that have queued requests.
+"""
+import asyncio
+import threading
+
+import pytest
+
+from resource_manager import BankerResourceManager
+
+
+def test_release_wakes_blocked_acquire():
+    manager = BankerResourceManager([2])
+    first, second = manager.register([2]), manager.register([2])
+    assert first.acquire([2])
+    assert second.acquire([1], timeout=0) is False
+    results = []
+    waiter = threading.Thread(target=lambda: results.append(second.acquire([1], timeout=5)))
+    waiter.start()
+    first.release()
+    waiter.join(5)
+    assert results == [True]
+    first.close()
+    second.close()
+    assert manager.stats()["available"] == [2]
+
+
+def test_closing_a_claim_fails_its_queued_request():
+    manager = BankerResourceManager([2])
+    holder, closed = manager.register([2]), manager.register([2])
+    assert holder.acquire([2])
+    results = []
+
+    def wait_for_resources():
+        try:
+            results.append(closed.acquire([2]))
+        except KeyError as error:
+            results.append(error)
+
+    waiter = threading.Thread(target=wait_for_resources)
+    waiter.start()
+    while not manager.stats()["waiting"]:
+        threading.Event().wait(0.01)
+    # The request still exceeds Available, but it must not be left waiting forever.
+    closed.close()
+    waiter.join(5)
+    assert not waiter.is_alive()
+    assert isinstance(results[0], KeyError)
+    assert manager.stats()["waiting"] == 0
+    holder.close()
+
+
+def test_closing_a_claim_fails_its_queued_async_request():
+    async def scenario():
+        manager = BankerResourceManager([1])
+        holder, closed = manager.register([1]), manager.register([1])
+        assert holder.acquire([1])
+        pending = asyncio.ensure_future(closed.acquire_async([1]))
+        await asyncio.sleep(0.05)
+        closed.close()
+        with pytest.raises(KeyError):
+            await asyncio.wait_for(pending, 5)
+        holder.close()
+
+    asyncio.run(scenario())
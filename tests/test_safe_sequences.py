@@ -0,0 +1,86 @@
+"""
+Counting, listing and ranking safe sequences.
+"""
+import itertools
+import math
+import random
+
+import pytest
+
+from safe_sequences import count_safe_sequences, iter_safe_sequences, k_best_safe_sequences
+from scenario_generator import generate_scenario
+
+# Textbook state: every safe sequence starts with P1 or P3.
+ALLOCATION = [[0, 1, 0], [2, 0, 0], [3, 0, 2], [2, 1, 1], [0, 0, 2]]
+MAX_NEED = [[7, 5, 3], [3, 2, 2], [9, 0, 2], [2, 2, 2], [4, 3, 3]]
+AVAILABLE = [3, 3, 2]
+
+
+def _finishes(allocation, max_need, available, sequence):
+    work_vector = list(available)
+    for pid in sequence:
+        if any(maximum - held > work for maximum, held, work in zip(max_need[pid], allocation[pid], work_vector)):
+            return False
+        work_vector = [work + held for work, held in zip(work_vector, allocation[pid])]
+    return True
+
+
+def _permutations_that_finish(allocation, max_need, available):
+    return [list(sequence) for sequence in itertools.permutations(range(len(allocation)))
+            if _finishes(allocation, max_need, available, sequence)]
+
+
+def test_textbook_state():
+    sequences = list(iter_safe_sequences(ALLOCATION, MAX_NEED, AVAILABLE))
+    assert sequences == _permutations_that_finish(ALLOCATION, MAX_NEED, AVAILABLE)
+    assert count_safe_sequences(ALLOCATION, MAX_NEED, AVAILABLE) == len(sequences)
+    assert {sequence[0] for sequence in sequences} == {1, 3}
+
+
+def test_random_states_match_every_permutation():
+    rng = random.Random(12)
+    for _ in range(60):
+        allocation, max_need, available = generate_scenario(rng.randint(1, 6), rng.randint(1, 3),
+                                                            available_range=(0, 4), rng=rng)
+        expected = _permutations_that_finish(allocation, max_need, available)
+        assert count_safe_sequences(allocation, max_need, available) == len(expected)
+        assert list(iter_safe_sequences(allocation, max_need, available)) == expected
+
+
+def test_count_is_memoized():
+    # 20 processes that can run in any order: 20! sequences, counted without listing them.
+    assert count_safe_sequences([[0]] * 20, [[0]] * 20, [0]) == math.factorial(20)
+
+
+def test_edge_cases():
+    assert count_safe_sequences([], [], [1]) == 1
+    assert list(iter_safe_sequences([], [], [1])) == [[]]
+    assert count_safe_sequences([[], [], []], [[], [], []], []) == 6  # No resources: any order
+    unsafe = ([[1, 0], [0, 1]], [[3, 1], [1, 3]], [1, 1])
+    assert count_safe_sequences(*unsafe) == 0
+    assert list(iter_safe_sequences(*unsafe)) == []
+    assert k_best_safe_sequences(*unsafe, 3, lambda pid, position: 1) == []
+
+
+def test_k_best_orders_by_cost():
+    def cost(pid, position):
+        return (pid + 1) * position  # Cheapest to run high pids early
+
+    best = k_best_safe_sequences(ALLOCATION, MAX_NEED, AVAILABLE, 5, cost)
+    all_costs = sorted(sum(cost(pid, position) for position, pid in enumerate(sequence))
+                       for sequence in _permutations_that_finish(ALLOCATION, MAX_NEED, AVAILABLE))
+    assert [spent for spent, _ in best] == all_costs[:5]
+    for spent, sequence in best:
+        assert _finishes(ALLOCATION, MAX_NEED, AVAILABLE, sequence)
+        assert spent == sum(cost(pid, position) for position, pid in enumerate(sequence))
+
+
+def test_k_best_limits():
+    def cost(pid, position):
+        return 1
+
+    assert k_best_safe_sequences(ALLOCATION, MAX_NEED, AVAILABLE, 0, cost) == []
+    everything = k_best_safe_sequences(ALLOCATION, MAX_NEED, AVAILABLE, 1000, cost)
+    assert len(everything) == count_safe_sequences(ALLOCATION, MAX_NEED, AVAILABLE)
+    with pytest.raises(ValueError):
+        k_best_safe_sequences(ALLOCATION, MAX_NEED, AVAILABLE, 1, lambda pid, position: -1)
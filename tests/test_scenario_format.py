@@ -0,0 +1,128 @@
+"""
+Binary .npz scenario files: round trips, numpy compatibility and rejected archives.
+"""
+import json
+import struct
+import zipfile
+
+import pytest
+
+from scenario_format import MappedMatrix, load_scenario, save_scenario
+
+ALLOCATION = [[0, 1, 0], [2, 0, 0], [3, 0, 2], [2, 1, 1], [0, 0, 2]]
+MAX_NEED = [[7, 5, 3], [3, 2, 2], [9, 0, 2], [2, 2, 2], [4, 3, 3]]
+AVAILABLE = [3, 3, 2]
+
+
+def _npy(descr, shape, values, fortran_order=False, typecode="<q", version=1):
+    header = repr({"descr": descr, "fortran_order": fortran_order, "shape": tuple(shape)}).encode("latin1")
+    header += b" " * (-(len(header) + 11) % 64) + b"\n"
+    prefix = b"\x93NUMPY" + bytes([version, 0]) + struct.pack("<H", len(header))
+    return prefix + header + struct.pack(f"{typecode[0]}{len(values)}{typecode[1]}", *values)
+
+
+def _write_archive(path, members, comment=None):
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_STORED) as archive:
+        if comment is not None:
+            archive.comment = json.dumps(comment).encode()
+        for name, data in members.items():
+            archive.writestr(f"{name}.npy", data)
+    return path
+
+
+def _valid_members():
+    return {"allocation": _npy("<i8", (2, 2), [1, 0, 0, 1]),
+            "max_need": _npy("<i8", (2, 2), [2, 1, 1, 2]),
+            "available": _npy("<i8", (2,), [1, 1])}
+
+
+@pytest.mark.parametrize("dtype", ["<i8", "<i4"])
+@pytest.mark.parametrize("use_mmap", [True, False])
+def test_round_trip(tmp_path, dtype, use_mmap):
+    path = str(tmp_path / "scenario.npz")
+    save_scenario(path, ALLOCATION, MAX_NEED, AVAILABLE, scenario_id="textbook", dtype=dtype)
+    scenario = load_scenario(path, use_mmap=use_mmap)
+    assert isinstance(scenario["allocation"], MappedMatrix)
+    assert scenario["allocation"].tolist() == ALLOCATION
+    assert scenario["max_need"].tolist() == MAX_NEED
+    assert [list(row) for row in scenario["max_need"]] == MAX_NEED
+    assert scenario["available"] == AVAILABLE
+    assert scenario["id"] == "textbook"
+    assert scenario["allocation"].dtype == dtype
+
+
+def test_loaded_matrices_can_be_saved_again(tmp_path):
+    first, second = str(tmp_path / "first.npz"), str(tmp_path / "second.npz")
+    save_scenario(first, ALLOCATION, MAX_NEED, AVAILABLE)
+    scenario = load_scenario(first)
+    save_scenario(second, scenario["allocation"], scenario["max_need"], scenario["available"])
+    assert load_scenario(second)["max_need"].tolist() == MAX_NEED
+
+
+def test_empty_scenario(tmp_path):
+    path = str(tmp_path / "empty.npz")
+    save_scenario(path, [], [], [4, 2])
+    scenario = load_scenario(path)
+    assert len(scenario["allocation"]) == 0 and scenario["available"] == [4, 2]
+    assert "id" not in scenario
+
+
+def test_numpy_reads_and_writes_the_format(tmp_path):
+    np = pytest.importorskip("numpy")
+    path = str(tmp_path / "scenario.npz")
+    save_scenario(path, ALLOCATION, MAX_NEED, AVAILABLE)
+    with np.load(path) as arrays:
+        assert arrays["allocation"].tolist() == ALLOCATION
+        assert arrays["available"].tolist() == AVAILABLE
+    assert np.asarray(load_scenario(path)["max_need"]).tolist() == MAX_NEED
+
+    compressed = str(tmp_path / "compressed.npz")
+    np.savez_compressed(compressed, allocation=np.array(ALLOCATION), max=np.array(MAX_NEED),
+                        available=np.array(AVAILABLE))
+    assert load_scenario(compressed)["max_need"].tolist() == MAX_NEED
+
+
+@pytest.mark.parametrize("members, comment, message", [
+    ({"allocation": _npy("<i8", (2, 2), [1, 0, 0])}, None, "truncated"),
+    ({"allocation": _npy(">i8", (2, 2), [1, 0, 0, 1], typecode=">q")}, None, "little-endian"),
+    ({"allocation": _npy("<f8", (2, 2), [1, 0, 0, 1], typecode="<d")}, None, "little-endian"),
+    ({"allocation": _npy("<i8", (2, 2), [1, 0, 0, 1], fortran_order=True)}, None, "C order"),
+    ({"allocation": _npy("<i8", (2, 2), [1, 0, 0, 1], version=4)}, None, "unsupported .npy version"),
+    ({"allocation": b"not an array"}, None, "not a .npy array"),
+    ({"allocation": _npy("<i8", (2, 3), [1, 0, 0, 1, 0, 0])}, None, "n x 2 matrix"),
+    ({"allocation": _npy("<i8", (1, 2), [1, 0])}, None, "different numbers of rows"),
+    ({"available": _npy("<i8", (1, 2), [1, 1])}, None, "must be a vector"),
+    ({}, {"format": "banker-scenario", "version": 99}, "newer"),
+])
+def test_rejected_archives(tmp_path, members, comment, message):
+    path = _write_archive(str(tmp_path / "bad.npz"), {**_valid_members(), **members}, comment)
+    with pytest.raises(ValueError, match=message):
+        load_scenario(path)
+
+
+def test_missing_member_and_not_a_zip(tmp_path):
+    members = _valid_members()
+    del members["max_need"]
+    with pytest.raises(ValueError, match="missing: max_need"):
+        load_scenario(_write_archive(str(tmp_path / "partial.npz"), members))
+    not_a_zip = tmp_path / "scenario.npz"
+    not_a_zip.write_bytes(b"allocation,max\n")
+    with pytest.raises(ValueError, match="Not a scenario file"):
+        load_scenario(str(not_a_zip))
+
+
+def test_foreign_comment_is_ignored(tmp_path):
+    path = _write_archive(str(tmp_path / "plain.npz"), _valid_members(), comment=["made", "elsewhere"])
+    assert load_scenario(path)["allocation"].tolist() == [[1, 0], [0, 1]]
+
+
+@pytest.mark.parametrize("allocation, max_need, available, dtype", [
+    ([[1, 0], [0]], [[1, 0], [0, 1]], [1, 1], "<i8"),    # Ragged row
+    ([[1, 0]], [[1, 0], [0, 1]], [1, 1], "<i8"),         # Row counts differ
+    ([[2 ** 31, 0]], [[2 ** 31, 0]], [1, 1], "<i4"),     # Does not fit int32
+    ([[1.5, 0]], [[2, 0]], [1, 1], "<i8"),               # Not an integer
+    ([[1, 0]], [[2, 0]], [1, 1], "<u8"),                 # Unsupported dtype
+])
+def test_save_rejects_bad_input(tmp_path, allocation, max_need, available, dtype):
+    with pytest.raises(ValueError):
+        save_scenario(str(tmp_path / "bad.npz"), allocation, max_need, available, dtype=dtype)
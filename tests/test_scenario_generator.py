@@ -0,0 +1,80 @@
+"""
+Scenario generator: reproducibility, the promised verdicts and option validation.
+"""
+import json
+import random
+
+import pytest
+
+import scenario_generator
+from banker_logic import run_bankers_algorithm_logic
+from scenario_generator import generate_scenario, generate_scenarios
+
+
+def _is_safe(allocation, max_need, available):
+    return run_bankers_algorithm_logic(allocation, max_need, available, len(allocation), len(available))[3]
+
+
+def test_seed_reproduces_the_scenario():
+    assert generate_scenario(30, 5, seed=7) == generate_scenario(30, 5, seed=7)
+    assert generate_scenario(30, 5, seed=7) != generate_scenario(30, 5, seed=8)
+    assert list(generate_scenarios(3, 4, 2, seed=1)) == list(generate_scenarios(3, 4, 2, seed=1))
+
+
+def test_verdicts_hold_for_many_shapes():
+    rng = random.Random(2024)
+    for _ in range(150):
+        num_processes, num_resources = rng.randint(1, 15), rng.randint(1, 6)
+        verdict = rng.choice(["safe", "unsafe"])
+        scenario = generate_scenario(num_processes, num_resources, verdict=verdict, density=rng.random(),
+                                     stuck_processes=rng.randint(1, num_processes), rng=rng)
+        assert _is_safe(*scenario) == (verdict == "safe")
+
+
+def test_large_draws_use_the_lookup_table():
+    # 200 x 40 cells is above the table threshold; the verdict must still hold.
+    allocation, max_need, available = generate_scenario(200, 40, verdict="unsafe", density=0.25,
+                                                        stuck_processes=5, seed=3)
+    assert not _is_safe(allocation, max_need, available)
+    values = [value for row in allocation for value in row]
+    assert 0.6 < values.count(0) / len(values) < 0.9
+    assert max(values) <= 5
+
+
+def test_safe_order_is_a_safe_sequence():
+    safe_order = [3, 0, 4, 1, 2]
+    allocation, max_need, available = generate_scenario(5, 3, verdict="safe", safe_order=safe_order, seed=11)
+    work_vector = list(available)
+    for pid in safe_order:
+        assert all(maximum - held <= work for maximum, held, work in zip(max_need[pid], allocation[pid], work_vector))
+        work_vector = [work + held for work, held in zip(work_vector, allocation[pid])]
+
+
+def test_density_zero_allocates_nothing():
+    allocation, max_need, _ = generate_scenario(6, 3, density=0.0, seed=0)
+    assert allocation == max_need == [[0, 0, 0]] * 6
+
+
+@pytest.mark.parametrize("args, options", [
+    ((0, 3), {}),
+    ((3, 0), {}),
+    ((3, 3), {"verdict": "maybe"}),
+    ((3, 3), {"density": 1.5}),
+    ((3, 3), {"allocation_range": (4, 2)}),
+    ((3, 3), {"available_range": (-1, 2)}),
+    ((3, 3), {"safe_order": [0, 1, 2]}),                   # safe_order needs verdict="safe"
+    ((3, 3), {"verdict": "safe", "safe_order": [0, 1, 1]}),
+    ((3, 3), {"verdict": "unsafe", "stuck_processes": 4}),
+    ((3, 3), {"verdict": "unsafe", "stuck_processes": 0}),
+])
+def test_invalid_options(args, options):
+    with pytest.raises(ValueError):
+        generate_scenario(*args, **options)
+
+
+def test_command_line_writes_jsonl(capsys):
+    assert scenario_generator.main(["--processes", "4", "--resources", "2", "--count", "3",
+                                    "--verdict", "safe", "--seed", "5"]) == 0
+    scenarios = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [scenario["id"] for scenario in scenarios] == [0, 1, 2]
+    assert all(_is_safe(s["allocation"], s["max"], s["available"]) for s in scenarios)
@@ -0,0 +1,110 @@
+"""
+CSR matrices and the sparse safety check.
+"""
+import random
+
+import pytest
+
+from banker_logic import run_bankers_algorithm_logic
+from scenario_generator import generate_scenario
+from sparse_matrix import SparseMatrix, as_sparse, run_sparse_safety_check
+
+DENSE = [[0, 3, 0, 0], [0, 0, 0, 0], [5, 0, 0, 1]]
+
+
+def test_every_constructor_builds_the_same_matrix():
+    from_coo = SparseMatrix.from_coo((3, 4), [2, 0, 2], [3, 1, 0], [1, 3, 5])
+    from_rows = SparseMatrix.from_dict_of_rows((3, 4), {"2": {"0": 5, "3": 1}, 0: {1: 3}})
+    from_json = as_sparse({"format": "coo", "shape": [3, 4], "row": [0, 2, 2], "col": [1, 0, 3], "data": [3, 5, 1]})
+    for matrix in (SparseMatrix.from_dense(DENSE), from_coo, from_rows, from_json):
+        assert matrix.shape == (3, 4) and matrix.nnz == 3
+        assert matrix.to_dense() == DENSE
+        assert [matrix.get(i, j) for i in range(3) for j in range(4)] == [v for row in DENSE for v in row]
+        assert matrix[-1] == DENSE[-1]
+        assert list(matrix.row(2)[0]) == [0, 3]
+
+
+def test_coo_sums_duplicates_and_drops_zeros():
+    matrix = SparseMatrix.from_coo((2, 2), [0, 0, 1], [1, 1, 0], [2, 3, 0])
+    assert matrix.to_dense() == [[0, 5], [0, 0]]
+    assert matrix.nnz == 1
+
+
+def test_empty_shapes():
+    assert SparseMatrix.from_dense([], num_cols=3).shape == (0, 3)
+    assert SparseMatrix.from_dense([[], []]).to_dense() == [[], []]
+    with pytest.raises(IndexError):
+        SparseMatrix.from_dense(DENSE)[3]
+
+
+@pytest.mark.parametrize("build", [
+    lambda: SparseMatrix.from_coo((2, 2), [0, 2], [0, 0], [1, 1]),        # Row out of range
+    lambda: SparseMatrix.from_coo((2, 2), [0], [0], [-1]),                # Negative value
+    lambda: SparseMatrix.from_coo((2, 2), [0, 1], [0], [1]),              # Lists of different length
+    lambda: SparseMatrix.from_dict_of_rows((2, 2), {0: {2: 1}}),          # Column out of range
+    lambda: SparseMatrix.from_dict_of_rows((2, 2), {0: {0: True}}),       # Not an integer
+    lambda: SparseMatrix.from_dense([[1, 0], [0]]),                       # Ragged rows
+    lambda: SparseMatrix.from_dense([[1.5, 0]]),                          # Not an integer
+    lambda: as_sparse({"format": "csc", "shape": [1, 1]}),                # Unknown layout
+    lambda: as_sparse({"format": "coo", "shape": [1, 1], "row": [0]}),    # Missing lists
+])
+def test_invalid_matrices(build):
+    with pytest.raises(ValueError):
+        build()
+
+
+@pytest.mark.parametrize("document", [
+    {"format": "rows", "shape": [2, 2], "rows": [[1, 0], [0, 1]]},                      # Rows as a list
+    {"format": "rows", "shape": [2, 2], "rows": {"0": [1, 0]}},                          # Row as a list
+    {"format": "rows", "shape": [1, 1], "rows": {"0": {"0": 2 ** 63}}},                  # Beyond int64
+    {"format": "coo", "shape": [1, 1], "row": [0], "col": [0], "data": [2 ** 63]},
+    {"format": "coo", "shape": [1, 1], "row": [0, 0], "col": [0, 0], "data": [2 ** 62, 2 ** 62]},  # Sum
+    {"format": "coo", "shape": [1, 1], "row": 0, "col": 0, "data": 1},                   # Scalars
+    {"format": "coo", "shape": [-1, 1], "row": [], "col": [], "data": []},               # Negative shape
+    {"format": "coo", "shape": [1.5, 1], "row": [], "col": [], "data": []},
+    {"format": "coo", "shape": 3, "row": [], "col": [], "data": []},
+])
+def test_malformed_documents(document):
+    with pytest.raises(ValueError, match="Malformed sparse matrix|64-bit|add up to|must be given as"):
+        as_sparse(document)
+
+
+def test_largest_value_is_accepted():
+    matrix = as_sparse({"format": "coo", "shape": [1, 1], "row": [0], "col": [0], "data": [2 ** 63 - 1]})
+    assert matrix.to_dense() == [[2 ** 63 - 1]]
+
+
+def test_malformed_dense_companions():
+    document = {"format": "coo", "shape": [1, 1], "row": [], "col": [], "data": []}
+    with pytest.raises(ValueError):
+        run_sparse_safety_check(document, 5, [1])
+    with pytest.raises(ValueError):
+        run_sparse_safety_check(document, [[0]], 5)
+    with pytest.raises(ValueError):
+        run_sparse_safety_check(document, [[0]], [2 ** 63])
+
+
+@pytest.mark.parametrize("order", ["index", "rounds"])
+def test_same_result_as_the_dense_engine(order):
+    rng = random.Random(order)
+    for _ in range(60):
+        num_processes, num_resources = rng.randint(1, 20), rng.randint(1, 8)
+        allocation, max_need, available = generate_scenario(num_processes, num_resources, density=rng.random(),
+                                                            available_range=(0, 3), rng=rng)
+        expected = run_bankers_algorithm_logic(allocation, max_need, available, num_processes, num_resources,
+                                               order=order)
+        need_matrix, steps, safe_sequence, is_safe = run_sparse_safety_check(
+            SparseMatrix.from_dense(allocation), SparseMatrix.from_dense(max_need), available,
+            order=order, trace="full")
+        assert need_matrix.to_dense() == expected[0]
+        assert list(steps) == expected[1]
+        assert (safe_sequence, is_safe) == tuple(expected[2:])
+
+
+def test_sparse_check_rejects_bad_states():
+    with pytest.raises(ValueError, match="must be >="):
+        run_sparse_safety_check([[1, 0]], [[0, 0]], [1, 1])
+    with pytest.raises(ValueError):
+        run_sparse_safety_check([[0, 0]], [[0, 0]], [1, 1], order="random")
+    empty = {"format": "coo", "shape": [0, 2], "row": [], "col": [], "data": []}
+    assert run_sparse_safety_check(empty, [], [1, 1], trace="none")[2:] == ([], True)
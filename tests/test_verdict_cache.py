@@ -0,0 +1,49 @@
+"""
+VerdictCache: LRU bounds and the batched SQLite tier.
+"""
+import pytest
+
+from verdict_cache import VerdictCache, scenario_key
+
+
+def _key(value):
+    return scenario_key([[value]], [[value]], [0])
+
+
+def test_lru_evicts_oldest_entries():
+    cache = VerdictCache(max_entries=2)
+    for value in range(3):
+        cache.put(_key(value), [0], True)
+    assert cache.get(_key(0)) is None
+    assert cache.get(_key(2)) == ([0], True)
+    assert cache.stats()["evictions"] == 1
+
+
+def test_sqlite_tier_commits_in_batches_and_on_close(tmp_path):
+    path = str(tmp_path / "verdicts.sqlite")
+    writer = VerdictCache(path=path, commit_every=10, commit_seconds=3600)
+    reader = VerdictCache(path=path)
+    for value in range(15):
+        writer.put(_key(value), [value], value % 2 == 0)
+    assert reader.get(_key(9)) == ([9], False)  # Committed with the first batch of 10
+    assert reader.get(_key(14)) is None         # Still uncommitted
+    writer.close()
+    assert reader.get(_key(14)) == ([14], True)
+    reader.close()
+
+
+def test_keys_are_only_made_for_plain_integers():
+    for allocation, available in (([[True]], [1]), ([[1]], [True]), ([[1.0]], [1])):
+        with pytest.raises(ValueError):
+            scenario_key(allocation, [[1]], available)
+    assert scenario_key(((1,),), ((1,),), (1,)) == scenario_key([[1]], [[1]], [1])
+
+
+def test_sqlite_file_is_opened_on_first_use(tmp_path):
+    path = tmp_path / "verdicts.sqlite"
+    cache = VerdictCache(path=str(path))
+    assert not path.exists()
+    assert cache.get(_key(1)) is None
+    assert path.exists()
+    cache.close()
+    cache.close()
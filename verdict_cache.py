@@ -0,0 +1,272 @@
+"""
+Content-addressed cache of safety check verdicts.
+
+A verdict (the safe sequence found and whether the state is safe) depends only
+on Allocation, Max Need, Available and the safety order. The cache key is a
+BLAKE2b digest of exactly those: the shape and every value packed as
+little-endian int64, plus the order name. Computing it costs one pass over the
+input, much less than the safety check itself.
+
+VerdictCache keeps recent verdicts in memory (LRU, bounded both by entry count
+and by an estimate of their size in bytes) and, optionally, in an SQLite file
+that survives restarts (opened on first use). Memory misses fall back to the file and promote what
+they find. Writes to the file are committed in batches (every
+commit_every puts, or commit_seconds after the first uncommitted one) and on
+flush() / close(). All methods are thread-safe.
+
+Example:
+    cache = VerdictCache(max_entries=10000, path="verdicts.sqlite")
+    result = cached_safety_check(allocation, max_need, available, n, m, cache=cache)
+    print(cache.stats())
+"""
+import hashlib
+import sys
+import threading
+import time
+from array import array
+from collections import OrderedDict
+
+from banker_logic import CompactTrace, TRACE_LEVELS, compute_need_matrix, run_bankers_algorithm_logic
+
+DEFAULT_MAX_ENTRIES = 4096
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_COMMIT_EVERY = 256
+DEFAULT_COMMIT_SECONDS = 1.0
+# Rough per-entry cost of the dict slot, key bytes object and tuple.
+_ENTRY_OVERHEAD_BYTES = 160
+# array("q") also takes bools and other objects with __index__, which
+# validate_bankers_input() rejects; keys are only made for plain ints.
+_INT_ONLY = frozenset((int,))
+
+
+def scenario_key(allocation, max_need, available, order="index"):
+    """
+    Returns the 16-byte cache key of a scenario.
+
+    Raises:
+        ValueError: If the matrices are not n x m, or a value is not an integer
+            (bools included) that fits a signed 64-bit integer.
+    """
+    message = "All matrix fields must contain valid non-negative integers."
+    try:
+        num_processes, num_resources = len(allocation), len(available)
+        if len(max_need) != num_processes:
+            raise ValueError(f"Allocation has {num_processes} rows but Max Need has {len(max_need)}.")
+        packed = array("q", (num_processes, num_resources))
+        for matrix in (allocation, max_need):
+            for row in matrix:
+                if len(row) != num_resources:
+                    raise ValueError(f"Every matrix row must have {num_resources} columns.")
+                if not _INT_ONLY.issuperset(map(type, row)):
+                    raise ValueError(message)
+                packed.extend(row)
+        if not _INT_ONLY.issuperset(map(type, available)):
+            raise ValueError(message)
+        packed.extend(available)
+    except (TypeError, OverflowError):
+        raise ValueError(message) from None
+    if sys.byteorder == "big":
+        packed.byteswap()
+    digest = hashlib.blake2b(packed.tobytes(), digest_size=16)
+    digest.update(order.encode())
+    return digest.digest()
+
+
+class VerdictCache:
+    """
+    Bounded LRU map from scenario_key() to (safe_sequence, is_safe), with an optional SQLite tier.
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, max_bytes=DEFAULT_MAX_BYTES, path=None,
+                 commit_every=DEFAULT_COMMIT_EVERY, commit_seconds=DEFAULT_COMMIT_SECONDS):
+        """
+        Args:
+            max_entries (int): Most verdicts kept in memory.
+            max_bytes (int): Approximate memory budget for the cached verdicts.
+            path (str | None): SQLite file for the persistent tier (None = memory only).
+            commit_every (int): Commit the file after this many uncommitted puts.
+            commit_seconds (float): Commit on the next put once the oldest
+                uncommitted one is this old.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict() # key -> (sequence array, is_safe); most recently used last
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.commit_every = commit_every
+        self.commit_seconds = commit_seconds
+        self._uncommitted = 0
+        self._first_uncommitted_at = 0.0
+        self._path = path
+        self._db = None # Opened on first use, so a cache that is never queried costs nothing
+
+    def _connection(self):
+        # Caller holds the lock. Returns None for a memory-only cache.
+        if self._db is None and self._path is not None:
+            # Imported only for the persistent tier; memory-only caches do not load it.
+            import sqlite3
+            # The connection is shared by the threads using the cache; the lock serializes access.
+            self._db = sqlite3.connect(self._path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS verdicts "
+                             "(key BLOB PRIMARY KEY, safe INTEGER NOT NULL, sequence BLOB NOT NULL)")
+            self._db.commit()
+        return self._db
+
+    @staticmethod
+    def _entry_bytes(key, sequence):
+        return len(key) + sequence.itemsize * len(sequence) + _ENTRY_OVERHEAD_BYTES
+
+    def _remember(self, key, sequence, is_safe):
+        # Caller holds the lock.
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= self._entry_bytes(key, previous[0])
+        size = self._entry_bytes(key, sequence)
+        if size > self.max_bytes:
+            return # Larger than the whole budget: keep it on disk only
+        self._entries[key] = (sequence, is_safe)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            old_key, (old_sequence, _) = self._entries.popitem(last=False)
+            self._bytes -= self._entry_bytes(old_key, old_sequence)
+            self.evictions += 1
+
+    def get(self, key):
+        """
+        Looks up a verdict.
+
+        Returns:
+            tuple | None: (safe_sequence, is_safe) or None on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0].tolist(), entry[1]
+            db = self._connection()
+            if db is not None:
+                row = db.execute("SELECT safe, sequence FROM verdicts WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    sequence = array("q")
+                    sequence.frombytes(row[1])
+                    if sys.byteorder == "big":
+                        sequence.byteswap()
+                    self._remember(key, sequence, bool(row[0]))
+                    self.disk_hits += 1
+                    return sequence.tolist(), bool(row[0])
+            self.misses += 1
+            return None
+
+    def put(self, key, safe_sequence, is_safe):
+        """
+        Stores a verdict in memory and, if configured, on disk.
+        """
+        sequence = array("q", safe_sequence)
+        with self._lock:
+            self._remember(key, sequence, bool(is_safe))
+            db = self._connection()
+            if db is not None:
+                stored = array("q", sequence)
+                if sys.byteorder == "big":
+                    stored.byteswap()
+                db.execute("INSERT OR REPLACE INTO verdicts (key, safe, sequence) VALUES (?, ?, ?)",
+                           (key, int(bool(is_safe)), stored.tobytes()))
+                # One commit (and WAL sync) per batch of puts rather than per verdict.
+                now = time.monotonic()
+                if not self._uncommitted:
+                    self._first_uncommitted_at = now
+                self._uncommitted += 1
+                if self._uncommitted >= self.commit_every or now - self._first_uncommitted_at >= self.commit_seconds:
+                    self._commit()
+
+    def _commit(self):
+        # Caller holds the lock.
+        if self._uncommitted:
+            self._db.commit()
+            self._uncommitted = 0
+
+    def flush(self):
+        """
+        Commits verdicts not yet written to the SQLite file.
+        """
+        with self._lock:
+            if self._db is not None:
+                self._commit()
+
+    def clear(self):
+        """
+        Empties the memory tier (the disk tier is kept).
+        """
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._commit()
+                self._db.close()
+                self._db = None
+            self._path = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        """
+        Returns the cache counters as a dict.
+        """
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+            }
+
+
+def cached_safety_check(allocation, max_need, initial_available, num_processes, num_resources,
+                        order="index", backend="python", trace="full", cache=None):
+    """
+    run_bankers_algorithm_logic() behind a VerdictCache.
+
+    On a hit the safety check is skipped: Need is recomputed and the trace is
+    rebuilt from the cached sequence, both linear in the input size.
+
+    Args:
+        cache (VerdictCache | None): Cache to use; None runs the check uncached.
+        Other arguments as in run_bankers_algorithm_logic().
+
+    Returns:
+        tuple: (need_matrix, simulation_steps, safe_sequence, is_safe_state)
+    """
+    if cache is None:
+        return run_bankers_algorithm_logic(allocation, max_need, initial_available, num_processes, num_resources,
+                                           order=order, backend=backend, trace=trace)
+    if trace not in TRACE_LEVELS:
+        raise ValueError(f"Unknown trace level '{trace}'. Expected one of {TRACE_LEVELS}.")
+    key = scenario_key(allocation, max_need, initial_available, order)
+    verdict = cache.get(key)
+    if verdict is None:
+        result = run_bankers_algorithm_logic(allocation, max_need, initial_available, num_processes, num_resources,
+                                             order=order, backend=backend, trace=trace)
+        cache.put(key, result[2], result[3])
+        return result
+    safe_sequence, is_safe_state = verdict
+    need_matrix = compute_need_matrix(allocation, max_need, num_processes, num_resources)
+    simulation_steps = None
+    if trace != "none":
+        simulation_steps = CompactTrace(allocation, initial_available, safe_sequence, num_resources)
+        if trace == "full":
+            simulation_steps = list(simulation_steps)
+    return need_matrix, simulation_steps, safe_sequence, is_safe_state
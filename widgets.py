@@ -0,0 +1,243 @@
+import customtkinter as ctk
+
+
+class MatrixEditor(ctk.CTkFrame):
+    """
+    Spreadsheet-style editor for a non-negative integer matrix.
+
+    The values live in an in-memory model (a list of rows). Only a small, fixed
+    pool of CTkEntry widgets is created; scrolling re-binds that pool to the rows
+    and columns currently in view, so the number of widgets does not grow with
+    the size of the matrix.
+
+    Rows are copy-on-write: set_values() and get_values() share row objects
+    with the caller (e.g. the read-only, memory-mapped rows of a loaded
+    scenario file) and an edit copies only the row it changes.
+    """
+    def __init__(self, master, rows, cols, row_label_prefix="P", visible_rows=10, visible_cols=6, **kwargs):
+        """
+        Args:
+            master: Parent widget.
+            rows (int): Number of rows of the matrix.
+            cols (int): Number of columns of the matrix.
+            row_label_prefix (str): Prefix for row labels (e.g. "P" for processes).
+            visible_rows (int): Maximum number of rows rendered at once.
+            visible_cols (int): Maximum number of columns rendered at once.
+        """
+        super().__init__(master, fg_color="transparent", **kwargs)
+        self.rows = rows
+        self.cols = cols
+        self.row_label_prefix = row_label_prefix
+
+        # --- Model ---
+        self._values = [[0] * cols for _ in range(rows)]
+        self._owned_rows = set() # Rows copied by an edit and not shared with any caller since
+        self._invalid_cells = {} # (row, col) -> raw text that is not a valid integer
+
+        # --- View state ---
+        self._first_row = 0 # Model row shown in the first visible row
+        self._first_col = 0 # Model column shown in the first visible column
+        self._visible_rows = min(rows, visible_rows)
+        self._visible_cols = min(cols, visible_cols)
+        self._rendering = False # Set while the view writes into the entries
+
+        self._build_widget_pool()
+        self._render()
+
+    # --- Widget construction ---
+
+    def _build_widget_pool(self):
+        label_font = ctk.CTkFont(size=12, weight="bold")
+
+        # Column headers (R0, R1, ...) for the visible columns
+        self._col_labels = []
+        for c in range(self._visible_cols):
+            col_label = ctk.CTkLabel(self, text="", font=label_font)
+            col_label.grid(row=0, column=c + 1, padx=5, pady=2) # Column 0 is reserved for row labels
+            self._col_labels.append(col_label)
+
+        # Row labels (P0, P1, ...) are only shown for multi-row matrices
+        self._row_labels = []
+        self._entries = []
+        self._entry_vars = []
+        for r in range(self._visible_rows):
+            if self.rows > 1:
+                row_label = ctk.CTkLabel(self, text="", font=label_font, width=40)
+                row_label.grid(row=r + 1, column=0, padx=5, pady=2)
+                self._row_labels.append(row_label)
+            row_entries = []
+            row_vars = []
+            for c in range(self._visible_cols):
+                entry_var = ctk.StringVar(self)
+                entry_var.trace_add("write", lambda *_, r=r, c=c: self._on_entry_changed(r, c))
+                entry_widget = ctk.CTkEntry(self, width=50, justify="center", textvariable=entry_var)
+                entry_widget.grid(row=r + 1, column=c + 1, padx=5, pady=5)
+                # Keyboard navigation scrolls the view when leaving the visible window
+                entry_widget.bind("<Up>", lambda _, r=r, c=c: self._move_focus(r, c, -1, 0))
+                entry_widget.bind("<Down>", lambda _, r=r, c=c: self._move_focus(r, c, 1, 0))
+                entry_widget.bind("<Return>", lambda _, r=r, c=c: self._move_focus(r, c, 1, 0))
+                # Left / Right move the text cursor, and leave the cell only from its first / last character
+                entry_widget.bind("<Left>", lambda _, r=r, c=c: self._move_focus_across(r, c, -1))
+                entry_widget.bind("<Right>", lambda _, r=r, c=c: self._move_focus_across(r, c, 1))
+                self._bind_mouse_wheel(entry_widget)
+                row_entries.append(entry_widget)
+                row_vars.append(entry_var)
+            self._entries.append(row_entries)
+            self._entry_vars.append(row_vars)
+
+        # Scrollbars are only added when the matrix does not fit the widget pool
+        self._vertical_scrollbar = None
+        self._horizontal_scrollbar = None
+        if self.rows > self._visible_rows:
+            self._vertical_scrollbar = ctk.CTkScrollbar(self, orientation="vertical", command=self._on_vertical_scroll)
+            self._vertical_scrollbar.grid(row=1, column=self._visible_cols + 1, rowspan=self._visible_rows, sticky="ns")
+        if self.cols > self._visible_cols:
+            self._horizontal_scrollbar = ctk.CTkScrollbar(self, orientation="horizontal", command=self._on_horizontal_scroll)
+            self._horizontal_scrollbar.grid(row=self._visible_rows + 1, column=1, columnspan=self._visible_cols, sticky="ew")
+        self._bind_mouse_wheel(self)
+
+    def _bind_mouse_wheel(self, widget):
+        widget.bind("<MouseWheel>", self._on_mouse_wheel, add="+")              # Windows / macOS
+        widget.bind("<Shift-MouseWheel>", self._on_shift_mouse_wheel, add="+")
+        widget.bind("<Button-4>", lambda _: self.scroll_to(self._first_row - 1, self._first_col), add="+") # Linux
+        widget.bind("<Button-5>", lambda _: self.scroll_to(self._first_row + 1, self._first_col), add="+")
+
+    # --- View ---
+
+    def _cell_text(self, i, j):
+        raw_text = self._invalid_cells.get((i, j))
+        return raw_text if raw_text is not None else str(self._values[i][j])
+
+    def _render(self):
+        """
+        Writes the model values of the visible window into the widget pool.
+        """
+        self._rendering = True
+        try:
+            for c, col_label in enumerate(self._col_labels):
+                col_label.configure(text=f"R{self._first_col + c}")
+            for r, row_label in enumerate(self._row_labels):
+                row_label.configure(text=f"{self.row_label_prefix}{self._first_row + r}")
+            for r in range(self._visible_rows):
+                for c in range(self._visible_cols):
+                    self._entry_vars[r][c].set(self._cell_text(self._first_row + r, self._first_col + c))
+        finally:
+            self._rendering = False
+        if self._vertical_scrollbar is not None:
+            self._vertical_scrollbar.set(self._first_row / self.rows,
+                                         (self._first_row + self._visible_rows) / self.rows)
+        if self._horizontal_scrollbar is not None:
+            self._horizontal_scrollbar.set(self._first_col / self.cols,
+                                           (self._first_col + self._visible_cols) / self.cols)
+
+    def scroll_to(self, first_row, first_col=None):
+        """
+        Scrolls so that `first_row` / `first_col` are the first visible row / column.
+        """
+        if first_col is None:
+            first_col = self._first_col
+        first_row = max(0, min(first_row, self.rows - self._visible_rows))
+        first_col = max(0, min(first_col, self.cols - self._visible_cols))
+        if (first_row, first_col) != (self._first_row, self._first_col):
+            self._first_row, self._first_col = first_row, first_col
+            self._render()
+
+    def _scroll_command_target(self, args, first, visible, total):
+        # Translates Tk scrollbar commands ("moveto" / "scroll") into a first index.
+        if args[0] == "moveto":
+            return int(float(args[1]) * total)
+        step = int(args[1]) * (visible if len(args) > 2 and args[2] == "pages" else 1)
+        return first + step
+
+    def _on_vertical_scroll(self, *args):
+        self.scroll_to(self._scroll_command_target(args, self._first_row, self._visible_rows, self.rows))
+
+    def _on_horizontal_scroll(self, *args):
+        self.scroll_to(self._first_row,
+                       self._scroll_command_target(args, self._first_col, self._visible_cols, self.cols))
+
+    def _on_mouse_wheel(self, event):
+        self.scroll_to(self._first_row - (1 if event.delta > 0 else -1))
+
+    def _on_shift_mouse_wheel(self, event):
+        self.scroll_to(self._first_row, self._first_col - (1 if event.delta > 0 else -1))
+
+    def _move_focus(self, r, c, d_row, d_col):
+        target_row = self._first_row + r + d_row
+        target_col = self._first_col + c + d_col
+        if not (0 <= target_row < self.rows and 0 <= target_col < self.cols):
+            return "break"
+        first_row, first_col = self._first_row, self._first_col
+        if r + d_row < 0 or r + d_row >= self._visible_rows:
+            first_row += d_row
+        if c + d_col < 0 or c + d_col >= self._visible_cols:
+            first_col += d_col
+        self.scroll_to(first_row, first_col)
+        self._entries[target_row - self._first_row][target_col - self._first_col].focus_set()
+        return "break"
+
+    def _move_focus_across(self, r, c, d_col):
+        entry_widget = self._entries[r][c]
+        cursor = entry_widget.index("insert")
+        if (d_col < 0 and cursor > 0) or (d_col > 0 and cursor < len(entry_widget.get())):
+            return None # Let the entry move its text cursor
+        return self._move_focus(r, c, 0, d_col)
+
+    # --- Model updates from the view ---
+
+    def _on_entry_changed(self, r, c):
+        if self._rendering:
+            return
+        i, j = self._first_row + r, self._first_col + c
+        raw_text = self._entry_vars[r][c].get()
+        try:
+            value = int(raw_text)
+        except ValueError:
+            value = -1
+        if value < 0:
+            # Keep what the user typed so it can be shown again and reported on validation
+            self._invalid_cells[(i, j)] = raw_text
+        else:
+            self._invalid_cells.pop((i, j), None)
+            if i not in self._owned_rows:
+                self._values[i] = list(self._values[i])
+                self._owned_rows.add(i)
+            self._values[i][j] = value
+
+    # --- Model API ---
+
+    def get_values(self):
+        """
+        Returns the matrix as a new list of rows of ints. The rows themselves are
+        shared and must be treated as read-only; later edits do not change them.
+        Cells holding invalid text keep their last valid value; see invalid_cells().
+        """
+        self._owned_rows.clear()
+        return list(self._values)
+
+    def invalid_cells(self):
+        """
+        Returns {(row, col): raw_text} for every cell whose text is not a non-negative integer.
+        """
+        return dict(self._invalid_cells)
+
+    def set_values(self, matrix):
+        """
+        Replaces the whole matrix with `matrix` (rows x cols integers) and refreshes
+        the view. The rows are kept without copying them; they are not modified.
+        """
+        if len(matrix) != self.rows or any(len(row) != self.cols for row in matrix):
+            raise ValueError(f"Expected a {self.rows} x {self.cols} matrix.")
+        self._values = list(matrix)
+        self._owned_rows.clear()
+        self._invalid_cells.clear()
+        self._render()
+
+    def fill(self, value=0):
+        """
+        Sets every cell to `value` and refreshes the view.
+        """
+        self._values = [[value] * self.cols for _ in range(self.rows)]
+        self._owned_rows = set(range(self.rows))
+        self._invalid_cells.clear()
+        self._render()
@@ -1,3 +1,5 @@
+import itertools
+
 import customtkinter as ctk
 
 class AboutWindow(ctk.CTkToplevel):
@@ -110,85 +112,302 @@ class ResultsWindow(ctk.CTkToplevel):
     """
     A Toplevel window to display the results of the Banker's Algorithm,
     including the Need Matrix, step-by-step simulation, and final safe sequence.
+
+    The Need matrix and the simulation steps are rendered lazily: only one page
+    of text is written at a time and the next page is appended when the user
+    scrolls close to the end. Jumping to a step renders the page around it;
+    earlier steps are then prepended when the user scrolls close to the top.
+    The steps can come from a full list of step dicts or from a CompactTrace,
+    whose Work vectors are rebuilt on demand.
+
+    If a Metrics object is given, a collapsible panel at the bottom shows its
+    phase timings and counters; the text is produced when the panel is opened,
+    so it includes the time spent rendering this window.
     """
-    def __init__(self, initial_available, need_matrix, simulation_steps, safe_sequence, is_safe, *args, **kwargs):
+    STEPS_PER_PAGE = 50      # Simulation steps rendered per page
+    NEED_ROWS_PER_PAGE = 200 # Need matrix rows rendered per page
+    SCROLL_POLL_MS = 200     # How often the scroll position is checked for lazy loading
+
+    def __init__(self, initial_available, need_matrix, simulation_steps, safe_sequence, is_safe, *args,
+                 recovery_plan=None, metrics=None, **kwargs):
         super().__init__(*args, **kwargs)
         self.title("Banker's Algorithm Results")
         self.geometry("700x800") # Set a fixed size for the results window
         self.grab_set() # Make the window modal
 
-        self.grid_columnconfigure(0, weight=1)
-        self.grid_rowconfigure(0, weight=1)
+        self.need_matrix = need_matrix
+        self.simulation_steps = simulation_steps if simulation_steps is not None else []
+        self.safe_sequence = safe_sequence
+        self.metrics = metrics
+        self._step_positions = None # Lazily built map: process id -> step index
 
-        # Create a single scrollable frame to hold all content.
-        # This ensures that if the content extends beyond the window height,
-        # the user can scroll to see everything, including the final result.
-        self.scrollable_content_frame = ctk.CTkScrollableFrame(self, corner_radius=15)
-        self.scrollable_content_frame.grid(row=0, column=0, padx=20, pady=20, sticky="nsew")
-        self.scrollable_content_frame.grid_columnconfigure(0, weight=1) # Center content within this scrollable frame
+        # Lazy rendering state: index of the next item to append, per textbox,
+        # and the first step currently rendered
+        self._next_need_row = 0
+        self._next_step = 0
+        self._first_step = 0
+
+        self.grid_columnconfigure(0, weight=1)
+        self.grid_rowconfigure(3, weight=1) # The steps view takes the remaining height
 
         # --- Display Initial Available Resources ---
-        ctk.CTkLabel(self.scrollable_content_frame, text="Initial Available Resources:",
-                     font=ctk.CTkFont(size=15, weight="bold")).pack(pady=(10, 5))
-        ctk.CTkLabel(self.scrollable_content_frame, text=f"{initial_available}",
-                     font=("Cascadia Code", 13), text_color="green").pack(pady=(0, 15))
+        header_frame = ctk.CTkFrame(self, corner_radius=15)
+        header_frame.grid(row=0, column=0, padx=20, pady=(20, 5), sticky="ew")
+        header_frame.grid_columnconfigure(0, weight=1)
+        ctk.CTkLabel(header_frame, text="Initial Available Resources:",
+                     font=ctk.CTkFont(size=15, weight="bold")).grid(row=0, column=0, pady=(10, 5))
+        ctk.CTkLabel(header_frame, text=f"{initial_available}",
+                     font=("Cascadia Code", 13), text_color="green").grid(row=1, column=0, pady=(0, 10))
 
         # --- Display Need Matrix ---
-        ctk.CTkLabel(self.scrollable_content_frame, text="Need Matrix (Max - Allocation):",
-                     font=ctk.CTkFont(size=15, weight="bold")).pack(pady=(10, 5))
-        need_frame = ctk.CTkFrame(self.scrollable_content_frame, corner_radius=8)
-        need_frame.pack(pady=5, padx=20, fill="x")
-        need_frame.grid_columnconfigure(0, weight=1) # For centering process rows
+        ctk.CTkLabel(header_frame, text="Need Matrix (Max - Allocation):",
+                     font=ctk.CTkFont(size=15, weight="bold")).grid(row=2, column=0, pady=(5, 5))
+        self.need_textbox = ctk.CTkTextbox(header_frame, height=130, corner_radius=8, font=("Cascadia Code", 12))
+        self.need_textbox.grid(row=3, column=0, padx=20, pady=(0, 10), sticky="ew")
+        self._append_need_rows()
 
-        # Iterate through the need_matrix to display each process's needs
-        for i, row_data in enumerate(need_matrix):
-            row_str = "  ".join(map(str, row_data))
-            ctk.CTkLabel(need_frame, text=f"P{i}: [{row_str}]", font=("Cascadia Code", 12)).grid(row=i, column=0, sticky="w", padx=10, pady=2)
+        # --- Simulation Steps Controls: jump to step / find process ---
+        ctk.CTkLabel(self, text=f"Simulation Steps ({len(self.simulation_steps)}):",
+                     font=ctk.CTkFont(size=15, weight="bold")).grid(row=1, column=0, pady=(10, 5))
+        controls_frame = ctk.CTkFrame(self, fg_color="transparent")
+        controls_frame.grid(row=2, column=0, padx=20, sticky="ew")
+
+        ctk.CTkLabel(controls_frame, text="Step:").pack(side="left", padx=(0, 5))
+        self.jump_entry = ctk.CTkEntry(controls_frame, width=70)
+        self.jump_entry.pack(side="left")
+        self.jump_entry.bind("<Return>", lambda _: self.jump_to_step_from_entry())
+        ctk.CTkButton(controls_frame, text="Go", width=40, command=self.jump_to_step_from_entry).pack(side="left", padx=5)
+
+        ctk.CTkLabel(controls_frame, text="Process:").pack(side="left", padx=(15, 5))
+        self.find_entry = ctk.CTkEntry(controls_frame, width=70, placeholder_text="e.g. P3")
+        self.find_entry.pack(side="left")
+        self.find_entry.bind("<Return>", lambda _: self.find_process_from_entry())
+        ctk.CTkButton(controls_frame, text="Find", width=50, command=self.find_process_from_entry).pack(side="left", padx=5)
+
+        self.navigation_label = ctk.CTkLabel(controls_frame, text="", text_color="yellow")
+        self.navigation_label.pack(side="left", padx=10)
 
         # --- Display Simulation Steps ---
-        ctk.CTkLabel(self.scrollable_content_frame, text="Simulation Steps:",
-                     font=ctk.CTkFont(size=15, weight="bold")).pack(pady=(20, 5))
-
-        if simulation_steps:
-            # Iterate through each step recorded during the algorithm execution
-            for i, step_info in enumerate(simulation_steps):
-                step_text = (
-                    f"--- Step {i+1} ---\n"
-                    f"  Executing Process: P{step_info['process_executed']}\n"
-                    f"  Available (before): {step_info['work_before_execution']}\n"
-                    f"  Resources Allocated by P{step_info['process_executed']}: {step_info['allocation']}\n"
-                    f"  Available (after): {step_info['work_after_execution']}\n"
-                    f"  Current Safe Sequence Progress: {' -> '.join([f'P{p}' for p in step_info['safe_sequence_progress']])}\n"
-                )
-                
-                # Display each step's details
-                step_label = ctk.CTkLabel(self.scrollable_content_frame, text=step_text, justify="left", font=("Cascadia Code", 12))
-                step_label.pack(anchor="w", padx=10, pady=5)
-                
-                # Add a separator line after each step for visual clarity
-                ctk.CTkFrame(self.scrollable_content_frame, height=1, fg_color="gray").pack(fill="x", padx=10, pady=5)
+        self.steps_textbox = ctk.CTkTextbox(self, corner_radius=15, font=("Cascadia Code", 12), wrap="none")
+        self.steps_textbox.grid(row=3, column=0, padx=20, pady=5, sticky="nsew")
+        if self.simulation_steps:
+            self._append_steps()
         else:
             # Message if no processes could execute (e.g., immediate unsafe state)
-            ctk.CTkLabel(self.scrollable_content_frame, text="No processes could execute. The system might be in an immediate unsafe state.",
-                         font=("Cascadia Code", 12), text_color="yellow").pack(pady=10)
+            self.steps_textbox.insert("end", "No processes could execute. The system might be in an immediate unsafe state.\n")
+        self.steps_textbox.configure(state="disabled")
 
         # --- Display Final Result ---
-        ctk.CTkLabel(self.scrollable_content_frame, text="Final Result:",
-                     font=ctk.CTkFont(size=15, weight="bold")).pack(pady=(20, 5))
+        result_frame = ctk.CTkFrame(self, fg_color="transparent")
+        result_frame.grid(row=4, column=0, padx=20, pady=(5, 15), sticky="ew")
+        result_frame.grid_columnconfigure(0, weight=1)
+        ctk.CTkLabel(result_frame, text="Final Result:",
+                     font=ctk.CTkFont(size=15, weight="bold")).grid(row=0, column=0, pady=(5, 5))
         
         if is_safe:
             # Format the safe sequence for display
-            final_sequence_str = " -> ".join([f"P{p}" for p in safe_sequence])
+            final_sequence_str = self._format_sequence(safe_sequence)
             
             # Display safe state message
-            ctk.CTkLabel(self.scrollable_content_frame, text="System is in a SAFE STATE.",
-                         font=ctk.CTkFont(size=16, weight="bold"), text_color="cyan").pack(pady=(0, 5))
+            ctk.CTkLabel(result_frame, text="System is in a SAFE STATE.",
+                         font=ctk.CTkFont(size=16, weight="bold"), text_color="cyan").grid(row=1, column=0, pady=(0, 5))
             # Display the safe sequence
-            ctk.CTkLabel(self.scrollable_content_frame, text=f"Safe Sequence: {final_sequence_str}",
-                         font=ctk.CTkFont(size=16, weight="bold"), text_color="cyan").pack(pady=(0, 10))
+            ctk.CTkLabel(result_frame, text=f"Safe Sequence: {final_sequence_str}", wraplength=640,
+                         font=ctk.CTkFont(size=16, weight="bold"), text_color="cyan").grid(row=2, column=0, pady=(0, 10))
         else:
             # Display unsafe state (deadlock) message
-            ctk.CTkLabel(self.scrollable_content_frame, text="DEADLOCK DETECTED.",
-                         font=ctk.CTkFont(size=16, weight="bold"), text_color="red").pack(pady=(0, 5))
-            ctk.CTkLabel(self.scrollable_content_frame, text="The system is in an unsafe state. No safe sequence found.",
-                         font=ctk.CTkFont(size=14), text_color="red").pack(pady=(0, 10))
\ No newline at end of file
+            ctk.CTkLabel(result_frame, text="DEADLOCK DETECTED.",
+                         font=ctk.CTkFont(size=16, weight="bold"), text_color="red").grid(row=1, column=0, pady=(0, 5))
+            ctk.CTkLabel(result_frame, text="The system is in an unsafe state. No safe sequence found.",
+                         font=ctk.CTkFont(size=14), text_color="red").grid(row=2, column=0, pady=(0, 10))
+            if recovery_plan is not None:
+                # Display the suggested recovery (processes to abort) and the resulting safe sequence
+                victims_str = ", ".join(f"P{pid}" for pid in recovery_plan.victims)
+                qualifier = "" if recovery_plan.optimal else " (best found, search limit reached)"
+                ctk.CTkLabel(result_frame, text=f"Recovery: abort {victims_str}{qualifier}", wraplength=640,
+                             font=ctk.CTkFont(size=14, weight="bold"), text_color="orange").grid(row=3, column=0, pady=(0, 5))
+                ctk.CTkLabel(result_frame, text=f"Then Safe Sequence: {self._format_sequence(recovery_plan.safe_sequence)}",
+                             wraplength=640, font=ctk.CTkFont(size=14), text_color="orange").grid(row=4, column=0, pady=(0, 10))
+
+        # --- Collapsible metrics panel ---
+        if metrics is not None:
+            metrics_frame = ctk.CTkFrame(self, fg_color="transparent")
+            metrics_frame.grid(row=5, column=0, padx=20, pady=(0, 15), sticky="ew")
+            metrics_frame.grid_columnconfigure(0, weight=1)
+            self.metrics_button = ctk.CTkButton(metrics_frame, text="Show Metrics", width=120,
+                                                command=self.toggle_metrics_panel)
+            self.metrics_button.grid(row=0, column=0, sticky="w")
+            self.metrics_textbox = ctk.CTkTextbox(metrics_frame, height=140, corner_radius=8,
+                                                  font=("Cascadia Code", 12), wrap="none")
+            self._metrics_visible = False
+
+        # Start watching the scroll positions to load further pages on demand
+        self._scroll_poll_id = self.after(self.SCROLL_POLL_MS, self._poll_scroll_positions)
+
+    # --- Formatting helpers ---
+
+    @staticmethod
+    def _format_sequence(sequence, head=5, tail=5):
+        """
+        Formats a process sequence as "P1 -> P3 -> ...", eliding the middle of long sequences.
+        """
+        if len(sequence) <= head + tail + 1:
+            return " -> ".join(f"P{p}" for p in sequence)
+        hidden_count = len(sequence) - head - tail
+        return (" -> ".join(f"P{p}" for p in sequence[:head]) + f" -> ... ({hidden_count} more) -> " +
+                " -> ".join(f"P{p}" for p in sequence[-tail:]))
+
+    def _format_step(self, step_index, step_info):
+        return (
+            f"--- Step {step_index + 1} ---\n"
+            f"  Executing Process: P{step_info['process_executed']}\n"
+            f"  Available (before): {step_info['work_before_execution']}\n"
+            f"  Resources Allocated by P{step_info['process_executed']}: {step_info['allocation']}\n"
+            f"  Available (after): {step_info['work_after_execution']}\n"
+            f"  Current Safe Sequence Progress: {self._format_sequence(self.safe_sequence[:step_index + 1])}\n"
+            f"{'-' * 60}\n"
+        )
+
+    # --- Lazy loading ---
+
+    def _iter_steps_from(self, start):
+        # CompactTrace carries Work forward from the nearest checkpoint; plain
+        # lists of step dicts are simply sliced.
+        if hasattr(self.simulation_steps, "iter_steps"):
+            return self.simulation_steps.iter_steps(start)
+        return itertools.islice(self.simulation_steps, start, None)
+
+    def _format_steps(self, start, stop):
+        """
+        Returns the text of steps start..stop-1, one string per step.
+        """
+        return [self._format_step(step_index, step_info) for step_index, step_info in
+                zip(range(start, stop), self._iter_steps_from(start))]
+
+    def _append_steps(self):
+        """
+        Appends the next page of simulation steps to the steps textbox.
+        """
+        stop = min(self._next_step + self.STEPS_PER_PAGE, len(self.simulation_steps))
+        if self._next_step >= stop:
+            return
+        page_text = "".join(self._format_steps(self._next_step, stop))
+        self.steps_textbox.configure(state="normal")
+        self.steps_textbox.insert("end", page_text)
+        self.steps_textbox.configure(state="disabled")
+        self._next_step = stop
+
+    def _prepend_steps(self):
+        """
+        Inserts the page of simulation steps before the first rendered one,
+        keeping the text that is in view at the same place on screen.
+        """
+        start = max(0, self._first_step - self.STEPS_PER_PAGE)
+        if start >= self._first_step:
+            return
+        page_text = "".join(self._format_steps(start, self._first_step))
+        inserted_lines = page_text.count("\n")
+        top_line = int(self.steps_textbox.index("@0,0").split(".")[0])
+        self.steps_textbox.configure(state="normal")
+        self.steps_textbox.insert("1.0", page_text)
+        self.steps_textbox.configure(state="disabled")
+        self.steps_textbox.yview(f"{top_line + inserted_lines}.0")
+        self._first_step = start
+
+    def _append_need_rows(self):
+        """
+        Appends the next page of Need matrix rows to the need textbox.
+        """
+        stop = min(self._next_need_row + self.NEED_ROWS_PER_PAGE, len(self.need_matrix))
+        if self._next_need_row >= stop:
+            return
+        page_text = "".join(f"P{i}: [{'  '.join(map(str, self.need_matrix[i]))}]\n"
+                            for i in range(self._next_need_row, stop))
+        self.need_textbox.configure(state="normal")
+        self.need_textbox.insert("end", page_text)
+        self.need_textbox.configure(state="disabled")
+        self._next_need_row = stop
+
+    def toggle_metrics_panel(self):
+        """
+        Shows or hides the metrics panel, refreshing its text when shown.
+        """
+        self._metrics_visible = not self._metrics_visible
+        if not self._metrics_visible:
+            self.metrics_textbox.grid_remove()
+            self.metrics_button.configure(text="Show Metrics")
+            return
+        self.metrics_textbox.configure(state="normal")
+        self.metrics_textbox.delete("0.0", "end")
+        self.metrics_textbox.insert("end", "\n".join(self.metrics.summary_lines()) + "\n")
+        self.metrics_textbox.configure(state="disabled")
+        self.metrics_textbox.grid(row=1, column=0, pady=(5, 0), sticky="ew")
+        self.metrics_button.configure(text="Hide Metrics")
+
+    def _poll_scroll_positions(self):
+        """
+        Loads the next page of a textbox once its view reaches the last 10% of
+        the text, and the previous page of steps once it reaches the first 10%.
+        """
+        if not self.winfo_exists():
+            return
+        if self.simulation_steps:
+            first_visible, last_visible = self.steps_textbox.yview()
+            if last_visible > 0.9:
+                self._append_steps()
+            if first_visible < 0.1 and self._first_step > 0:
+                self._prepend_steps()
+        if self.need_textbox.yview()[1] > 0.9:
+            self._append_need_rows()
+        self._scroll_poll_id = self.after(self.SCROLL_POLL_MS, self._poll_scroll_positions)
+
+    def destroy(self):
+        self.after_cancel(self._scroll_poll_id)
+        super().destroy()
+
+    # --- Navigation ---
+
+    def jump_to_step(self, step_index):
+        """
+        Re-renders the steps view around `step_index` (0-based) and scrolls it to
+        the top of the view. Steps before and after the rendered page are loaded
+        as the user scrolls towards them.
+        """
+        if not self.simulation_steps:
+            return
+        step_index = max(0, min(step_index, len(self.simulation_steps) - 1))
+        start = max(0, step_index - self.STEPS_PER_PAGE // 2)
+        stop = min(start + self.STEPS_PER_PAGE, len(self.simulation_steps))
+        step_texts = self._format_steps(start, stop)
+        self.steps_textbox.configure(state="normal")
+        self.steps_textbox.delete("1.0", "end")
+        self.steps_textbox.insert("end", "".join(step_texts))
+        self.steps_textbox.configure(state="disabled")
+        self._first_step, self._next_step = start, stop
+        target_line = 1 + sum(text.count("\n") for text in step_texts[:step_index - start])
+        self.steps_textbox.yview(f"{target_line}.0")
+
+    def jump_to_step_from_entry(self):
+        try:
+            step_number = int(self.jump_entry.get())
+        except ValueError:
+            self.navigation_label.configure(text="Enter a step number.")
+            return
+        self.navigation_label.configure(text="")
+        self.jump_to_step(step_number - 1)
+
+    def find_process_from_entry(self):
+        query = self.find_entry.get().strip().upper().lstrip("P")
+        try:
+            process_id = int(query)
+        except ValueError:
+            self.navigation_label.configure(text="Enter a process id, e.g. P3.")
+            return
+        if self._step_positions is None:
+            self._step_positions = {pid: step_index for step_index, pid in enumerate(self.safe_sequence)}
+        step_index = self._step_positions.get(process_id)
+        if step_index is None:
+            self.navigation_label.configure(text=f"P{process_id} never executed.")
+            return
+        self.navigation_label.configure(text=f"P{process_id} runs at step {step_index + 1}.")
+        self.jump_to_step(step_index)